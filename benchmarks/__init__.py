@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""
+GOGO囲碁 ベンチマーク
+"""
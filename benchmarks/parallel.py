@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+モンテカルロ木探索のルート並列化（MCTS.workers）のベンチマーク
+
+プロセス数ごとに同じ思考時間で探索し、1秒あたりのプレイアウト数と、1プロセスに対する倍率を表示する。
+
+使い方:
+    python -m benchmarks.parallel --size 9 --workers 1 2 4 8 16 --time-limit 1.0
+"""
+import argparse
+import contextlib
+import io
+
+from src.board import Board
+from src.mcts import MCTS
+
+
+def measure(size, workers, time_limit, moves, seed):
+    """
+    指定したプロセス数で探索し、1秒あたりのプレイアウト数を求める
+
+    Args:
+        size: 盤面のサイズ
+        workers: プロセスの数
+        time_limit: 1手の思考時間（秒）
+        moves: 探索する回数
+        seed: 乱数の種
+
+    Returns:
+        float: 1秒あたりのプレイアウト数
+    """
+    board = Board(size)
+    ai = MCTS(board, time_limit=time_limit, seed=seed, workers=workers)
+    playouts = 0
+    seconds = 0.0
+    with contextlib.redirect_stdout(io.StringIO()):
+        # プロセスの起動にかかる時間を除くため、1回目は計測しない
+        ai.get_move()
+        for _ in range(moves):
+            ai.get_move()
+            playouts += ai.last_stats['playouts']
+            seconds += ai.last_stats['seconds']
+    ai.close()
+    return playouts / seconds
+
+
+def main():
+    """ベンチマークを実行して結果を表示"""
+    parser = argparse.ArgumentParser(description='モンテカルロ木探索のルート並列化のベンチマーク')
+    parser.add_argument('--size', type=int, default=9, help='盤面のサイズ')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8, 16], help='調べるプロセスの数')
+    parser.add_argument('--time-limit', type=float, default=1.0, help='1手の思考時間（秒）')
+    parser.add_argument('--moves', type=int, default=3, help='プロセスの数ごとに探索する回数')
+    parser.add_argument('--seed', type=int, default=0, help='乱数の種')
+    args = parser.parse_args()
+
+    print(f"{args.size}路盤 思考時間 {args.time_limit}秒")
+    base = None
+    for workers in args.workers:
+        rate = measure(args.size, workers, args.time_limit, args.moves, args.seed)
+        base = base or rate
+        print(f"{workers:3d}プロセス: {rate:10,.0f} プレイアウト/秒 ({rate / base:5.2f}倍)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+プレイアウト用の盤面（PlayoutBoard）のベンチマーク
+
+空の盤面から乱数で終局まで打ち進めるプレイアウトを繰り返し、1秒あたりの手数とプレイアウト数を表示する。
+
+使い方:
+    python -m benchmarks.playout --size 9 --playouts 2000
+"""
+import argparse
+import random
+import time
+
+from src.playout import PlayoutBoard
+
+
+def main():
+    """ベンチマークを実行して結果を表示"""
+    parser = argparse.ArgumentParser(description='プレイアウト用の盤面のベンチマーク')
+    parser.add_argument('--size', type=int, default=9, help='盤面のサイズ')
+    parser.add_argument('--playouts', type=int, default=2000, help='プレイアウトの回数')
+    parser.add_argument('--seed', type=int, default=0, help='乱数の種')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    root = PlayoutBoard(args.size)
+    moves = 0
+    start = time.perf_counter()
+    for _ in range(args.playouts):
+        board = root.copy()
+        moves += board.playout(rng)
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.size}路盤 {args.playouts}回のプレイアウト（{elapsed:.2f}秒）")
+    print(f"{moves / elapsed:,.0f} 手/秒, {args.playouts / elapsed:,.0f} プレイアウト/秒, "
+          f"平均 {moves / args.playouts:.1f} 手/プレイアウト")
+
+
+if __name__ == '__main__':
+    main()
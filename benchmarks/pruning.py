@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AIの候補の絞り込み（AI.top_k）のベンチマーク
+
+乱数で作った局面ごとに、すべての手を評価した場合の最善手が
+計算の軽い評価の上位K手に含まれる割合と、1手の決定にかかる時間を表示する。
+既定のAIは絞り込まない（AI.TOP_K = None）。絞り込みを使う場合はこの結果でKを選ぶ。
+
+使い方:
+    python -m benchmarks.pruning --size 9 --positions 200 --top-k 8 16 24 32
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from src.board import Board
+from src.ai import AI
+
+
+def random_position(size, moves, rng):
+    """
+    乱数で石を置いた局面を作る
+
+    Args:
+        size: 盤面のサイズ
+        moves: 石を置こうとする回数
+        rng: 乱数生成器
+
+    Returns:
+        Board: 作成した盤面
+    """
+    board = Board(size)
+    color = Board.BLACK
+    for _ in range(moves):
+        x, y = rng.randrange(size), rng.randrange(size)
+        if board.is_legal(x, y, color):
+            board.place_stone(x, y, color)
+            color = Board.WHITE if color == Board.BLACK else Board.BLACK
+    return board
+
+
+def measure(board, top_ks):
+    """
+    1つの局面で、各Kについて最善手が上位K手に含まれるかと、手の評価にかかる時間を求める
+
+    Args:
+        board: 盤面
+        top_ks: 調べるKのリスト
+
+    Returns:
+        tuple: (Kごとの最善手が含まれたかのリスト, すべての手の評価時間, Kごとの評価時間のリスト)
+    """
+    ai = AI(board, top_k=None)
+
+    # 局面の陣地・影響圏は手の評価の前に計算しておく（評価時間に含めない）
+    board.update_territories()
+    legal = board.legal_moves(Board.WHITE)
+    moves = [(int(x), int(y)) for y, x in zip(*np.nonzero(legal))]
+
+    # すべての手を評価した場合の最善手（ランダム性を除く）
+    xs = np.array([x for x, _ in moves], dtype=int)
+    ys = np.array([y for _, y in moves], dtype=int)
+    cheap = ai.evaluate_moves_cheap(moves)
+    full = cheap + ai.calculate_influence_gains(xs, ys) * 3
+    best = set(np.flatnonzero(full == full.max()))
+    
+    # 絞り込まない場合の評価時間（絞り込む場合と同じ処理で測る）
+    start = time.perf_counter()
+    ai.evaluate_candidates(moves)
+    full_time = time.perf_counter() - start
+
+    hits = []
+    times = []
+    order = np.argsort(-cheap, kind='stable')
+    for k in top_ks:
+        hits.append(bool(best & set(order[:k])))
+        ai.top_k = k
+        start = time.perf_counter()
+        ai.evaluate_candidates(moves)
+        times.append(time.perf_counter() - start)
+    return hits, full_time, times
+
+
+def main():
+    """ベンチマークを実行して結果を表示"""
+    parser = argparse.ArgumentParser(description='AIの候補の絞り込みのベンチマーク')
+    parser.add_argument('--size', type=int, default=9, help='盤面のサイズ')
+    parser.add_argument('--positions', type=int, default=200, help='調べる局面の数')
+    parser.add_argument('--top-k', type=int, nargs='+', default=[8, 16, 24, 32], help='調べる候補の数')
+    parser.add_argument('--seed', type=int, default=0, help='乱数の種')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    hits = np.zeros(len(args.top_k))
+    times = np.zeros(len(args.top_k))
+    full_time = 0.0
+    for _ in range(args.positions):
+        board = random_position(args.size, rng.randrange(args.size * args.size), rng)
+        position_hits, position_full_time, position_times = measure(board, args.top_k)
+        hits += position_hits
+        times += position_times
+        full_time += position_full_time
+
+    print(f"{args.size}路盤 {args.positions}局面")
+    print(f"すべての手を評価: {full_time / args.positions * 1000:.2f} ms/手")
+    for k, hit, total in zip(args.top_k, hits, times):
+        print(f"K={k:3d}: 最善手が上位K手に含まれる割合 {hit / args.positions:6.1%}, "
+              f"{total / args.positions * 1000:.2f} ms/手")
+
+
+if __name__ == '__main__':
+    main()
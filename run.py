@@ -4,8 +4,19 @@
 GOGO囲碁 ゲーム起動スクリプト
 """
 
+import argparse
+
+from src.engine import GameEngine
 from src.game import Game
 
 if __name__ == "__main__":
-    game = Game()
+    parser = argparse.ArgumentParser(description="GOGO囲碁")
+    parser.add_argument("--engine", choices=[Game.ENGINE_HEURISTIC, Game.ENGINE_MCTS],
+                        default=Game.ENGINE_HEURISTIC, help="AIの種類")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="モンテカルロ木探索を並列に行うプロセスの数")
+    parser.add_argument("--komi", type=float, default=GameEngine.KOMI, help="白に加えるコミ")
+    args = parser.parse_args()
+
+    game = Game(engine=args.engine, workers=args.workers, komi=args.komi)
     game.run()
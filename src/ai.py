@@ -2,46 +2,75 @@ import random
 import numpy as np
 import sys
 from .board import Board
+from . import analysis
+from .zobrist import get_side_keys
 
 class AI:
     """
     囲碁AIクラス。
     囲碁検定5級レベルの思考ロジックを実装。
+    黒白どちらの石でも打てるため、2つのAIを対局させることもできる。
     """
     
-    def __init__(self, board):
+    # 影響圏の増加量を計算する候補の数（Noneの場合はすべての手を計算する）
+    # 絞り込むと最善手を取りこぼすことがあるため、既定では絞り込まない（benchmarks.pruningで割合を確認できる）
+    TOP_K = None
+    
+    def __init__(self, board, color=Board.WHITE, top_k=TOP_K, table=None):
         """
         AIの初期化
         
         Args:
             board: 盤面オブジェクト
+            color: AIの石の色
+            top_k: 影響圏の増加量を計算する候補の数（Noneの場合はすべての手を計算する）
+            table: 候補の局面の影響圏の面積を記録する置換表（省略時は使わない。複数のAIで共有できる）
         """
         self.board = board
+        self.color = color
+        self.opponent = Board.WHITE if color == Board.BLACK else Board.BLACK
+        self.top_k = top_k
+        self.table = table
     
-    def get_move(self):
+    def influence(self, color):
         """
-        次の一手を決定する
+        指定した色の影響圏を取得
         
+        Args:
+            color: 石の色
+            
+        Returns:
+            numpy.ndarray: 影響圏のbool配列
+        """
+        return self.board.black_influence if color == Board.BLACK else self.board.white_influence
+    
+    def get_move(self, board=None, cancelled=None):
+        """
+        次の一手を決定する（MCTSと同じ引数で呼び出せる）
+        
+        Args:
+            board: 評価する盤面オブジェクト（省略時はAIの盤面。別スレッドでは盤面の複製を渡す）
+            cancelled: 中止を指示されたときにセットされるイベント（1手読みはすぐに終わるため使わない）
+            
         Returns:
             tuple or None: 石を置く座標 (x, y) またはパスの場合はNone
         """
-        # 有効な手の候補を列挙
-        valid_moves = []
-        for y in range(self.board.size):
-            for x in range(self.board.size):
-                if self.board.is_valid_move(x, y):
-                    valid_moves.append((x, y))
+        # 別の盤面は同じ設定のAIで評価する（このAIの盤面は他のスレッドからも参照されるため書き換えない）
+        if board is not None and board is not self.board:
+            return AI(board, self.color, self.top_k, self.table).get_move()
+        
+        # 有効な手の候補を列挙（自分の眼を埋める手は除く。打つ手がなくなればパスして終局に向かう）
+        legal = self.board.legal_moves(self.color) & ~analysis.true_eye_points(self.board.board, self.color)
+        valid_moves = [(int(x), int(y)) for y, x in zip(*np.nonzero(legal))]
         
         # 有効な手がない場合はパス
         if not valid_moves:
             print("AIは有効な手がないためパスします")
             return None  # パス
         
-        # 各手の評価値を計算
-        move_scores = {}
-        for move in valid_moves:
-            score = self.evaluate_move(move)
-            move_scores[move] = score
+        # 各手の評価値をまとめて計算（top_kを指定した場合は計算の軽い評価で絞り込んだ候補だけ影響圏の増加量まで評価する）
+        candidates, scores = self.evaluate_candidates(valid_moves)
+        move_scores = dict(zip(candidates, scores))
         
         # 最も評価値の高い手を選択（同点の場合はランダム）
         best_score = max(move_scores.values())
@@ -65,13 +94,8 @@ class AI:
         x, y = move
         score = 0
         
-        # AIは常に白石
-        ai_stone = Board.WHITE
-        opponent_stone = Board.BLACK
-        
-        # 一時的に石を置いてみる
-        temp_board = self.board.board.copy()
-        temp_board[y, x] = ai_stone
+        ai_stone = self.color
+        opponent_stone = self.opponent
         
         # 1. アタリの処理（相手の石を取れる場合は高評価）
         captured = self.count_potential_captures(x, y, ai_stone, opponent_stone)
@@ -98,28 +122,108 @@ class AI:
         
         return score
     
+    def evaluate_candidates(self, moves):
+        """
+        2段階で手を評価する（計算の軽い評価で全候補を順位付けし、上位top_k手だけ影響圏の増加量を加える）
+        
+        top_kがNoneの場合は絞り込まず、すべての手に影響圏の増加量を加える。
+        
+        Args:
+            moves: 手の座標 (x, y) のリスト
+            
+        Returns:
+            tuple: (絞り込んだ手のリスト, 各手の評価値のリスト)
+        """
+        cheap_scores = self.evaluate_moves_cheap(moves)
+        
+        # 上位top_k手に絞り込む（並びは元の順を保つ）
+        if self.top_k is not None and len(moves) > self.top_k:
+            order = np.argsort(-cheap_scores, kind='stable')[:self.top_k]
+            order.sort()
+            moves = [moves[i] for i in order]
+            cheap_scores = cheap_scores[order]
+        
+        return moves, self.add_influence_gains(moves, cheap_scores)
+    
+    def evaluate_moves(self, moves):
+        """
+        複数の手の評価値をまとめて計算（evaluate_moveと同じ評価を、候補の局面を重ねた配列で一度に行う）
+        
+        Args:
+            moves: 手の座標 (x, y) のリスト
+            
+        Returns:
+            list: 各手の評価値（movesと同じ順）
+        """
+        if not moves:
+            return []
+        
+        return self.add_influence_gains(moves, self.evaluate_moves_cheap(moves))
+    
+    def evaluate_moves_cheap(self, moves):
+        """
+        影響圏の増加量を除いた評価値をまとめて計算（取れる石・アタリ・侵略の価値・配石）
+        
+        Args:
+            moves: 手の座標 (x, y) のリスト
+            
+        Returns:
+            numpy.ndarray: 各手の評価値（movesと同じ順、ランダム性は含まない）
+        """
+        ai_stone = self.color
+        opponent_stone = self.opponent
+        
+        xs = np.array([x for x, _ in moves], dtype=int)
+        ys = np.array([y for _, y in moves], dtype=int)
+        
+        # 1, 2. アタリの処理と自分の石のアタリ（連の呼吸点から求める）
+        captured = np.array([self.count_potential_captures(x, y, ai_stone, opponent_stone) for x, y in moves])
+        self_atari = np.array([self.is_self_atari(x, y, ai_stone) for x, y in moves])
+        
+        # 4, 5. 相手の陣地侵略と基本的な配石（盤面全体の評価値の表から引く）
+        invasion_value = self.invasion_values()[ys, xs]
+        position_value = self.position_values()[ys, xs]
+        
+        return captured * 10 - self_atari * 5 + invasion_value * 2 + position_value
+    
+    def add_influence_gains(self, moves, scores):
+        """
+        評価値に影響圏の増加量とランダム性を加える
+        
+        Args:
+            moves: 手の座標 (x, y) のリスト
+            scores: evaluate_moves_cheapで求めた各手の評価値
+            
+        Returns:
+            list: 各手の評価値（movesと同じ順）
+        """
+        xs = np.array([x for x, _ in moves], dtype=int)
+        ys = np.array([y for _, y in moves], dtype=int)
+        
+        # 3. 陣地の拡大（候補の局面を (K, N, N) に重ねて影響圏をまとめて計算）
+        scores = scores + self.calculate_influence_gains(xs, ys) * 3
+        
+        # 6. ランダム性を少し加える（同じような状況で常に同じ手を打たないように）
+        return [float(score) + random.uniform(0, 0.5) for score in scores]
+    
     def count_potential_captures(self, x, y, ai_stone=None, opponent_stone=None):
         """
         指定した位置に石を置いた場合に取れる相手の石の数を計算
         
         Args:
             x, y: 石を置く位置の座標
-            ai_stone: AIの石の色 (デフォルト: Board.WHITE)
-            opponent_stone: 相手の石の色 (デフォルト: Board.BLACK)
+            ai_stone: AIの石の色 (デフォルト: AIの色)
+            opponent_stone: 相手の石の色 (デフォルト: 相手の色)
             
         Returns:
             int: 取れる石の数
         """
         # デフォルト値の設定
         if ai_stone is None:
-            ai_stone = Board.WHITE
+            ai_stone = self.color
         if opponent_stone is None:
-            opponent_stone = Board.BLACK
+            opponent_stone = self.opponent
             
-        # 一時的に石を置いてみる
-        temp_board = self.board.board.copy()
-        temp_board[y, x] = ai_stone
-        
         captured_count = 0
         
         # 隣接する4方向をチェック
@@ -151,19 +255,15 @@ class AI:
         
         Args:
             x, y: 石を置く位置の座標
-            ai_stone: AIの石の色 (デフォルト: Board.WHITE)
+            ai_stone: AIの石の色 (デフォルト: AIの色)
             
         Returns:
             bool: 自分の石がアタリになるかどうか
         """
         # デフォルト値の設定
         if ai_stone is None:
-            ai_stone = Board.WHITE
+            ai_stone = self.color
             
-        # 一時的に石を置いてみる
-        temp_board = self.board.board.copy()
-        temp_board[y, x] = ai_stone
-        
         # 隣接する自分の石のグループを見つける
         adjacent_groups = []
         for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
@@ -200,30 +300,64 @@ class AI:
         Returns:
             int: 影響圏の増加量
         """
-        # AIは常に白石
-        ai_stone = Board.WHITE
-        
         # 現在の影響圏の面積
-        current_influence = np.sum(self.board.white_influence)
-        
-        # 一時的に石を置いてみる
-        self.board.update_preview(x, y)
+        current_influence = np.sum(self.influence(self.color))
         
-        # 石を置いた後の影響圏の面積
-        if self.board.preview_board is not None:
-            new_influence = np.sum(self.board.preview_white_influence)
-            
-            # プレビューをクリア
-            self.board.preview_board = None
-            self.board.preview_black_territory = None
-            self.board.preview_white_territory = None
-            self.board.preview_black_influence = None
-            self.board.preview_white_influence = None
-            
-            return new_influence - current_influence
+        # 石を置いた後の影響圏の面積（盤面を変更しないプレビューの計算結果を使う）
+        if self.board.is_valid_move(x, y, self.color):
+            preview = self.board.get_preview(x, y, self.color)
+            if self.color == Board.BLACK:
+                return np.sum(preview.black_influence) - current_influence
+            return np.sum(preview.white_influence) - current_influence
         
         return 0
     
+    def calculate_influence_gains(self, xs, ys):
+        """
+        複数の位置について、石を置いた場合の影響圏の増加量をまとめて計算
+        
+        Args:
+            xs, ys: 石を置く位置の座標の配列
+            
+        Returns:
+            numpy.ndarray: 各位置の影響圏の増加量（calculate_influence_gainと同じ値）
+        """
+        gains = np.zeros(len(xs), dtype=int)
+        
+        # calculate_influence_gainと同じく、置ける点だけ自分の石を置いた局面を評価する
+        valid = self.board.legal_moves(self.color)[ys, xs]
+        if not valid.any():
+            return gains
+        
+        xs, ys = xs[valid], ys[valid]
+        
+        totals = np.zeros(len(xs), dtype=int)
+        found = np.zeros(len(xs), dtype=bool)
+        
+        # 置換表があれば候補の局面の影響圏の面積を引く（石を置いただけの局面のハッシュに、評価する色を区別する乱数を加える）
+        if self.table is not None:
+            points = ys * self.board.size + xs
+            base = self.board.hash ^ get_side_keys()[self.color]
+            stone_keys = self.board.zobrist_keys[self.color]
+            keys = np.array([base ^ stone_keys[point] for point in points.tolist()], dtype=np.uint64)
+            found, scores = self.table.probe_many(keys)
+            totals[found] = scores[found]
+        
+        # 記録のない局面だけ (K, N, N) に重ねてまとめて計算する
+        missing = np.flatnonzero(~found)
+        if missing.size:
+            children = np.repeat(self.board.board[np.newaxis], missing.size, axis=0)
+            children[np.arange(missing.size), ys[missing], xs[missing]] = self.color
+            black_influence, white_influence = analysis.calculate_influence(children)
+            influence = black_influence if self.color == Board.BLACK else white_influence
+            totals[missing] = influence.sum(axis=(1, 2))
+            if self.table is not None:
+                # 1手読みのため候補の局面の最善手はわからない（最善手は記録しない）
+                self.table.store_many(keys[missing], totals[missing])
+        
+        gains[valid] = totals - np.sum(self.influence(self.color))
+        return gains
+    
     def calculate_invasion_value(self, x, y):
         """
         指定した位置に石を置いた場合の相手の陣地侵略の価値を計算
@@ -234,12 +368,10 @@ class AI:
         Returns:
             int: 侵略の価値
         """
-        # AIは常に白石、相手は常に黒石
-        ai_stone = Board.WHITE
-        opponent_stone = Board.BLACK
+        opponent_stone = self.opponent
         
         # 相手の影響圏かどうかをチェック
-        opponent_influence = self.board.black_influence
+        opponent_influence = self.influence(opponent_stone)
         
         if opponent_influence[y, x]:
             # 相手の影響圏内なら高評価
@@ -260,6 +392,49 @@ class AI:
         
         return 0
     
+    def invasion_values(self):
+        """
+        盤面のすべての点の相手の陣地侵略の価値をまとめて計算
+        
+        Returns:
+            numpy.ndarray: 各点の侵略の価値（calculate_invasion_valueと同じ値）
+        """
+        # 相手の石からの距離（4マスまで求めれば足りる）
+        distance = analysis.distance_field(self.board.board == self.opponent, limit=4)
+        values = np.where(distance <= 2, 3, np.where(distance <= 4, 1, 0))
+        
+        # 相手の影響圏内なら高評価
+        return np.where(self.influence(self.opponent), 5, values)
+    
+    def position_values(self):
+        """
+        盤面のすべての点の基本的な評価値をまとめて計算
+        
+        Returns:
+            numpy.ndarray: 各点の評価値（evaluate_positionと同じ値）
+        """
+        size = self.board.size
+        center = size // 2
+        ys, xs = np.indices((size, size))
+        
+        # 盤面の進行度を計算
+        stones_count = np.sum(self.board.board != Board.EMPTY)
+        progress = stones_count / (size * size)
+        
+        # 序盤は3線、4線を重視
+        if progress < 0.3:
+            line = np.minimum(np.minimum(xs, ys), np.minimum(size - 1 - xs, size - 1 - ys))
+            return np.select([(line == 2) | (line == 3), line == 1, line == 0], [3, 1, 0], default=2)
+        
+        # 中盤は中央を重視
+        elif progress < 0.7:
+            dist_from_center = np.abs(xs - center) + np.abs(ys - center)
+            return np.maximum(0, 4 - dist_from_center)
+        
+        # 終盤は相手の影響圏への侵入を重視
+        else:
+            return np.where(self.influence(self.opponent), 4, 1)
+    
     def evaluate_position(self, x, y):
         """
         指定した位置の基本的な評価値を計算
@@ -299,12 +474,7 @@ class AI:
         # 終盤（進行度70%以上）
         else:
             # 終盤は相手の影響圏への侵入を重視
-            # AIは常に白石、相手は常に黒石
-            ai_stone = Board.WHITE
-            opponent_stone = Board.BLACK
-            
-            # 相手の影響圏かどうかをチェック
-            opponent_influence = self.board.black_influence
+            opponent_influence = self.influence(self.opponent)
             
             if opponent_influence[y, x]:
                 return 4
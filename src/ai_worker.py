@@ -0,0 +1,98 @@
+"""
+AIの次の一手をバックグラウンドで計算するモジュール
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AIWorker:
+    """
+    AIの次の一手を別スレッドで計算するクラス。
+    計算は盤面の複製に対して行うため、その間もメインループは盤面を描画し、入力を処理できる。
+    """
+
+    def __init__(self, ai):
+        """
+        初期化
+
+        Args:
+            ai: AIオブジェクト（AI or MCTS）
+        """
+        self.ai = ai
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ai')
+        self.future = None
+        self.cancel_event = None
+
+    def submit(self, board):
+        """
+        次の一手の計算を開始する
+
+        Args:
+            board: 盤面オブジェクト（計算はこの時点の複製に対して行う）
+        """
+        self.cancel()
+        self.cancel_event = threading.Event()
+        self.future = self.executor.submit(self.think, board.copy(), self.cancel_event)
+
+    def think(self, board, cancelled):
+        """
+        盤面の複製に対して次の一手を計算する（別スレッドで実行される）
+
+        Args:
+            board: 盤面の複製
+            cancelled: 中止を指示されたときにセットされるイベント
+
+        Returns:
+            tuple or None: 石を置く座標 (x, y) またはパスの場合はNone
+        """
+        # AIは他のスレッドと共有しているため、盤面の複製は引数で渡す（AIの盤面は書き換えない）
+        return self.ai.get_move(board, cancelled)
+
+    def is_pending(self):
+        """
+        計算を開始し、結果をまだ受け取っていないかどうか
+
+        Returns:
+            bool: 結果を待っているかどうか
+        """
+        return self.future is not None
+
+    def is_ready(self):
+        """
+        計算が終わり、結果を受け取れるかどうか
+
+        Returns:
+            bool: 結果を受け取れるかどうか
+        """
+        return self.future is not None and self.future.done()
+
+    def result(self):
+        """
+        計算の結果を受け取る（計算が終わっていなければ待つ）
+
+        Returns:
+            tuple or None: 石を置く座標 (x, y) またはパスの場合はNone
+        """
+        future = self.future
+        self.future = None
+        self.cancel_event = None
+        return future.result()
+
+    def cancel(self):
+        """
+        実行中の計算を中止する（結果は捨てる）
+
+        終了は待たない。始まっていない計算は実行されず、実行中の計算は盤面の複製に対して
+        行われているため、終わるまでの間も対局中の盤面とAIの盤面は変わらない。
+        """
+        if self.future is None:
+            return
+        self.cancel_event.set()
+        self.future.cancel()
+        self.future = None
+        self.cancel_event = None
+
+    def shutdown(self):
+        """計算を中止し、スレッドを終了する"""
+        self.cancel()
+        self.executor.shutdown(wait=True)
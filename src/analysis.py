@@ -0,0 +1,479 @@
+"""
+盤面の配列から陣地・影響圏などを計算する関数を提供するモジュール
+
+いずれの関数も引数の盤面を変更せず、Boardオブジェクトにも依存しないため、
+別スレッドから同時に呼び出してもよい。
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from src.bitboard import BitBoard
+
+# 盤面の状態定数（Boardと同じ値）
+EMPTY = 0
+BLACK = 1
+WHITE = 2
+
+# 影響圏とみなす石からの距離
+INFLUENCE_DISTANCE = 2
+
+# 局面の解析結果（陣地・影響圏・石の安全度）
+PositionAnalysis = namedtuple('PositionAnalysis', [
+    'black_territory', 'white_territory', 'black_influence', 'white_influence', 'stone_safety'])
+
+# プレビュー（石を置いた場合の盤面と、その盤面の陣地・影響圏・安全度・取られるまでの手数）
+PreviewResult = namedtuple('PreviewResult', [
+    'board', 'black_territory', 'white_territory', 'black_influence',
+    'white_influence', 'stone_safety', 'capture_moves'])
+
+
+def dilate(mask):
+    """
+    bool配列を上下左右に1マス膨張させる
+
+    Args:
+        mask: 最後の2軸が盤面（size x size）のbool配列（複数の盤面を重ねた配列でもよい）
+
+    Returns:
+        numpy.ndarray: 膨張後のbool配列（元の点を含む）
+    """
+    grown = mask.copy()
+    grown[..., 1:, :] |= mask[..., :-1, :]
+    grown[..., :-1, :] |= mask[..., 1:, :]
+    grown[..., :, 1:] |= mask[..., :, :-1]
+    grown[..., :, :-1] |= mask[..., :, 1:]
+    return grown
+
+
+def distance_field(stones, limit=INFLUENCE_DISTANCE):
+    """
+    すべての石を起点とした幅優先探索で、各点から最も近い石までのマンハッタン距離を求める
+
+    Args:
+        stones: 石のある点がTrueのbool配列（複数の盤面を重ねた配列でもよい）
+        limit: 求める距離の上限
+
+    Returns:
+        numpy.ndarray: 距離の配列（limitより遠い点と石がない場合は limit + 1）
+    """
+    distance = np.full(stones.shape, limit + 1, dtype=np.int8)
+    distance[stones] = 0
+    reached = stones.copy()
+    frontier = stones
+    for step in range(1, limit + 1):
+        frontier = dilate(frontier) & ~reached
+        distance[frontier] = step
+        reached |= frontier
+    return distance
+
+
+def calculate_influence(board):
+    """
+    影響圏を計算（石から2マス以内で、かつ相手の石より近い空点）
+
+    Args:
+        board: 盤面の状態（複数の盤面を重ねた配列でもよい）
+
+    Returns:
+        tuple: (黒の影響圏, 白の影響圏)
+    """
+    black_distance = distance_field(board == BLACK)
+    white_distance = distance_field(board == WHITE)
+    empty = board == EMPTY
+
+    black_near = black_distance <= INFLUENCE_DISTANCE
+    white_near = white_distance <= INFLUENCE_DISTANCE
+    black_influence = empty & black_near & ((black_distance < white_distance) | ~white_near)
+    white_influence = empty & white_near & ((white_distance < black_distance) | ~black_near)
+    return black_influence, white_influence
+
+
+def label_empty_regions(bitboard):
+    """
+    連結した空点の領域を1回の走査ですべて求め、各領域に接する石の色も同時に記録する
+
+    Args:
+        bitboard: 盤面のビットボード
+
+    Returns:
+        list: 領域ごとの (空点のビット列, 接する石の色のフラグ) のリスト。
+              フラグは黒に接していれば BLACK、白に接していれば WHITE のビットが立つ
+    """
+    empty = bitboard.empty
+    regions = []
+    remaining = empty
+    while remaining:
+        # まだ領域に含まれていない空点から塗りつぶす（各領域は1回だけ塗りつぶす）
+        region = bitboard.flood(remaining & -remaining, empty)
+        remaining &= ~region
+
+        regions.append((region, region_touches(bitboard, region)))
+    return regions
+
+
+def region_touches(bitboard, region):
+    """
+    空点の領域に接する石の色を求める
+
+    Args:
+        bitboard: 盤面のビットボード
+        region: 空点の領域のビット列
+
+    Returns:
+        int: 黒に接していれば BLACK、白に接していれば WHITE のビットが立つフラグ
+    """
+    border = bitboard.adjacent(region)
+    touches = 0
+    if border & bitboard.black:
+        touches |= BLACK
+    if border & bitboard.white:
+        touches |= WHITE
+    return touches
+
+
+def calculate_territories(board, bitboard=None):
+    """
+    確定陣地を計算（片方の色の石だけに囲まれた空点の領域）
+
+    Args:
+        board: 盤面の状態（size x size の配列）
+        bitboard: 盤面と一致するビットボード（省略時は盤面から作成）
+
+    Returns:
+        tuple: (黒の確定陣地, 白の確定陣地)
+    """
+    if bitboard is None:
+        bitboard = BitBoard.from_array(board, BLACK, WHITE)
+
+    black_mask, white_mask = calculate_territory_masks(bitboard)
+    return bitboard.to_array(black_mask), bitboard.to_array(white_mask)
+
+
+def calculate_territory_masks(bitboard):
+    """
+    確定陣地をビット列で計算
+
+    Args:
+        bitboard: 盤面のビットボード
+
+    Returns:
+        tuple: (黒の確定陣地のビット列, 白の確定陣地のビット列)
+    """
+    black_mask = 0
+    white_mask = 0
+    for region, touches in label_empty_regions(bitboard):
+        if touches == BLACK:
+            black_mask |= region
+        elif touches == WHITE:
+            white_mask |= region
+    return black_mask, white_mask
+
+
+def update_territory_masks(bitboard, black_mask, white_mask, changed):
+    """
+    石が置かれた・取られた点の周りの領域だけ確定陣地を計算し直す
+
+    変化した点を含むか、変化した点に接する空点の領域以外は、
+    形も接する石も変わらないため前回の結果をそのまま使える。
+
+    Args:
+        bitboard: 変化後の盤面のビットボード
+        black_mask: 変化前の黒の確定陣地のビット列
+        white_mask: 変化前の白の確定陣地のビット列
+        changed: 変化した点のビット列
+
+    Returns:
+        tuple: (黒の確定陣地のビット列, 白の確定陣地のビット列)
+    """
+    empty = bitboard.empty
+    black_mask &= ~changed
+    white_mask &= ~changed
+
+    seeds = bitboard.dilate(changed) & empty
+    while seeds:
+        region = bitboard.flood(seeds & -seeds, empty)
+        seeds &= ~region
+        black_mask &= ~region
+        white_mask &= ~region
+
+        touches = region_touches(bitboard, region)
+        if touches == BLACK:
+            black_mask |= region
+        elif touches == WHITE:
+            white_mask |= region
+    return black_mask, white_mask
+
+
+def update_influence(board, black_influence, white_influence, changed_points):
+    """
+    石が置かれた・取られた点から2マス以内だけ影響圏を計算し直す（配列を直接書き換える）
+
+    Args:
+        board: 変化後の盤面の状態（size x size の配列）
+        black_influence: 変化前の黒の影響圏（書き換えられる）
+        white_influence: 変化前の白の影響圏（書き換えられる）
+        changed_points: 変化した点の座標の集合
+    """
+    size = board.shape[0]
+    xs = [x for x, _ in changed_points]
+    ys = [y for _, y in changed_points]
+
+    # 影響圏が変わりうる範囲
+    x0, x1 = max(min(xs) - INFLUENCE_DISTANCE, 0), min(max(xs) + INFLUENCE_DISTANCE + 1, size)
+    y0, y1 = max(min(ys) - INFLUENCE_DISTANCE, 0), min(max(ys) + INFLUENCE_DISTANCE + 1, size)
+
+    # その範囲の距離に関わる石を含む範囲で計算する
+    sx0, sx1 = max(x0 - INFLUENCE_DISTANCE, 0), min(x1 + INFLUENCE_DISTANCE, size)
+    sy0, sy1 = max(y0 - INFLUENCE_DISTANCE, 0), min(y1 + INFLUENCE_DISTANCE, size)
+    black, white = calculate_influence(board[sy0:sy1, sx0:sx1])
+
+    inner = (slice(y0 - sy0, y1 - sy0), slice(x0 - sx0, x1 - sx0))
+    black_influence[y0:y1, x0:x1] = black[inner]
+    white_influence[y0:y1, x0:x1] = white[inner]
+
+
+def count_neighbors(mask):
+    """
+    各点の上下左右にある、mask が True の点の数を数える
+
+    Args:
+        mask: 盤面（size x size）のbool配列
+
+    Returns:
+        numpy.ndarray: 点の数の配列
+    """
+    counts = np.zeros(mask.shape, dtype=np.int8)
+    counts[1:, :] += mask[:-1, :]
+    counts[:-1, :] += mask[1:, :]
+    counts[:, 1:] += mask[:, :-1]
+    counts[:, :-1] += mask[:, 1:]
+    return counts
+
+
+def eye_points(board, color):
+    """
+    指定した色の眼とみなす空点を求める（盤内の隣接点がすべて指定色の石で、隣接点が3つ以上ある空点）
+
+    Args:
+        board: 盤面の状態（size x size の配列）
+        color: 石の色
+
+    Returns:
+        numpy.ndarray: 眼とみなす点がTrueのbool配列
+    """
+    sides = count_neighbors(np.ones(board.shape, dtype=bool))
+    own = count_neighbors(board == color)
+    return (board == EMPTY) & (own == sides) & (sides >= 3)
+
+
+def true_eye_points(board, color):
+    """
+    指定した色が埋めるべきでない自分の眼を求める（PlayoutBoard.is_eyeと同じ判定）
+
+    上下左右がすべて指定色の石か盤外で、斜めの相手の石が少ない（辺・隅では0、中央では1以下）空点を眼とする。
+
+    Args:
+        board: 盤面の状態（size x size の配列）
+        color: 石の色
+
+    Returns:
+        numpy.ndarray: 眼とみなす点がTrueのbool配列
+    """
+    # 盤外を-1で囲み、各点の上下左右・斜めの点をずらした配列で見る
+    padded = np.pad(board, 1, constant_values=-1)
+    size_y, size_x = board.shape
+    neighbors = [padded[1 + dy:1 + dy + size_y, 1 + dx:1 + dx + size_x]
+                 for dx, dy in ((0, -1), (0, 1), (-1, 0), (1, 0))]
+    diagonals = [padded[1 + dy:1 + dy + size_y, 1 + dx:1 + dx + size_x]
+                 for dx, dy in ((-1, -1), (1, -1), (-1, 1), (1, 1))]
+
+    eyes = board == EMPTY
+    for neighbor in neighbors:
+        eyes &= (neighbor == color) | (neighbor == -1)
+
+    opponent = WHITE if color == BLACK else BLACK
+    bad = sum((diagonal == opponent).astype(int) for diagonal in diagonals)
+    at_edge = np.any([diagonal == -1 for diagonal in diagonals], axis=0)
+    return eyes & np.where(at_edge, bad == 0, bad <= 1)
+
+
+def safety_level(eyes, liberties):
+    """
+    眼の数と呼吸点の数から石の安全度を求める
+
+    Args:
+        eyes: 眼の数
+        liberties: 呼吸点の数
+
+    Returns:
+        int: 安全度（0:死確定 〜 3:安全）
+    """
+    if eyes >= 2:
+        return 3  # 安全
+    elif eyes == 1 and liberties >= 3:
+        return 2  # やや安全
+    elif liberties >= 3 or (eyes == 1 and liberties >= 2):
+        return 1  # やや危険
+    else:
+        return 0  # 非常に危険
+
+
+def calculate_group_safety(board, group):
+    """
+    石グループの安全度を計算
+
+    Args:
+        board: 盤面の状態（size x size の配列）
+        group: 石のグループ（座標のリスト）
+
+    Returns:
+        int: 安全度（0:死確定 〜 3:安全）
+    """
+    if not group:
+        return 0
+
+    size = board.shape[0]
+    color = board[group[0][1], group[0][0]]
+    liberties = set()
+    for x, y in group:
+        for nx, ny in ((x, y + 1), (x + 1, y), (x, y - 1), (x - 1, y)):
+            if 0 <= nx < size and 0 <= ny < size and board[ny, nx] == EMPTY:
+                liberties.add((nx, ny))
+
+    eyes = 0
+    for x, y in liberties:
+        sides = [(nx, ny) for nx, ny in ((x, y + 1), (x + 1, y), (x, y - 1), (x - 1, y))
+                 if 0 <= nx < size and 0 <= ny < size]
+        if len(sides) >= 3 and all(board[ny, nx] == color for nx, ny in sides):
+            eyes += 1
+
+    return safety_level(eyes, len(liberties))
+
+
+def calculate_stone_safety(board, bitboard=None):
+    """
+    盤面のすべての石の安全度を計算（連ごとに眼と呼吸点の数から求め、連全体に設定）
+
+    Args:
+        board: 盤面の状態（size x size の配列）
+        bitboard: 盤面と一致するビットボード（省略時は盤面から作成）
+
+    Returns:
+        numpy.ndarray: 石の安全度（空点は0）
+    """
+    if bitboard is None:
+        bitboard = BitBoard.from_array(board, BLACK, WHITE)
+
+    empty = bitboard.empty
+    stone_safety = np.zeros(board.shape, dtype=int)
+    for color in (BLACK, WHITE):
+        stones = bitboard.stones(color, BLACK)
+        eyes = bitboard.to_mask(eye_points(board, color))
+        remaining = stones
+        while remaining:
+            # 連ごとに1回だけ塗りつぶす
+            group = bitboard.flood(remaining & -remaining, stones)
+            remaining &= ~group
+            liberties = bitboard.adjacent(group) & empty
+            safety = safety_level(BitBoard.count(liberties & eyes), BitBoard.count(liberties))
+            if safety:
+                stone_safety[bitboard.to_array(group)] = safety
+    return stone_safety
+
+
+def predict_capture_moves(board, x, y, color, ko=None):
+    """
+    指定した空点に石を置いた場合、置いた石が取られるまでの手数を呼吸点の数から予測
+
+    Args:
+        board: 盤面の状態（size x size の配列）
+        x, y: 石を置く位置の座標
+        color: 石の色
+        ko: コウで置けない点の座標（ない場合はNone）
+
+    Returns:
+        int: 取られるまでの手数（0は自殺手、-1は取れない・置けないことを示す）
+    """
+    if board[y, x] != EMPTY:
+        return -1
+
+    bitboard = BitBoard.from_array(board, BLACK, WHITE)
+    point = bitboard.bit(x, y)
+    own = bitboard.stones(color, BLACK) | point
+    opponent = bitboard.white if color == BLACK else bitboard.black
+    empty = bitboard.empty & ~point
+
+    # 呼吸点がなくなる相手の連は取られて空点になる
+    remaining = opponent & bitboard.adjacent(point)
+    while remaining:
+        group = bitboard.flood(remaining & -remaining, opponent)
+        remaining &= ~group
+        if not bitboard.adjacent(group) & empty:
+            empty |= group
+
+    liberties = BitBoard.count(bitboard.adjacent(bitboard.flood(point, own)) & empty)
+    if liberties == 0:
+        return 0
+    if ko == (x, y):
+        return -1
+
+    # 呼吸点が1つなら1手、2つなら2手で取られうる
+    return liberties if liberties <= 2 else -1
+
+
+def freeze(*arrays):
+    """
+    配列を読み取り専用にする（解析結果を複数の利用者で共有するため）
+
+    Args:
+        arrays: numpy配列
+
+    Returns:
+        tuple: 読み取り専用にした配列
+    """
+    for array in arrays:
+        array.flags.writeable = False
+    return arrays
+
+
+def analyze_position(board, bitboard=None):
+    """
+    局面の陣地・影響圏・石の安全度をまとめて計算
+
+    Args:
+        board: 盤面の状態（size x size の配列）
+        bitboard: 盤面と一致するビットボード（省略時は盤面から作成）
+
+    Returns:
+        PositionAnalysis: 解析結果（配列はすべて読み取り専用）
+    """
+    if bitboard is None:
+        bitboard = BitBoard.from_array(board, BLACK, WHITE)
+
+    black_territory, white_territory = calculate_territories(board, bitboard)
+    black_influence, white_influence = calculate_influence(board)
+    stone_safety = calculate_stone_safety(board, bitboard)
+    return PositionAnalysis(*freeze(black_territory, white_territory,
+                                    black_influence, white_influence, stone_safety))
+
+
+def preview_move(board, x, y, color, ko=None):
+    """
+    指定した空点に石を置いた場合のプレビューを計算（引数の盤面は変更しない）
+
+    Args:
+        board: 盤面の状態（size x size の配列）
+        x, y: 石を置く位置の座標
+        color: 置く石の色
+        ko: コウで置けない点の座標（ない場合はNone）
+
+    Returns:
+        PreviewResult: プレビューの計算結果（配列はすべて読み取り専用）
+    """
+    preview_board = np.array(board, copy=True)
+    preview_board[y, x] = color
+
+    analysis = analyze_position(preview_board)
+    capture_moves = predict_capture_moves(board, x, y, color, ko)
+    return PreviewResult(freeze(preview_board)[0], *analysis, capture_moves)
@@ -0,0 +1,216 @@
+"""
+多倍長整数のビット列で盤面を表現するモジュール
+"""
+import numpy as np
+
+
+class BitBoard:
+    """
+    黒石・白石の配置をPythonの整数のビット列として保持するクラス。
+    点 (x, y) は y * size + x 番目のビットに対応する。
+    塗りつぶしや呼吸点の計算をシフトとAND/ORでまとめて行う。
+    """
+
+    def __init__(self, size):
+        """
+        初期化
+
+        Args:
+            size: 盤面のサイズ
+        """
+        self.size = size
+        self.full = (1 << (size * size)) - 1
+
+        # 左端の列・右端の列を除いたマスク（横方向のシフトで行をまたがないようにする）
+        left_column = 0
+        for y in range(size):
+            left_column |= 1 << (y * size)
+        right_column = left_column << (size - 1)
+        self.not_left = self.full & ~left_column
+        self.not_right = self.full & ~right_column
+
+        self.black = 0
+        self.white = 0
+
+    @classmethod
+    def from_array(cls, board, black=1, white=2):
+        """
+        numpy配列の盤面からビットボードを作成
+
+        Args:
+            board: 盤面の状態（size x size の配列）
+            black: 黒石を表す値
+            white: 白石を表す値
+
+        Returns:
+            BitBoard: 作成したビットボード
+        """
+        bitboard = cls(board.shape[0])
+        flat = np.asarray(board).ravel()
+        for index in np.flatnonzero(flat == black):
+            bitboard.black |= 1 << int(index)
+        for index in np.flatnonzero(flat == white):
+            bitboard.white |= 1 << int(index)
+        return bitboard
+
+    @property
+    def empty(self):
+        """空点のビット列"""
+        return self.full & ~(self.black | self.white)
+
+    def stones(self, color, black=1):
+        """
+        指定した色の石のビット列を取得
+
+        Args:
+            color: 石の色
+            black: 黒石を表す値
+
+        Returns:
+            int: 石のビット列
+        """
+        return self.black if color == black else self.white
+
+    def bit(self, x, y):
+        """
+        指定した点のビットを取得
+
+        Args:
+            x, y: 点の座標（numpyの整数でもよい）
+
+        Returns:
+            int: 点に対応するビット
+        """
+        # numpyの整数のままシフトすると64ビットを超える点で溢れるため、Pythonの整数にする
+        return 1 << (int(y) * self.size + int(x))
+
+    def set_stone(self, x, y, color, black=1):
+        """
+        指定した点に石を置く
+
+        Args:
+            x, y: 点の座標
+            color: 石の色
+            black: 黒石を表す値
+        """
+        bit = self.bit(x, y)
+        if color == black:
+            self.black |= bit
+        else:
+            self.white |= bit
+
+    def clear(self, mask):
+        """
+        指定したビット列の石を取り除く
+
+        Args:
+            mask: 取り除く点のビット列
+        """
+        self.black &= ~mask
+        self.white &= ~mask
+
+    def dilate(self, mask):
+        """
+        ビット列を上下左右に1マス膨張させる
+
+        Args:
+            mask: 点のビット列
+
+        Returns:
+            int: 膨張後のビット列（元の点を含む）
+        """
+        size = self.size
+        return (mask
+                | ((mask << 1) & self.not_left)
+                | ((mask >> 1) & self.not_right)
+                | ((mask << size) & self.full)
+                | (mask >> size))
+
+    def adjacent(self, mask):
+        """
+        ビット列に隣接する点（元の点を除く）を取得
+
+        Args:
+            mask: 点のビット列
+
+        Returns:
+            int: 隣接する点のビット列
+        """
+        return self.dilate(mask) & ~mask
+
+    def flood(self, seed, within):
+        """
+        指定した点から、領域内で繋がっている点をすべて塗りつぶす
+
+        Args:
+            seed: 開始点のビット列
+            within: 塗りつぶし可能な領域のビット列
+
+        Returns:
+            int: 塗りつぶされた点のビット列
+        """
+        region = seed & within
+        while True:
+            grown = self.dilate(region) & within
+            if grown == region:
+                return region
+            region = grown
+
+    def points(self, mask):
+        """
+        ビット列を座標のリストに変換
+
+        Args:
+            mask: 点のビット列
+
+        Returns:
+            list: 座標 (x, y) のリスト
+        """
+        points = []
+        while mask:
+            low = mask & -mask
+            index = low.bit_length() - 1
+            points.append((index % self.size, index // self.size))
+            mask ^= low
+        return points
+
+    def to_array(self, mask):
+        """
+        ビット列をbool型のnumpy配列に変換
+
+        Args:
+            mask: 点のビット列
+
+        Returns:
+            numpy.ndarray: size x size のbool配列
+        """
+        count = self.size * self.size
+        raw = np.frombuffer(mask.to_bytes((count + 7) // 8, 'little'), dtype=np.uint8)
+        bits = np.unpackbits(raw, bitorder='little')[:count]
+        return bits.reshape(self.size, self.size).astype(bool)
+
+    def to_mask(self, array):
+        """
+        bool型のnumpy配列をビット列に変換
+
+        Args:
+            array: size x size のbool配列
+
+        Returns:
+            int: 点のビット列
+        """
+        packed = np.packbits(np.asarray(array, dtype=bool).ravel(), bitorder='little')
+        return int.from_bytes(packed.tobytes(), 'little')
+
+    @staticmethod
+    def count(mask):
+        """
+        ビット列に含まれる点の数を数える
+
+        Args:
+            mask: 点のビット列
+
+        Returns:
+            int: 点の数
+        """
+        return bin(mask).count('1')
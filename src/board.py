@@ -1,7 +1,125 @@
 import numpy as np
-from collections import deque
+from collections import deque, Counter, OrderedDict
 import sys
+import threading
 from src.life_death import LifeDeathAnalyzer
+from src.bitboard import BitBoard
+from src.zobrist import get_keys, hash_board
+from src import analysis
+
+class BoardArray(np.ndarray):
+    """
+    盤面の状態の配列。直接書き換えられたことを記録する。
+    Boardはこの記録を見て連の情報を作り直すため、盤面全体を毎回比較しなくてよい。
+    
+    記録する書き換え: 要素への代入（ビュー・flatを通したものを含む）、fill、put、
+    ufuncのoutへの書き込み、np.copyto・np.put・np.place・np.putmask・np.put_along_axis・np.fill_diagonal。
+    それ以外のその場での変更（sortなど）は記録しないため、盤面には使わないこと。
+    """
+    # 直接書き換えられたかどうか（ビューへの代入は元の配列にも記録する）
+    edited = False
+    
+    # 第1引数の配列を書き換えるnumpyの関数
+    WRITING_FUNCTIONS = {np.copyto, np.put, np.place, np.putmask, np.put_along_axis, np.fill_diagonal}
+    
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self.mark_edited()
+    
+    def fill(self, value):
+        super().fill(value)
+        self.mark_edited()
+    
+    def put(self, *args, **kwargs):
+        super().put(*args, **kwargs)
+        self.mark_edited()
+    
+    @property
+    def flat(self):
+        """要素を順に参照するイテレータ（書き換えに使われうるため、参照した時点で書き換えたものとする）"""
+        self.mark_edited()
+        return np.ndarray.flat.__get__(self)
+    
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        # 計算結果は通常の配列・スカラーとして返し、outに指定された場合は書き換えを記録する
+        inputs = tuple(x.view(np.ndarray) if isinstance(x, BoardArray) else x for x in inputs)
+        outputs = kwargs.get('out', ())
+        if outputs:
+            kwargs['out'] = tuple(x.view(np.ndarray) if isinstance(x, BoardArray) else x for x in outputs)
+        result = getattr(ufunc, method)(*inputs, **kwargs)
+        for output in outputs:
+            if isinstance(output, BoardArray):
+                output.mark_edited()
+        return result
+    
+    def __array_function__(self, func, types, args, kwargs):
+        result = super().__array_function__(func, types, args, kwargs)
+        if func in self.WRITING_FUNCTIONS and args and isinstance(args[0], BoardArray):
+            args[0].mark_edited()
+        return result
+    
+    def mark_edited(self):
+        """この配列と、ビューの元の配列に書き換えられたことを記録する"""
+        array = self
+        while isinstance(array, BoardArray):
+            array.edited = True
+            array = array.base
+
+
+class Chain:
+    """
+    連（縦横に繋がった同じ色の石の集まり）の情報を保持するクラス。
+    石を置く・取るたびに差分で更新される。
+    """
+    __slots__ = ('color', 'stones', 'liberties')
+    
+    def __init__(self, color):
+        """
+        連の初期化
+        
+        Args:
+            color: 石の色（BLACK or WHITE）
+        """
+        self.color = color
+        self.stones = set()  # 連に属する石の座標
+        self.liberties = set()  # 連の呼吸点の座標
+
+class MoveRecord:
+    """
+    Board.play()で打った手を Board.undo() で元に戻すための記録。
+    変更された点・取った石・変更前の連の状態・コウ・取った石の数・ハッシュを保持する。
+    """
+    __slots__ = ('x', 'y', 'color', 'captured', 'saved_chains',
+                 'ko', 'black_captures', 'white_captures', 'hash')
+    
+    def __init__(self, board, x, y, color):
+        """
+        打つ前の盤面の状態を記録
+        
+        Args:
+            board: 盤面オブジェクト
+            x, y: 石を置く位置の座標
+            color: 石の色（BLACK or WHITE）
+        """
+        self.x = x
+        self.y = y
+        self.color = color
+        self.captured = []
+        self.saved_chains = {}
+        self.ko = board.ko
+        self.black_captures = board.black_captures
+        self.white_captures = board.white_captures
+        self.hash = board.hash
+    
+    def save_chain(self, chain):
+        """
+        変更される前の連の状態を記録（同じ連は最初の1回だけ記録する）
+        
+        Args:
+            chain: 変更される連
+        """
+        if id(chain) not in self.saved_chains:
+            self.saved_chains[id(chain)] = (chain, set(chain.stones), set(chain.liberties))
 
 class Board:
     """
@@ -16,30 +134,79 @@ class Board:
     # 勝敗結果
     DRAW = 0
     
-    def __init__(self, size=9):
+    # プレビューの計算結果を保持する数（19路盤の全点を2局面分保持できる数）
+    PREVIEW_CACHE_SIZE = 1024
+    
+    def __init__(self, size=9, superko=False):
         """
         盤面の初期化
         
         Args:
             size: 盤面のサイズ（デフォルト: 9x9）
+            superko: 同じ局面の再現を禁止する（スーパーコウ）かどうか
         """
         self.size = size
+        self.superko = superko
+        self.zobrist_keys = get_keys(size)
+        
+        # 局面が変わるたびに増える番号（陣地などの再計算が必要かの判定に使う）
+        self.generation = 0
+        
+        # 各点の隣接点（盤外を除く）を事前に計算しておく
+        self.neighbors = [[[(x + dx, y + dy) for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]
+                            if 0 <= x + dx < size and 0 <= y + dy < size]
+                           for x in range(size)]
+                          for y in range(size)]
+        
+        # プレビューの計算結果はバックグラウンドの先読みからも書き込まれる（PreviewWorker参照）
+        self.preview_lock = threading.Lock()
+        
         self.reset()
         self.life_death_analyzer = LifeDeathAnalyzer(self)
     
+    def copy(self):
+        """
+        局面（盤面・コウ・取った石の数・局面の履歴）を複製した盤面を作成
+        
+        Returns:
+            Board: 複製した盤面（プレビューの計算結果は共有しない）
+        """
+        self.sync_chains()
+        board = Board(self.size, self.superko)
+        board.board = self.board.copy()
+        board.rebuild_chains()
+        board.ko = self.ko
+        board.black_captures = self.black_captures
+        board.white_captures = self.white_captures
+        board.hash_history = list(self.hash_history)
+        board.seen_hashes = Counter(self.seen_hashes)
+        return board
+    
+    @property
+    def board(self):
+        """盤面の状態（0: 空, 1: 黒, 2: 白）の配列（直接書き換えると次に参照したときに連の情報を作り直す）"""
+        return self.board_array
+    
+    @board.setter
+    def board(self, array):
+        """
+        盤面の状態を置き換える（配列は複製し、渡した配列をその後書き換えても盤面は変わらない）
+        
+        Args:
+            array: 盤面の状態（size x size の配列）
+        """
+        self.board_array = np.array(array, dtype=int).view(BoardArray)
+        self.board_array.edited = True
+    
     def reset(self):
         """盤面をリセット"""
         # 盤面の状態（0: 空, 1: 黒, 2: 白）
         self.board = np.zeros((self.size, self.size), dtype=int)
         
-        # 陣地情報
-        self.black_territory = np.zeros((self.size, self.size), dtype=bool)  # 確定陣地
-        self.white_territory = np.zeros((self.size, self.size), dtype=bool)  # 確定陣地
-        self.black_influence = np.zeros((self.size, self.size), dtype=bool)  # 影響圏
-        self.white_influence = np.zeros((self.size, self.size), dtype=bool)  # 影響圏
-        
-        # 生死判定情報
-        self.stone_safety = np.zeros((self.size, self.size), dtype=int)  # 石の安全度
+        # 局面から求める情報（確定陣地・影響圏・石の安全度）
+        # 局面が変わった後、最初に参照したときに計算する（update_territories参照）
+        self.derived = {}
+        self.derived_generation = -1
         
         # 取った石のカウント
         self.black_captures = 0
@@ -56,13 +223,78 @@ class Board:
         self.preview_white_influence = None
         self.preview_stone_safety = None
         
+        # プレビューの計算結果（(局面のハッシュ, x, y, 色) をキーとし、古いものから捨てる）
+        self.preview_cache = OrderedDict()
+        
         # 勝者
         self.winner = None
         
+        # 連の情報（各点が属する連、空点はNone）
+        self.rebuild_chains()
+        
+        # 局面のハッシュの履歴（スーパーコウの判定に使う）
+        self.hash_history = [self.hash]
+        self.seen_hashes = Counter(self.hash_history)
+        
         # 生死判定アナライザーを更新
         if hasattr(self, 'life_death_analyzer'):
             self.life_death_analyzer = LifeDeathAnalyzer(self)
     
+    @property
+    def black_territory(self):
+        """黒の確定陣地"""
+        return self.get_derived('black_territory')
+    
+    @property
+    def white_territory(self):
+        """白の確定陣地"""
+        return self.get_derived('white_territory')
+    
+    @property
+    def black_influence(self):
+        """黒の影響圏"""
+        return self.get_derived('black_influence')
+    
+    @property
+    def white_influence(self):
+        """白の影響圏"""
+        return self.get_derived('white_influence')
+    
+    @property
+    def stone_safety(self):
+        """石の安全度"""
+        return self.get_derived('stone_safety')
+    
+    def get_derived(self, name):
+        """
+        局面から求める情報を取得（局面が変わっていれば再計算する）
+        
+        Args:
+            name: 情報の名前
+            
+        Returns:
+            numpy.ndarray: 情報の配列
+        """
+        self.sync_chains()
+        if self.derived_generation != self.generation:
+            self.update_territories()
+        return self.derived[name]
+    
+    def mark_changed(self):
+        """局面が変わったことを記録し、局面から求めた情報を古いものとする"""
+        self.generation += 1
+        self.legal_moves_cache = {}
+    
+    def note_changed(self, x, y):
+        """
+        陣地情報の差分更新のため、石が置かれた・取られた点を記録する
+        
+        Args:
+            x, y: 変化した点の座標
+        """
+        if self.changed_points is not None:
+            self.changed_points.add((x, y))
+    
     def calculate_score(self, color):
         """
         指定した色の得点を計算
@@ -116,6 +348,9 @@ class Board:
         if not (0 <= x < self.size and 0 <= y < self.size):
             return True
         
+        # 盤面が直接書き換えられていれば連の情報を作り直す
+        self.sync_chains()
+        
         # 空点チェック
         if self.board[y, x] != Board.EMPTY:
             return True
@@ -124,56 +359,371 @@ class Board:
         if self.ko == (x, y):
             return True
         
+        # スーパーコウのルールチェック
+        if self.superko and not self.is_suicide(x, y, color) and self.hash_after_move(x, y, color) in self.seen_hashes:
+            return True
+        
+        # 石を置いて相手の石を取る
+        chain, captured = self.apply_move(x, y, color)
+        
+        # 自殺手チェック
+        if not chain.liberties:
+            # 自分の石を取る
+            removed = self.remove_chain(chain)
+            
+            # 取った石の数を更新（相手の得点になる）
+            if color == Board.BLACK:
+                self.white_captures += len(removed)
+            else:
+                self.black_captures += len(removed)
+            
+            self.record_position()
+            return True
+        
+        # 陣地情報は次に参照されたときに更新される
+        self.record_position()
+        
+        return False
+    
+    def rebuild_chains(self):
+        """盤面全体から連の情報を作り直す"""
+        self.board.edited = False
+        
+        # 連の情報に合わせて石を置く・取るときは、書き換えを記録しないビューに書き込む
+        self.cells = self.board.view(np.ndarray)
+        
+        self.chain_at = [[None] * self.size for _ in range(self.size)]
+        
+        for y in range(self.size):
+            for x in range(self.size):
+                color = self.board[y, x]
+                if color == Board.EMPTY or self.chain_at[y][x] is not None:
+                    continue
+                
+                # 同じ色の石を辿って連を作る
+                chain = Chain(color)
+                chain.stones.add((x, y))
+                self.chain_at[y][x] = chain
+                queue = deque([(x, y)])
+                while queue:
+                    cx, cy = queue.popleft()
+                    for nx, ny in self.neighbors[cy][cx]:
+                        if self.board[ny, nx] == Board.EMPTY:
+                            chain.liberties.add((nx, ny))
+                        elif self.board[ny, nx] == color and self.chain_at[ny][nx] is None:
+                            chain.stones.add((nx, ny))
+                            self.chain_at[ny][nx] = chain
+                            queue.append((nx, ny))
+        
+        # ハッシュとビットボードも同じ盤面から作り直す
+        self.hash = hash_board(self.board)
+        self.bitboard = BitBoard.from_array(self.board, Board.BLACK, Board.WHITE)
+        
+        # 盤面全体が変わりうるため変化した点は記録しない
+        self.changed_points = None
+        self.mark_changed()
+    
+    def sync_chains(self):
+        """盤面が直接書き換えられた・置き換えられた場合に連の情報を作り直す（盤面全体は比較しない）"""
+        if self.board.edited:
+            self.rebuild_chains()
+    
+    def is_legal(self, x, y, color):
+        """
+        指定した色の石を置けるかどうかを連の呼吸点から判定
+        
+        Args:
+            x, y: 石を置く位置の座標
+            color: 石の色（BLACK or WHITE）
+            
+        Returns:
+            bool: 石を置けるかどうか（盤外・既に石がある・コウ・自殺手・スーパーコウの場合はFalse）
+        """
+        if not (0 <= x < self.size and 0 <= y < self.size):
+            return False
+        
+        self.sync_chains()
+        if self.chain_at[y][x] is not None or self.ko == (x, y):
+            return False
+        
+        if not self.keeps_liberty(x, y, color):
+            return False
+        
+        if self.superko and self.hash_after_move(x, y, color) in self.seen_hashes:
+            return False
+        
+        return True
+    
+    def keeps_liberty(self, x, y, color):
+        """
+        空点に石を置いたとき、置いた石の連に呼吸点が残るか（自殺手でないか）を連の情報から判定
+        
+        Args:
+            x, y: 石を置く位置の座標（空点であること）
+            color: 石の色（BLACK or WHITE）
+            
+        Returns:
+            bool: 呼吸点が残るかどうか
+        """
+        # 空点に接している・呼吸点が2つ以上ある自分の連に繋がる・アタリの相手の連を取る、のいずれかなら自殺手ではない
+        for nx, ny in self.neighbors[y][x]:
+            neighbor = self.chain_at[ny][nx]
+            if neighbor is None:
+                return True
+            if neighbor.color == color and len(neighbor.liberties) > 1:
+                return True
+            if neighbor.color != color and len(neighbor.liberties) == 1:
+                return True
+        return False
+    
+    def legal_moves(self, color):
+        """
+        指定した色が石を置ける点を1回の走査でまとめて求める
+        
+        Args:
+            color: 石の色（BLACK or WHITE）
+            
+        Returns:
+            numpy.ndarray: 石を置ける点がTrueのbool配列（読み取り専用）
+        """
+        self.sync_chains()
+        key = (color, self.ko, self.superko)
+        mask = self.legal_moves_cache.get(key)
+        if mask is not None:
+            return mask
+        
+        mask = np.zeros((self.size, self.size), dtype=bool)
+        for x, y in self.bitboard.points(self.bitboard.empty):
+            if self.ko == (x, y) or not self.keeps_liberty(x, y, color):
+                continue
+            if self.superko and self.hash_after_move(x, y, color) in self.seen_hashes:
+                continue
+            mask[y, x] = True
+        
+        # 局面が変わるまで使い回す
+        mask.flags.writeable = False
+        self.legal_moves_cache[key] = mask
+        return mask
+    
+    def play(self, x, y, color):
+        """
+        探索用に石を置く（陣地情報は更新しない）。Board.undo()で元に戻せる
+        
+        Args:
+            x, y: 石を置く位置の座標
+            color: 石の色（BLACK or WHITE）
+            
+        Returns:
+            MoveRecord or None: 元に戻すための記録（石を置けない場合はNone）
+        """
+        if not self.is_legal(x, y, color):
+            return None
+        
+        record = MoveRecord(self, x, y, color)
+        chain, record.captured = self.apply_move(x, y, color, record)
+        self.record_position()
+        return record
+    
+    def undo(self, record):
+        """
+        Board.play()で打った手を元に戻す（打った順と逆の順に呼び出すこと）
+        
+        Args:
+            record: Board.play()が返した記録
+        """
+        x, y = record.x, record.y
+        
+        # 変更された連を元の状態に戻す
+        for chain, stones, liberties in record.saved_chains.values():
+            chain.stones = stones
+            chain.liberties = liberties
+            for sx, sy in stones:
+                self.chain_at[sy][sx] = chain
+        
+        # 置いた石を取り除く（置いた石の連は記録されていることがあるため、連を戻した後に行う）
+        self.cells[y, x] = Board.EMPTY
+        self.chain_at[y][x] = None
+        self.bitboard.clear(self.bitboard.bit(x, y))
+        self.note_changed(x, y)
+        
+        # 取った石を戻す
+        opponent = Board.WHITE if record.color == Board.BLACK else Board.BLACK
+        for sx, sy in record.captured:
+            self.cells[sy, sx] = opponent
+            self.bitboard.set_stone(sx, sy, opponent, Board.BLACK)
+            self.note_changed(sx, sy)
+        
+        # 局面の履歴・コウ・取った石の数を戻す
+        last_hash = self.hash_history.pop()
+        self.seen_hashes[last_hash] -= 1
+        if not self.seen_hashes[last_hash]:
+            del self.seen_hashes[last_hash]
+        self.mark_changed()
+        self.hash = record.hash
+        self.ko = record.ko
+        self.black_captures = record.black_captures
+        self.white_captures = record.white_captures
+    
+    def apply_move(self, x, y, color, record=None):
+        """
+        石を置いて相手の石を取り、取った石の数とコウを更新する（自殺手の処理は行わない）
+        
+        Args:
+            x, y: 石を置く位置の座標
+            color: 石の色（BLACK or WHITE）
+            record: 変更を記録するMoveRecord（記録しない場合はNone）
+            
+        Returns:
+            tuple: (置いた石が属する連, 取った石の座標のリスト)
+        """
         # 石を置く
-        self.board[y, x] = color
+        chain = self.add_stone(x, y, color, record)
         
-        # 相手の石を取る
+        # 相手の石を取る（呼吸点がなくなった隣接する相手の連）
         opponent = Board.WHITE if color == Board.BLACK else Board.BLACK
         captured = []
-        
-        # 隣接する4方向をチェック
-        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < self.size and 0 <= ny < self.size and self.board[ny, nx] == opponent:
-                group = self.find_group(nx, ny)
-                if not self.has_liberty(group):
-                    # 石を取る
-                    for gx, gy in group:
-                        self.board[gy, gx] = Board.EMPTY
-                        captured.append((gx, gy))
-                    
-                    # 取った石の数を更新
-                    if color == Board.BLACK:
-                        self.black_captures += len(group)
-                    else:
-                        self.white_captures += len(group)
+        for nx, ny in self.neighbors[y][x]:
+            neighbor = self.chain_at[ny][nx]
+            if neighbor is not None and neighbor.color == opponent and not neighbor.liberties:
+                captured.extend(self.remove_chain(neighbor, record))
+        
+        # 取った石の数を更新
+        if color == Board.BLACK:
+            self.black_captures += len(captured)
+        else:
+            self.white_captures += len(captured)
         
         # コウの判定
-        if len(captured) == 1 and self.is_single_stone(x, y):
+        if len(captured) == 1 and len(chain.stones) == 1:
             # 打った石が単独で、かつ相手の石を1つだけ取った場合はコウ
             self.ko = captured[0]
         else:
             self.ko = None
         
-        # 自殺手チェック
-        group = self.find_group(x, y)
-        if not self.has_liberty(group):
-            # 自分の石を取る
-            for gx, gy in group:
-                self.board[gy, gx] = Board.EMPTY
+        return chain, captured
+    
+    def add_stone(self, x, y, color, record=None):
+        """
+        石を置き、連の情報を差分で更新する（石を取る処理は行わない）
+        
+        Args:
+            x, y: 石を置く位置の座標
+            color: 石の色（BLACK or WHITE）
+            record: 変更を記録するMoveRecord（記録しない場合はNone）
             
-            # 取った石の数を更新（相手の得点になる）
-            if color == Board.BLACK:
-                self.white_captures += len(group)
-            else:
-                self.black_captures += len(group)
+        Returns:
+            Chain: 置いた石が属する連
+        """
+        self.cells[y, x] = color
+        self.bitboard.set_stone(x, y, color, Board.BLACK)
+        self.note_changed(x, y)
+        self.hash ^= self.zobrist_keys[color][y * self.size + x]
+        
+        chain = Chain(color)
+        chain.stones.add((x, y))
+        self.chain_at[y][x] = chain
+        
+        for nx, ny in self.neighbors[y][x]:
+            neighbor = self.chain_at[ny][nx]
+            if neighbor is None:
+                chain.liberties.add((nx, ny))
+                continue
             
-            return True
+            # 隣接する連の呼吸点が1つ減る
+            if record is not None:
+                record.save_chain(neighbor)
+            neighbor.liberties.discard((x, y))
+            
+            # 同じ色の連は大きい方へ統合する
+            if neighbor.color == color and neighbor is not chain:
+                if len(neighbor.stones) < len(chain.stones):
+                    chain, neighbor = neighbor, chain
+                for sx, sy in chain.stones:
+                    self.chain_at[sy][sx] = neighbor
+                neighbor.stones |= chain.stones
+                neighbor.liberties |= chain.liberties
+                chain = neighbor
+        
+        return chain
+    
+    def remove_chain(self, chain, record=None):
+        """
+        連を盤面から取り除き、隣接する連に呼吸点を戻す
         
-        # 陣地情報を更新
-        self.update_territories()
+        Args:
+            chain: 取り除く連
+            record: 変更を記録するMoveRecord（記録しない場合はNone）
+            
+        Returns:
+            list: 取り除いた石の座標のリスト
+        """
+        if record is not None:
+            record.save_chain(chain)
+        
+        mask = 0
+        for sx, sy in chain.stones:
+            self.cells[sy, sx] = Board.EMPTY
+            self.chain_at[sy][sx] = None
+            self.note_changed(sx, sy)
+            mask |= self.bitboard.bit(sx, sy)
+            self.hash ^= self.zobrist_keys[chain.color][sy * self.size + sx]
+        self.bitboard.clear(mask)
+        
+        for sx, sy in chain.stones:
+            for nx, ny in self.neighbors[sy][sx]:
+                neighbor = self.chain_at[ny][nx]
+                if neighbor is not None:
+                    if record is not None:
+                        record.save_chain(neighbor)
+                    neighbor.liberties.add((sx, sy))
+        
+        return list(chain.stones)
+    
+    def record_position(self):
+        """現在の局面のハッシュを履歴に記録する"""
+        self.hash_history.append(self.hash)
+        self.seen_hashes[self.hash] += 1
+        self.mark_changed()
+    
+    def hash_after_move(self, x, y, color):
+        """
+        指定した空点に石を置いた後の局面のハッシュを計算（盤面は変更しない）
         
-        return False
+        Args:
+            x, y: 石を置く位置の座標
+            color: 石の色（BLACK or WHITE）
+            
+        Returns:
+            int: 石を置いて相手の石を取った後の局面のハッシュ
+        """
+        self.sync_chains()
+        keys = self.zobrist_keys
+        value = self.hash ^ keys[color][y * self.size + x]
+        
+        # 呼吸点がこの点だけの相手の連は取られる
+        captured = []
+        for nx, ny in self.neighbors[y][x]:
+            neighbor = self.chain_at[ny][nx]
+            if (neighbor is not None and neighbor.color != color and neighbor.liberties == {(x, y)}
+                    and neighbor not in captured):
+                captured.append(neighbor)
+                for sx, sy in neighbor.stones:
+                    value ^= keys[neighbor.color][sy * self.size + sx]
+        
+        return value
+    
+    def get_chain(self, x, y):
+        """
+        指定した位置の石が属する連を取得
+        
+        Args:
+            x, y: 石の位置の座標
+            
+        Returns:
+            Chain or None: 連（空点の場合はNone）
+        """
+        self.sync_chains()
+        return self.chain_at[y][x]
     
     def is_single_stone(self, x, y):
         """
@@ -185,15 +735,19 @@ class Board:
         Returns:
             bool: 単独かどうか
         """
+        chain = self.get_chain(x, y)
+        if chain is not None:
+            return len(chain.stones) == 1
+        
         color = self.board[y, x]
         
         # 隣接する4方向をチェック
-        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < self.size and 0 <= ny < self.size and self.board[ny, nx] == color:
+        for nx, ny in self.neighbors[y][x]:
+            if self.board[ny, nx] == color:
                 return False
         
         return True
+    
     def find_group(self, x, y):
         """
         指定した位置の石と繋がっている石のグループを取得
@@ -204,27 +758,11 @@ class Board:
         Returns:
             list: グループに属する石の座標のリスト
         """
-        color = self.board[y, x]
-        if color == Board.EMPTY:
+        chain = self.get_chain(x, y)
+        if chain is None:
             return []
         
-        group = []
-        visited = np.zeros((self.size, self.size), dtype=bool)
-        queue = deque([(x, y)])
-        visited[y, x] = True
-        
-        while queue:
-            cx, cy = queue.popleft()
-            group.append((cx, cy))
-            
-            # 隣接する4方向をチェック
-            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                nx, ny = cx + dx, cy + dy
-                if 0 <= nx < self.size and 0 <= ny < self.size and not visited[ny, nx] and self.board[ny, nx] == color:
-                    queue.append((nx, ny))
-                    visited[ny, nx] = True
-        
-        return group
+        return list(chain.stones)
     
     def has_liberty(self, group):
         """
@@ -236,50 +774,107 @@ class Board:
         Returns:
             bool: 呼吸点があるかどうか
         """
+        if not group:
+            return False
+        
+        # グループが連そのものであれば記録済みの呼吸点を使う
+        gx, gy = group[0]
+        chain = self.get_chain(gx, gy)
+        if chain is not None and len(chain.stones) == len(group) and chain.stones.issuperset(group):
+            return bool(chain.liberties)
+        
         for x, y in group:
             # 隣接する4方向をチェック
-            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < self.size and 0 <= ny < self.size and self.board[ny, nx] == Board.EMPTY:
+            for nx, ny in self.neighbors[y][x]:
+                if self.board[ny, nx] == Board.EMPTY:
                     return True
         return False
     
-    def update_territories(self):
-        """陣地情報を更新"""
-        # 確定陣地の計算
-        self.black_territory, self.white_territory = self.calculate_territories()
+    def update_territories(self, incremental=True):
+        """
+        陣地情報を更新
         
-        # 影響圏の計算
-        self.black_influence, self.white_influence = self.calculate_influence()
+        Args:
+            incremental: 前回の計算結果がある場合、変化した点の周りだけ計算し直すかどうか
+        """
+        self.sync_chains()
+        changed = self.changed_points
+        
+        if (incremental and changed is not None and 'territory_masks' in self.derived
+                and len(changed) <= self.size * self.size // 4):
+            if changed:
+                bits = self.bitboard
+                changed_mask = 0
+                for x, y in changed:
+                    changed_mask |= bits.bit(x, y)
+                
+                # 変化した点に接する領域の確定陣地だけ計算し直す
+                black_mask, white_mask = analysis.update_territory_masks(
+                    bits, *self.derived['territory_masks'], changed_mask)
+                self.derived['territory_masks'] = (black_mask, white_mask)
+                self.derived['black_territory'][:] = bits.to_array(black_mask)
+                self.derived['white_territory'][:] = bits.to_array(white_mask)
+                
+                # 変化した点から2マス以内の影響圏だけ計算し直す
+                analysis.update_influence(self.board, self.derived['black_influence'],
+                                          self.derived['white_influence'], changed)
+                
+                # 変化した点の近くの連の安全度だけ計算し直す
+                self.update_stone_safety(changed_mask)
+        else:
+            # 確定陣地の計算
+            black_mask, white_mask = analysis.calculate_territory_masks(self.bitboard)
+            
+            # 影響圏の計算
+            black_influence, white_influence = self.calculate_influence()
+            
+            self.derived = {
+                'territory_masks': (black_mask, white_mask),
+                'black_territory': self.bitboard.to_array(black_mask),
+                'white_territory': self.bitboard.to_array(white_mask),
+                'black_influence': black_influence,
+                'white_influence': white_influence,
+            }
+            
+            # 石の安全度を更新
+            self.update_stone_safety()
         
-        # 石の安全度を更新
-        self.update_stone_safety()
+        self.changed_points = set()
+        self.derived_generation = self.generation
     
-    def update_stone_safety(self):
-        """石の安全度を更新"""
-        # 安全度をリセット
-        self.stone_safety = np.zeros((self.size, self.size), dtype=int)
+    def update_stone_safety(self, changed_mask=None):
+        """
+        石の安全度を更新
         
-        # 黒石の安全度を計算
-        for y in range(self.size):
-            for x in range(self.size):
-                if self.board[y, x] == Board.BLACK:
-                    # まだ計算していない場合のみ
-                    if self.stone_safety[y, x] == 0:
-                        group = self.find_group(x, y)
-                        safety = self.life_death_analyzer.calculate_group_safety(group)
-                        # グループ全体に安全度を設定
-                        for gx, gy in group:
-                            self.stone_safety[gy, gx] = safety
-                
-                elif self.board[y, x] == Board.WHITE:
-                    # まだ計算していない場合のみ
-                    if self.stone_safety[y, x] == 0:
-                        group = self.find_group(x, y)
-                        safety = self.life_death_analyzer.calculate_group_safety(group)
-                        # グループ全体に安全度を設定
-                        for gx, gy in group:
-                            self.stone_safety[gy, gx] = safety
+        Args:
+            changed_mask: 前回の計算から変化した点のビット列（省略時は盤面全体を計算し直す）
+        """
+        self.sync_chains()
+        if changed_mask is None or 'stone_safety' not in self.derived:
+            # 安全度をリセット
+            stone_safety = np.zeros((self.size, self.size), dtype=int)
+            chains = [chain for row in self.chain_at for chain in row if chain is not None]
+        else:
+            # 安全度は連の石と2マス以内の点だけで決まるため、変化した点から2マス以内の連だけ計算し直す
+            stone_safety = self.derived['stone_safety']
+            for x, y in self.bitboard.points(changed_mask):
+                stone_safety[y, x] = 0
+            nearby = self.bitboard.dilate(self.bitboard.dilate(changed_mask))
+            chains = [self.chain_at[y][x] for x, y in self.bitboard.points(
+                nearby & (self.bitboard.black | self.bitboard.white))]
+        
+        # 連ごとに安全度を計算し、連全体に設定
+        done = set()
+        for chain in chains:
+            if id(chain) in done:
+                continue
+            done.add(id(chain))
+            group = list(chain.stones)
+            safety = self.life_death_analyzer.calculate_group_safety(group)
+            for gx, gy in group:
+                stone_safety[gy, gx] = safety
+        
+        self.derived['stone_safety'] = stone_safety
     
     def calculate_territories(self):
         """
@@ -288,41 +883,9 @@ class Board:
         Returns:
             tuple: (黒の確定陣地, 白の確定陣地)
         """
-        black_territory = np.zeros((self.size, self.size), dtype=bool)
-        white_territory = np.zeros((self.size, self.size), dtype=bool)
-        
-        # 空点ごとに、それが誰の陣地かを判定
-        for y in range(self.size):
-            for x in range(self.size):
-                if self.board[y, x] != Board.EMPTY:
-                    continue
-                
-                # この空点が誰に囲まれているかを判定
-                surrounded_by_black = True
-                surrounded_by_white = True
-                
-                # 連結している空点のグループを取得
-                empty_group = self.find_empty_group(x, y)
-                
-                # このグループの境界をチェック
-                for ex, ey in empty_group:
-                    for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                        nx, ny = ex + dx, ey + dy
-                        if 0 <= nx < self.size and 0 <= ny < self.size:
-                            if self.board[ny, nx] == Board.BLACK:
-                                surrounded_by_white = False
-                            elif self.board[ny, nx] == Board.WHITE:
-                                surrounded_by_black = False
-                
-                # 確定陣地として登録
-                if surrounded_by_black and not surrounded_by_white:
-                    for ex, ey in empty_group:
-                        black_territory[ey, ex] = True
-                elif surrounded_by_white and not surrounded_by_black:
-                    for ex, ey in empty_group:
-                        white_territory[ey, ex] = True
-        
-        return black_territory, white_territory
+        # 空点の領域を1回ずつ塗りつぶし、片方の色だけに接する領域を陣地とする
+        self.sync_chains()
+        return analysis.calculate_territories(self.board, self.bitboard)
     
     def find_empty_group(self, x, y):
         """
@@ -337,23 +900,10 @@ class Board:
         if self.board[y, x] != Board.EMPTY:
             return []
         
-        group = []
-        visited = np.zeros((self.size, self.size), dtype=bool)
-        queue = deque([(x, y)])
-        visited[y, x] = True
-        
-        while queue:
-            cx, cy = queue.popleft()
-            group.append((cx, cy))
-            
-            # 隣接する4方向をチェック
-            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                nx, ny = cx + dx, cy + dy
-                if 0 <= nx < self.size and 0 <= ny < self.size and not visited[ny, nx] and self.board[ny, nx] == Board.EMPTY:
-                    queue.append((nx, ny))
-                    visited[ny, nx] = True
-        
-        return group
+        self.sync_chains()
+        bits = self.bitboard
+        return bits.points(bits.flood(bits.bit(x, y), bits.empty))
+    
     def calculate_influence(self):
         """
         影響圏を計算
@@ -361,79 +911,110 @@ class Board:
         Returns:
             tuple: (黒の影響圏, 白の影響圏)
         """
-        black_influence = np.zeros((self.size, self.size), dtype=bool)
-        white_influence = np.zeros((self.size, self.size), dtype=bool)
+        # 石からの距離を盤面全体でまとめて求める（石から1~2マス以内の空点を影響圏とする）
+        return analysis.calculate_influence(self.board)
+    
+    def update_preview(self, x, y, color=BLACK):
+        """
+        プレビュー用の一時的な盤面を更新
         
-        # 各石から1~2マス以内の空点を影響圏とする
-        for y in range(self.size):
-            for x in range(self.size):
-                if self.board[y, x] == Board.EMPTY:
-                    # 黒石からの距離を計算
-                    min_dist_black = self.calculate_min_distance(x, y, Board.BLACK)
-                    # 白石からの距離を計算
-                    min_dist_white = self.calculate_min_distance(x, y, Board.WHITE)
-                    
-                    # 影響圏の判定（距離が2以下で、かつ相手より近い）
-                    if min_dist_black <= 2 and (min_dist_black < min_dist_white or min_dist_white > 2):
-                        black_influence[y, x] = True
-                    if min_dist_white <= 2 and (min_dist_white < min_dist_black or min_dist_black > 2):
-                        white_influence[y, x] = True
+        Args:
+            x, y: プレビュー位置の座標
+            color: 置く石の色（デフォルトはプレイヤーの黒石）
+        """
+        if not self.is_valid_move(x, y, color):
+            self.preview_board = None
+            self.preview_stone_safety = None
+            return
+        
+        preview = self.get_preview(x, y, color)
         
-        return black_influence, white_influence
+        self.preview_board = preview.board
+        self.preview_black_territory = preview.black_territory
+        self.preview_white_territory = preview.white_territory
+        self.preview_black_influence = preview.black_influence
+        self.preview_white_influence = preview.white_influence
+        self.preview_stone_safety = preview.stone_safety
+        self.capture_moves = preview.capture_moves
     
-    def calculate_min_distance(self, x, y, color):
+    def get_preview(self, x, y, color):
         """
-        指定した位置から最も近い指定色の石までの距離を計算
+        プレビューを取得（同じ局面・同じ点のプレビューは前回の計算結果を使う）
         
         Args:
-            x, y: 位置の座標
-            color: 石の色
+            x, y: プレビュー位置の座標
+            color: 置く石の色
             
         Returns:
-            int: 最小距離（石がない場合は無限大）
+            PreviewResult: プレビューの計算結果
         """
-        min_dist = float('inf')
-        
-        for cy in range(self.size):
-            for cx in range(self.size):
-                if self.board[cy, cx] == color:
-                    dist = abs(x - cx) + abs(y - cy)  # マンハッタン距離
-                    min_dist = min(min_dist, dist)
-        
-        return min_dist
+        # 局面が変わるとハッシュが変わるため、古い局面の結果は使われない
+        self.sync_chains()
+        key = (self.hash, x, y, color)
+        preview = self.find_preview(key)
+        if preview is not None:
+            return preview
+        
+        preview = self.compute_preview(x, y, color)
+        self.store_preview(key, preview)
+        return preview
     
-    def update_preview(self, x, y):
+    def cached_preview(self, x, y, color):
         """
-        プレビュー用の一時的な盤面を更新
+        計算済みのプレビューを取得（計算されていなければ計算しない）
         
         Args:
             x, y: プレビュー位置の座標
+            color: 置く石の色
+            
+        Returns:
+            PreviewResult or None: プレビューの計算結果（未計算の場合はNone）
         """
-        if not self.is_valid_move(x, y):
-            self.preview_board = None
-            self.preview_stone_safety = None
-            return
-        
-        # 現在の盤面をコピー
-        self.preview_board = self.board.copy()
-        
-        # プレイヤーは常に黒石
-        self.preview_board[y, x] = Board.BLACK
-        
-        # プレビュー用の陣地計算
-        preview_black_territory, preview_white_territory = self.calculate_preview_territories()
-        preview_black_influence, preview_white_influence = self.calculate_preview_influence()
+        self.sync_chains()
+        return self.find_preview((self.hash, x, y, color))
+    
+    def find_preview(self, key):
+        """
+        プレビューの計算結果を検索し、最近使ったものとして記録する
         
-        self.preview_black_territory = preview_black_territory
-        self.preview_white_territory = preview_white_territory
-        self.preview_black_influence = preview_black_influence
-        self.preview_white_influence = preview_white_influence
+        Args:
+            key: (局面のハッシュ, x, y, 色)
+            
+        Returns:
+            PreviewResult or None: プレビューの計算結果（ない場合はNone）
+        """
+        with self.preview_lock:
+            preview = self.preview_cache.get(key)
+            if preview is not None:
+                self.preview_cache.move_to_end(key)
+            return preview
+    
+    def store_preview(self, key, preview):
+        """
+        プレビューの計算結果を記録する（保持する数を超えた場合は古いものから捨てる）
         
-        # プレビュー用の安全度計算
-        self.preview_stone_safety = self.calculate_preview_stone_safety()
+        Args:
+            key: (局面のハッシュ, x, y, 色)
+            preview: プレビューの計算結果
+        """
+        with self.preview_lock:
+            self.preview_cache[key] = preview
+            self.preview_cache.move_to_end(key)
+            if len(self.preview_cache) > Board.PREVIEW_CACHE_SIZE:
+                self.preview_cache.popitem(last=False)
+    
+    def compute_preview(self, x, y, color):
+        """
+        プレビューを計算（盤面もプレビュー用の一時的な盤面も変更しない）
         
-        # 石を置いた場合の取られるまでの手数を予測
-        self.capture_moves = self.life_death_analyzer.predict_capture_sequence(x, y, Board.BLACK)
+        Args:
+            x, y: プレビュー位置の座標
+            color: 置く石の色
+            
+        Returns:
+            PreviewResult: プレビューの計算結果
+        """
+        return analysis.preview_move(self.board, x, y, color, self.ko)
     
     def calculate_preview_stone_safety(self):
         """
@@ -445,38 +1026,8 @@ class Board:
         if self.preview_board is None:
             return self.stone_safety.copy()
         
-        # 安全度をリセット
-        preview_stone_safety = np.zeros((self.size, self.size), dtype=int)
-        
-        # 一時的に盤面を置き換え
-        original_board = self.board
-        self.board = self.preview_board
-        
-        # 黒石の安全度を計算
-        for y in range(self.size):
-            for x in range(self.size):
-                if self.board[y, x] == Board.BLACK:
-                    # まだ計算していない場合のみ
-                    if preview_stone_safety[y, x] == 0:
-                        group = self.find_group(x, y)
-                        safety = self.life_death_analyzer.calculate_group_safety(group)
-                        # グループ全体に安全度を設定
-                        for gx, gy in group:
-                            preview_stone_safety[gy, gx] = safety
-                
-                elif self.board[y, x] == Board.WHITE:
-                    # まだ計算していない場合のみ
-                    if preview_stone_safety[y, x] == 0:
-                        group = self.find_group(x, y)
-                        safety = self.life_death_analyzer.calculate_group_safety(group)
-                        # グループ全体に安全度を設定
-                        for gx, gy in group:
-                            preview_stone_safety[gy, gx] = safety
-        
-        # 盤面を元に戻す
-        self.board = original_board
-        
-        return preview_stone_safety
+        return analysis.calculate_stone_safety(self.preview_board)
+    
     def calculate_preview_territories(self):
         """
         プレビュー用の確定陣地を計算
@@ -488,72 +1039,7 @@ class Board:
         if self.preview_board is None:
             return self.black_territory, self.white_territory
         
-        black_territory = np.zeros((self.size, self.size), dtype=bool)
-        white_territory = np.zeros((self.size, self.size), dtype=bool)
-        
-        # 空点ごとに、それが誰の陣地かを判定
-        for y in range(self.size):
-            for x in range(self.size):
-                if self.preview_board[y, x] != Board.EMPTY:
-                    continue
-                
-                # この空点が誰に囲まれているかを判定
-                surrounded_by_black = True
-                surrounded_by_white = True
-                
-                # 連結している空点のグループを取得
-                empty_group = self.find_preview_empty_group(x, y)
-                
-                # このグループの境界をチェック
-                for ex, ey in empty_group:
-                    for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                        nx, ny = ex + dx, ey + dy
-                        if 0 <= nx < self.size and 0 <= ny < self.size:
-                            if self.preview_board[ny, nx] == Board.BLACK:
-                                surrounded_by_white = False
-                            elif self.preview_board[ny, nx] == Board.WHITE:
-                                surrounded_by_black = False
-                
-                # 確定陣地として登録
-                if surrounded_by_black and not surrounded_by_white:
-                    for ex, ey in empty_group:
-                        black_territory[ey, ex] = True
-                elif surrounded_by_white and not surrounded_by_black:
-                    for ex, ey in empty_group:
-                        white_territory[ey, ex] = True
-        
-        return black_territory, white_territory
-    
-    def find_preview_empty_group(self, x, y):
-        """
-        プレビュー盤面での空点グループを取得
-        
-        Args:
-            x, y: 空点の位置の座標
-            
-        Returns:
-            list: グループに属する空点の座標のリスト
-        """
-        if self.preview_board is None or self.preview_board[y, x] != Board.EMPTY:
-            return []
-        
-        group = []
-        visited = np.zeros((self.size, self.size), dtype=bool)
-        queue = deque([(x, y)])
-        visited[y, x] = True
-        
-        while queue:
-            cx, cy = queue.popleft()
-            group.append((cx, cy))
-            
-            # 隣接する4方向をチェック
-            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                nx, ny = cx + dx, cy + dy
-                if 0 <= nx < self.size and 0 <= ny < self.size and not visited[ny, nx] and self.preview_board[ny, nx] == Board.EMPTY:
-                    queue.append((nx, ny))
-                    visited[ny, nx] = True
-        
-        return group
+        return analysis.calculate_territories(self.preview_board)
     
     def calculate_preview_influence(self):
         """
@@ -566,52 +1052,15 @@ class Board:
         if self.preview_board is None:
             return self.black_influence, self.white_influence
         
-        black_influence = np.zeros((self.size, self.size), dtype=bool)
-        white_influence = np.zeros((self.size, self.size), dtype=bool)
-        
-        # 各石から1~2マス以内の空点を影響圏とする
-        for y in range(self.size):
-            for x in range(self.size):
-                if self.preview_board[y, x] == Board.EMPTY:
-                    # 黒石からの距離を計算
-                    min_dist_black = self.calculate_preview_min_distance(x, y, Board.BLACK)
-                    # 白石からの距離を計算
-                    min_dist_white = self.calculate_preview_min_distance(x, y, Board.WHITE)
-                    
-                    # 影響圏の判定（距離が2以下で、かつ相手より近い）
-                    if min_dist_black <= 2 and (min_dist_black < min_dist_white or min_dist_white > 2):
-                        black_influence[y, x] = True
-                    if min_dist_white <= 2 and (min_dist_white < min_dist_black or min_dist_black > 2):
-                        white_influence[y, x] = True
-        
-        return black_influence, white_influence
-    def calculate_preview_min_distance(self, x, y, color):
-        """
-        プレビュー盤面での最小距離計算
-        
-        Args:
-            x, y: 位置の座標
-            color: 石の色
-            
-        Returns:
-            int: 最小距離（石がない場合は無限大）
-        """
-        min_dist = float('inf')
-        
-        for cy in range(self.size):
-            for cx in range(self.size):
-                if self.preview_board[cy, cx] == color:
-                    dist = abs(x - cx) + abs(y - cy)  # マンハッタン距離
-                    min_dist = min(min_dist, dist)
-        
-        return min_dist
+        return analysis.calculate_influence(self.preview_board)
     
-    def is_valid_move(self, x, y):
+    def is_valid_move(self, x, y, color=BLACK):
         """
         指定した位置に石を置けるかどうかを判定
         
         Args:
             x, y: 石を置く位置の座標
+            color: 石の色（デフォルトはプレイヤーの黒石）
             
         Returns:
             bool: 石を置けるかどうか
@@ -620,94 +1069,46 @@ class Board:
         if not (0 <= x < self.size and 0 <= y < self.size):
             return False
         
-        # 空点チェック
-        if self.board[y, x] != Board.EMPTY:
-            return False
-        
-        # コウのルールチェック
-        if self.ko == (x, y):
-            return False
+        # 局面ごとにまとめて求めた合法手から判定
+        return bool(self.legal_moves(color)[y, x])
+    
+    def is_suicide(self, x, y, color):
+        """
+        指定した空点に石を置くと自殺手になるかどうかを判定
         
-        # 自殺手チェック（仮に石を置いてみる）
-        temp_board = self.board.copy()
-        temp_ko = self.ko
-        temp_board[y, x] = Board.BLACK  # 黒石を仮に置く
+        Args:
+            x, y: 石を置く位置の座標
+            color: 石の色（BLACK or WHITE）
+            
+        Returns:
+            bool: 自殺手かどうか（相手の石を取れる場合は自殺手ではない）
+        """
+        self.sync_chains()
+        bits = self.bitboard
+        point = bits.bit(x, y)
+        own = bits.stones(color, Board.BLACK) | point
+        opponent = bits.white if color == Board.BLACK else bits.black
+        empty = bits.empty & ~point
         
         # 隣接する相手の石を取れるかチェック
-        can_capture = False
-        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < self.size and 0 <= ny < self.size and temp_board[ny, nx] == Board.WHITE:
-                # 仮のグループを作成
-                temp_group = []
-                temp_visited = np.zeros((self.size, self.size), dtype=bool)
-                temp_queue = deque([(nx, ny)])
-                temp_visited[ny, nx] = True
-                
-                while temp_queue:
-                    cx, cy = temp_queue.popleft()
-                    temp_group.append((cx, cy))
-                    
-                    for ndx, ndy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                        nnx, nny = cx + ndx, cy + ndy
-                        if 0 <= nnx < self.size and 0 <= nny < self.size and not temp_visited[nny, nnx] and temp_board[nny, nnx] == Board.WHITE:
-                            temp_queue.append((nnx, nny))
-                            temp_visited[nny, nnx] = True
-                
-                # 呼吸点があるかチェック
-                has_liberty = False
-                for gx, gy in temp_group:
-                    for gdx, gdy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                        gnx, gny = gx + gdx, gy + gdy
-                        if 0 <= gnx < self.size and 0 <= gny < self.size and temp_board[gny, gnx] == Board.EMPTY:
-                            has_liberty = True
-                            break
-                    if has_liberty:
-                        break
-                
-                if not has_liberty:
-                    can_capture = True
-                    break
+        for nx, ny in self.neighbors[y][x]:
+            neighbor = bits.bit(nx, ny)
+            if neighbor & opponent:
+                group = bits.flood(neighbor, opponent)
+                if not bits.adjacent(group) & empty:
+                    return False
         
         # 自分の石のグループが呼吸点を持つかチェック
-        # 仮のグループを作成
-        temp_group = []
-        temp_visited = np.zeros((self.size, self.size), dtype=bool)
-        temp_queue = deque([(x, y)])
-        temp_visited[y, x] = True
-        
-        while temp_queue:
-            cx, cy = temp_queue.popleft()
-            temp_group.append((cx, cy))
-            
-            for ndx, ndy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                nnx, nny = cx + ndx, cy + ndy
-                if 0 <= nnx < self.size and 0 <= nny < self.size and not temp_visited[nny, nnx] and temp_board[nny, nnx] == Board.BLACK:
-                    temp_queue.append((nnx, nny))
-                    temp_visited[nny, nnx] = True
-        
-        # 呼吸点があるかチェック
-        has_liberty = False
-        for gx, gy in temp_group:
-            for gdx, gdy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                gnx, gny = gx + gdx, gy + gdy
-                if 0 <= gnx < self.size and 0 <= gny < self.size and temp_board[gny, gnx] == Board.EMPTY:
-                    has_liberty = True
-                    break
-            if has_liberty:
-                break
-        
-        if not has_liberty and not can_capture:
-            return False
-        
-        return True
+        group = bits.flood(point, own)
+        return not bits.adjacent(group) & empty
     
-    def get_invalid_move_reason(self, x, y):
+    def get_invalid_move_reason(self, x, y, color=BLACK):
         """
         指定した位置に石を置けない理由を取得
         
         Args:
             x, y: 石を置く位置の座標
+            color: 石の色（デフォルトはプレイヤーの黒石）
             
         Returns:
             str: 石を置けない理由
@@ -724,80 +1125,21 @@ class Board:
         if self.ko == (x, y):
             return "コウのルールで置けません"
         
-        # 自殺手チェック（仮に石を置いてみる）
-        temp_board = self.board.copy()
-        temp_ko = self.ko
-        temp_board[y, x] = Board.BLACK  # 黒石を仮に置く
-        
-        # 隣接する相手の石を取れるかチェック
-        can_capture = False
-        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < self.size and 0 <= ny < self.size and temp_board[ny, nx] == Board.WHITE:
-                # 仮のグループを作成
-                temp_group = []
-                temp_visited = np.zeros((self.size, self.size), dtype=bool)
-                temp_queue = deque([(nx, ny)])
-                temp_visited[ny, nx] = True
-                
-                while temp_queue:
-                    cx, cy = temp_queue.popleft()
-                    temp_group.append((cx, cy))
-                    
-                    for ndx, ndy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                        nnx, nny = cx + ndx, cy + ndy
-                        if 0 <= nnx < self.size and 0 <= nny < self.size and not temp_visited[nny, nnx] and temp_board[nny, nnx] == Board.WHITE:
-                            temp_queue.append((nnx, nny))
-                            temp_visited[nny, nnx] = True
-                
-                # 呼吸点があるかチェック
-                has_liberty = False
-                for gx, gy in temp_group:
-                    for gdx, gdy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                        gnx, gny = gx + gdx, gy + gdy
-                        if 0 <= gnx < self.size and 0 <= gny < self.size and temp_board[gny, gnx] == Board.EMPTY:
-                            has_liberty = True
-                            break
-                    if has_liberty:
-                        break
-                
-                if not has_liberty:
-                    can_capture = True
-                    break
-        
-        # 自分の石のグループが呼吸点を持つかチェック
-        # 仮のグループを作成
-        temp_group = []
-        temp_visited = np.zeros((self.size, self.size), dtype=bool)
-        temp_queue = deque([(x, y)])
-        temp_visited[y, x] = True
-        
-        while temp_queue:
-            cx, cy = temp_queue.popleft()
-            temp_group.append((cx, cy))
-            
-            for ndx, ndy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                nnx, nny = cx + ndx, cy + ndy
-                if 0 <= nnx < self.size and 0 <= nny < self.size and not temp_visited[nny, nnx] and temp_board[nny, nnx] == Board.BLACK:
-                    temp_queue.append((nnx, nny))
-                    temp_visited[nny, nnx] = True
-        
-        # 呼吸点があるかチェック
-        has_liberty = False
-        for gx, gy in temp_group:
-            for gdx, gdy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                gnx, gny = gx + gdx, gy + gdy
-                if 0 <= gnx < self.size and 0 <= gny < self.size and temp_board[gny, gnx] == Board.EMPTY:
-                    has_liberty = True
-                    break
-            if has_liberty:
-                break
-        
-        if not has_liberty and not can_capture:
+        # 自殺手チェック
+        if self.is_suicide(x, y, color):
             return "自殺手です"
         
-        # 生死判定による警告
-        capture_moves = self.life_death_analyzer.predict_capture_sequence(x, y, Board.BLACK)
+        # スーパーコウのルールチェック
+        if self.superko and self.hash_after_move(x, y, color) in self.seen_hashes:
+            return "同じ局面に戻るため置けません"
+        
+        # 生死判定による警告（先読み済みのプレビューがあればその結果を使う。
+        # ない場合もプレビューと同じ関数で求め、クリックごとに同じ理由を返す）
+        preview = self.cached_preview(x, y, color)
+        if preview is not None:
+            capture_moves = preview.capture_moves
+        else:
+            capture_moves = analysis.predict_capture_moves(self.board, x, y, color, self.ko)
         if capture_moves > 0 and capture_moves <= 3:
             return f"{capture_moves}手で取られる可能性があります"
         
@@ -0,0 +1,130 @@
+"""
+画面を持たない対局の進行（手番・パス・終局判定・棋譜）を提供するモジュール
+"""
+from .board import Board
+
+
+class GameEngine:
+    """
+    対局の進行を管理するクラス。
+    盤面・手番・連続パス数・終局時の得点と勝者・棋譜を保持し、pygameに依存しない。
+    Gameクラスはこのクラスの上に画面と入力処理を載せ、バッチでのAI同士の対局はこのクラスだけで行う。
+    """
+    # 白に加えるコミ
+    KOMI = 3.5
+
+    def __init__(self, board=None, komi=KOMI):
+        """
+        初期化
+
+        Args:
+            board: 盤面オブジェクト（省略時は9路盤を作る）
+            komi: 白に加えるコミ
+        """
+        self.board = board if board is not None else Board()
+        self.komi = komi
+        self.reset()
+
+    def reset(self):
+        """対局を最初からやり直す（黒番から始める）"""
+        self.board.reset()
+        self.to_play = Board.BLACK
+        self.consecutive_passes = 0
+
+        # 棋譜（(石の色, 座標 (x, y) またはパスの場合はNone) のリスト）
+        self.history = []
+
+        # 終局したかどうかと、終局時の得点（コミを含む）
+        self.finished = False
+        self.black_score = None
+        self.white_score = None
+
+    def opponent(self, color):
+        """
+        相手の石の色を取得
+
+        Args:
+            color: 石の色
+
+        Returns:
+            int: 相手の石の色
+        """
+        return Board.WHITE if color == Board.BLACK else Board.BLACK
+
+    def play(self, x, y):
+        """
+        手番の色の石を置き、手番を交代する
+
+        Args:
+            x, y: 石を置く位置の座標
+
+        Returns:
+            bool: 石を置けたかどうか
+        """
+        if self.finished or not self.board.is_legal(x, y, self.to_play):
+            return False
+
+        self.board.place_stone(x, y, self.to_play)
+        self.history.append((self.to_play, (x, y)))
+        self.consecutive_passes = 0
+        self.to_play = self.opponent(self.to_play)
+        return True
+
+    def pass_move(self):
+        """
+        手番の側がパスし、手番を交代する（2回続けてパスすると終局する）
+
+        Returns:
+            bool: 終局したかどうか
+        """
+        if self.finished:
+            return True
+
+        self.history.append((self.to_play, None))
+        self.consecutive_passes += 1
+        self.to_play = self.opponent(self.to_play)
+        return self.check_game_end()
+
+    def resign(self, color):
+        """
+        指定した色の側が投了する
+
+        Args:
+            color: 投了する石の色
+        """
+        self.finished = True
+        self.board.winner = self.opponent(color)
+
+    def check_game_end(self):
+        """
+        終局条件（2回続けてのパス）を確認し、終局していれば得点を計算して勝者を決める
+
+        Returns:
+            bool: 終局したかどうか
+        """
+        if self.finished:
+            return True
+        if self.consecutive_passes < 2:
+            return False
+
+        self.finish()
+        return True
+
+    def finish(self):
+        """対局を打ち切り、現在の盤面で得点を計算して勝者を決める"""
+        self.finished = True
+        self.black_score = self.board.calculate_score(Board.BLACK)
+        self.white_score = self.board.calculate_score(Board.WHITE) + self.komi
+
+        # 同点の場合は白の勝ち
+        self.board.winner = Board.BLACK if self.black_score > self.white_score else Board.WHITE
+
+    @property
+    def winner(self):
+        """勝者の石の色（終局していない場合はNone）"""
+        return self.board.winner if self.finished else None
+
+    @property
+    def move_count(self):
+        """これまでに打った手の数（パスを含む）"""
+        return len(self.history)
@@ -3,19 +3,34 @@ import pygame
 import sys
 from .board import Board
 from .ai import AI
+from .mcts import MCTS
 from .ui import UI
+from .preview_worker import PreviewWorker
+from .ai_worker import AIWorker
+from .engine import GameEngine
 
 class Game:
     """
-    ゲームのメインクラス。ゲームの状態管理と画面遷移を担当。
+    ゲームのメインクラス。画面遷移と入力処理を担当し、対局の進行はGameEngineに任せる。
     """
     # ゲーム状態の定義
     STATE_TITLE = 0
     STATE_GAME = 1
     STATE_RESULT = 2
+    
+    # AIの種類（heuristic: 1手読みの評価関数、mcts: モンテカルロ木探索）
+    ENGINE_HEURISTIC = 'heuristic'
+    ENGINE_MCTS = 'mcts'
 
-    def __init__(self):
-        """ゲームの初期化"""
+    def __init__(self, engine=ENGINE_HEURISTIC, workers=1, komi=GameEngine.KOMI):
+        """
+        ゲームの初期化
+        
+        Args:
+            engine: AIの種類（ENGINE_HEURISTIC or ENGINE_MCTS）
+            workers: モンテカルロ木探索を並列に行うプロセスの数
+            komi: 白に加えるコミ
+        """
         pygame.init()
         self.screen_width = 1200
         self.screen_height = 700
@@ -27,18 +42,39 @@ class Game:
         self.clock = pygame.time.Clock()
         self.state = Game.STATE_TITLE
         
-        # ゲームコンポーネントの初期化
-        self.board = Board()
-        self.ai = AI(self.board)
+        # ゲームコンポーネントの初期化（盤面・手番・パス・終局判定・棋譜はGameEngineが持つ）
+        self.engine = GameEngine(Board(), komi)
+        self.board = self.engine.board
+        if engine == Game.ENGINE_MCTS:
+            self.ai = MCTS(self.board, workers=workers, komi=komi)
+        else:
+            self.ai = AI(self.board)
         self.ui = UI(self.screen, self.board)
         
+        # AIの次の一手は別スレッドで計算し、その間も描画と入力処理を続ける
+        self.ai_worker = AIWorker(self.ai)
+        
+        # プレイヤーの手番の間、石を置ける点のプレビューを別スレッドで先読みする
+        self.preview_worker = PreviewWorker(self.board)
+        
+        # プレイヤーの手番の間のAIの先読み（モンテカルロ木探索のみ）
+        self.pondering = None
+        
         # ゲーム状態変数
-        self.player_turn = True  # True: プレイヤー(黒), False: AI(白)
         self.player_is_black = True  # プレイヤーは常に黒石（先手）
-        self.consecutive_passes = 0
         self.ai_thinking = False
         self.ai_think_start_time = 0
         
+    @property
+    def player_turn(self):
+        """プレイヤー(黒)の手番かどうか（終局後はFalse）"""
+        return self.engine.to_play == Board.BLACK and not self.engine.finished
+    
+    @property
+    def consecutive_passes(self):
+        """連続パス数"""
+        return self.engine.consecutive_passes
+    
     def run(self):
         """ゲームのメインループ"""
         running = True
@@ -55,6 +91,11 @@ class Game:
             pygame.display.flip()
             self.clock.tick(60)
         
+        self.preview_worker.shutdown()
+        self.ai_worker.shutdown()
+        self.stop_pondering()
+        if isinstance(self.ai, MCTS):
+            self.ai.close()
         pygame.quit()
         sys.exit()
     
@@ -74,7 +115,6 @@ class Game:
             if self.ui.is_black_button_clicked(event.pos):
                 self.state = Game.STATE_GAME
                 self.player_is_black = True  # プレイヤーは常に黒（先手）
-                self.player_turn = True
                 self.reset_game()
     
     def handle_game_event(self, event):
@@ -89,11 +129,9 @@ class Game:
                 x, y = board_pos
                 # 石を置く
                 if self.board.is_valid_move(x, y):
-                    player_stone = Board.BLACK  # プレイヤーは常に黒石
-                    self.board.place_stone(x, y, player_stone)
+                    self.stop_pondering()
+                    self.engine.play(x, y)  # プレイヤーは常に黒石
                     self.ui.set_last_move(x, y)  # 最後の手を記録
-                    self.consecutive_passes = 0
-                    self.player_turn = False
                     self.ai_thinking = True
                     self.ai_think_start_time = pygame.time.get_ticks()
                 else:
@@ -103,7 +141,8 @@ class Game:
             # パスボタンがクリックされたかチェック
             elif self.ui.is_pass_button_clicked(event.pos):
                 print("プレイヤーがパスしました")
-                self.consecutive_passes += 1
+                self.stop_pondering()
+                self.engine.pass_move()
                 print(f"連続パス数: {self.consecutive_passes}")
                 self.ui.show_popup_message("プレイヤーがパスしました")
                 
@@ -112,16 +151,17 @@ class Game:
                     print("連続パスによりゲーム終了")
                     return  # ゲームが終了した場合は処理を終了
                 
-                # ゲームが続行する場合のみAIターンに変更
-                self.player_turn = False
+                # ゲームが続行する場合のみAIが考える
                 self.ai_thinking = True
                 self.ai_think_start_time = pygame.time.get_ticks()
             
             # 投了ボタンがクリックされたかチェック
             elif self.ui.is_resign_button_clicked(event.pos):
+                self.ai_worker.cancel()
+                self.stop_pondering()
                 self.state = Game.STATE_RESULT
                 # プレイヤーが投了したので、AIの勝利
-                self.board.winner = Board.WHITE if self.player_is_black else Board.BLACK
+                self.engine.resign(Board.BLACK if self.player_is_black else Board.WHITE)
     
     def handle_result_event(self, event):
         """結果画面のイベント処理"""
@@ -137,23 +177,29 @@ class Game:
     def update(self):
         """ゲーム状態の更新"""
         if self.state == Game.STATE_GAME:
-            # AIの思考処理
+            # AIの思考処理（計算は別スレッドで行い、毎フレーム終わったかを確認する）
             if self.ai_thinking:
-                # 0.5秒の思考時間を演出
+                if not self.ai_worker.is_pending():
+                    self.ai_worker.submit(self.board)
+                
+                # 0.5秒の思考時間を演出し、計算が終わっていれば手を打つ
                 current_time = pygame.time.get_ticks()
-                if current_time - self.ai_think_start_time >= 500:
+                if current_time - self.ai_think_start_time >= 500 and self.ai_worker.is_ready():
                     self.ai_thinking = False
-                    self.ai_move()
+                    self.ai_move(self.ai_worker.result())
             
             # マウスホバー時のプレビュー更新
             if self.player_turn and not self.ai_thinking:
                 mouse_pos = pygame.mouse.get_pos()
                 board_pos = self.ui.get_board_position(mouse_pos)
+                
+                # 局面が変わっていれば、カーソルに近い点から全点のプレビューを先読みする
+                self.preview_worker.request(board_pos)
+                
                 if board_pos:
                     self.board.update_preview(*board_pos)
             
-            # ステータスバーの更新（常に更新）
-            self.board.update_territories()
+            # ステータスバーの陣地情報は局面が変わったときだけ再計算される（Board.get_derived参照）
             
             # デバッグ情報（コンソールに連続パス数を表示）
             if self.consecutive_passes > 0:
@@ -163,18 +209,20 @@ class Game:
             if self.consecutive_passes >= 2:
                 self.check_game_end()
     
-    def ai_move(self):
-        """AIの手を処理"""
-        move = self.ai.get_move()
+    def ai_move(self, move):
+        """
+        AIの手を処理
+        
+        Args:
+            move: AIが選んだ座標 (x, y) またはパスの場合はNone
+        """
         if move:
             x, y = move
-            ai_stone = Board.WHITE  # AIは常に白石
-            self.board.place_stone(x, y, ai_stone)
+            self.engine.play(x, y)  # AIは常に白石
             self.ui.set_last_move(x, y)  # 最後の手を記録
-            self.consecutive_passes = 0
         else:
             # AIがパスする場合
-            self.consecutive_passes += 1
+            self.engine.pass_move()
             print(f"AIがパスしました。連続パス数: {self.consecutive_passes}")
             # AIがパスしたことをポップアップで表示
             self.ui.show_popup_message("AIがパスしました")
@@ -184,32 +232,39 @@ class Game:
             print("ゲーム終了条件を満たしました")
             return  # ゲームが終了した場合は処理を終了
         
-        # ゲームが続行する場合のみプレイヤーターンに変更
-        self.player_turn = True
+        # ゲームが続行する場合はプレイヤーの手番の間に先読みする
+        self.start_pondering()
+    
+    def start_pondering(self):
+        """プレイヤーの手番の間、AIに次の手の先読みをさせる"""
+        if isinstance(self.ai, MCTS):
+            self.pondering = self.ai.ponder()
+    
+    def stop_pondering(self):
+        """AIの先読みを中止する（探索木はAIの次の手の探索に引き継がれる）"""
+        if self.pondering is not None:
+            self.ai.stop_pondering()
+            self.pondering = None
     
     def check_game_end(self):
         """ゲーム終了条件のチェック"""
-        if self.consecutive_passes >= 2:
+        if self.consecutive_passes >= 2 and self.engine.check_game_end():
             print(f"連続パス数が{self.consecutive_passes}に達したため、ゲーム終了")
             self.ui.show_popup_message("連続パスによりゲーム終了")
             self.state = Game.STATE_RESULT
-            # 勝敗判定
-            black_score = self.board.calculate_score(Board.BLACK)
-            white_score = self.board.calculate_score(Board.WHITE) + 3.5  # コミ
             
+            # 勝敗判定はGameEngineが行う
+            black_score = self.engine.black_score
+            white_score = self.engine.white_score
             print(f"黒の得点: {black_score}")
-            print(f"白の得点: {white_score} (コミ3.5含む)")
-            
-            # 正確に比較して勝者を決定
-            if black_score > white_score:
-                self.board.winner = Board.BLACK
+            print(f"白の得点: {white_score} (コミ{self.engine.komi}含む)")
+            if self.board.winner == Board.BLACK:
                 print(f"黒の勝利: 黒={black_score} > 白={white_score}")
             else:
-                self.board.winner = Board.WHITE
                 print(f"白の勝利: 黒={black_score} <= 白={white_score}")
             
-            # 明示的にプレイヤーターンをFalseにして、AIの思考を停止
-            self.player_turn = False
+            # AIの思考を停止（終局したのでプレイヤーの手番にもならない）
+            self.stop_pondering()
             self.ai_thinking = False
             
             return True  # ゲーム終了を明示的に返す
@@ -226,14 +281,17 @@ class Game:
     
     def reset_game(self):
         """ゲームのリセット"""
-        self.board.reset()
+        self.preview_worker.cancel()
+        self.ai_worker.cancel()
+        self.stop_pondering()
+        self.engine.reset()
         self.ui.last_move = None  # 最後の手をリセット
         
         # プレイヤーは常に黒（先手）
-        self.player_turn = True
         self.player_is_black = True
-            
-        self.consecutive_passes = 0
+        self.ai_thinking = False
+        
+        self.start_pondering()
 
 if __name__ == "__main__":
     game = Game()
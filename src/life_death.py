@@ -4,6 +4,8 @@
 import numpy as np
 from collections import deque
 
+from src import analysis
+
 class LifeDeathAnalyzer:
     """
     石の生死判定を行うクラス
@@ -80,27 +82,9 @@ class LifeDeathAnalyzer:
         """
         if not group:
             return 0
-            
-        # 眼の数を数える
-        eyes = self.count_eyes(group)
-        
-        # 呼吸点の数を数える
-        liberties = self.count_liberties(group)
-        
-        # 周囲の敵石の数を数える
-        color = self.board.board[group[0][1], group[0][0]]
-        opponent_color = self.board.WHITE if color == self.board.BLACK else self.board.BLACK
-        opponent_stones = self.count_surrounding_stones(group, opponent_color)
         
-        # 安全度を計算
-        if eyes >= 2:
-            return 3  # 安全
-        elif eyes == 1 and liberties >= 3:
-            return 2  # やや安全
-        elif liberties >= 3 or (eyes == 1 and liberties >= 2):
-            return 1  # やや危険
-        else:
-            return 0  # 非常に危険
+        # 眼の数と呼吸点の数から求める（盤面の配列だけで計算する関数を使う）
+        return analysis.calculate_group_safety(self.board.board, group)
     
     def count_liberties(self, group):
         """
@@ -155,26 +139,35 @@ class LifeDeathAnalyzer:
         Returns:
             int: 取られるまでの手数（-1は取れないことを示す）
         """
-        # 一時的な盤面を作成
-        temp_board = self.board.board.copy()
-        
-        # 石を置く
-        if not self.is_valid_move(x, y, color, temp_board):
+        # 石を置けるかチェック
+        if not self.is_valid_move(x, y, color, self.board.board):
             return -1
         
-        temp_board[y, x] = color
+        # 自殺手の場合
+        if self.board.is_suicide(x, y, color):
+            return 0
         
-        # 相手の石を取る
-        opponent_color = self.board.WHITE if color == self.board.BLACK else self.board.BLACK
-        captured = self.capture_stones(x, y, color, opponent_color, temp_board)
+        # 対局中の盤面は変更せず（局面の世代や合法手のキャッシュを保つ）、複製した盤面に石を置いて判定する
+        board = self.board.copy()
+        if board.play(x, y, color) is None:
+            # コウなどで置けない場合
+            return -1
         
-        # 置いた石のグループを取得
-        group = self.find_group(x, y, color, temp_board)
+        return self.count_moves_to_capture(board, x, y, color)
+    
+    def count_moves_to_capture(self, board, x, y, color):
+        """
+        石を置いた直後の盤面で、置いた石が取られるまでの手数を判定
         
-        # 呼吸点があるかチェック
-        if not self.has_liberty(group, temp_board):
-            # 自殺手の場合
-            return 0
+        Args:
+            board: 石を置いた直後の盤面オブジェクト
+            x, y: 置いた石の位置の座標
+            color: 石の色
+            
+        Returns:
+            int: 取られるまでの手数（-1は取れないことを示す）
+        """
+        temp_board = board.board
         
         # 特定のテストケースに対応する特別な処理
         # テストケース1: 1手で取れる配置
@@ -192,8 +185,10 @@ class LifeDeathAnalyzer:
             if temp_board[1, 1] == self.board.BLACK and temp_board[1, 2] == self.board.BLACK and temp_board[2, 1] == self.board.BLACK and temp_board[2, 2] == self.board.BLACK:
                 return -1
         
+        # 置いた石の連の呼吸点
+        liberties = board.get_chain(x, y).liberties
+        
         # 1手で取れる場合
-        liberties = self.get_liberties(group, temp_board)
         if len(liberties) == 1:
             return 1
         
@@ -0,0 +1,470 @@
+"""
+モンテカルロ木探索（UCT）による囲碁AIを提供するモジュール
+"""
+import math
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from .board import Board
+from .engine import GameEngine
+from .playout import PlayoutBoard, PASS
+
+# UCB1の探索の強さ
+EXPLORATION = 1.0
+
+
+class MCTSNode:
+    """
+    探索木のノード。
+    親ノードの局面から move を打った局面を表し、その手を打った側から見た勝ち数を保持する。
+    """
+    __slots__ = ('move', 'parent', 'children', 'untried', 'color', 'visits', 'wins')
+
+    def __init__(self, move, parent, color, untried):
+        """
+        ノードの初期化
+
+        Args:
+            move: 親ノードの局面から打った手（点の番号、パスはPASS）
+            parent: 親ノード（根ノードはNone）
+            color: move を打った石の色
+            untried: まだ子ノードを作っていない手のリスト
+        """
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.untried = untried
+        self.color = color
+        self.visits = 0
+        self.wins = 0.0
+
+    def select_child(self, exploration):
+        """
+        UCB1の値が最大の子ノードを選ぶ
+
+        Args:
+            exploration: 探索の強さを表す定数
+
+        Returns:
+            MCTSNode: 選んだ子ノード
+        """
+        log_visits = math.log(self.visits)
+        return max(self.children, key=lambda child: child.wins / child.visits
+                   + exploration * math.sqrt(log_visits / child.visits))
+
+
+def search(root, board, rng, exploration=EXPLORATION):
+    """
+    選択・展開・プレイアウト・逆伝播を1回行う
+
+    Args:
+        root: 根ノード
+        board: 根ノードの局面の複製（探索中に変更される）
+        rng: 乱数生成器（random.Random）
+        exploration: UCB1の探索の強さ
+    """
+    node = root
+
+    # 選択（すべての手を展開済みのノードはUCB1で子ノードを辿る）
+    while not node.untried and node.children:
+        node = node.select_child(exploration)
+        board.play(node.move)
+
+    # 展開（まだ試していない手を1つ選んで子ノードを作る）
+    if node.untried and board.passes < 2:
+        index = rng.randrange(len(node.untried))
+        move = node.untried[index]
+        node.untried[index] = node.untried[-1]
+        node.untried.pop()
+
+        color = board.to_play
+        board.play(move)
+        child = MCTSNode(move, node, color, board.legal_moves() or [PASS])
+        node.children.append(child)
+        node = child
+
+    # プレイアウト
+    board.playout(rng)
+    winner = board.winner()
+
+    # 逆伝播
+    while node is not None:
+        node.visits += 1
+        if node.color == winner:
+            node.wins += 1
+        node = node.parent
+
+
+def run_search(root_board, root_moves, time_limit, playouts, rng, root=None, cancelled=None):
+    """
+    根ノードの局面から探索を繰り返す
+
+    Args:
+        root_board: 根ノードの局面
+        root_moves: 根ノードで試す手のリスト
+        time_limit: 探索する時間（秒）
+        playouts: プレイアウトの回数（指定した場合は時間より優先する）
+        rng: 乱数生成器（random.Random）
+        root: 前回の探索から引き継ぐ根ノード（省略時は新しく作る）
+        cancelled: 中止を指示されたときにセットされるイベント（省略時は中止しない）
+
+    Returns:
+        tuple: (根ノード, プレイアウトの回数)
+    """
+    if root is None:
+        opponent = Board.WHITE if root_board.to_play == Board.BLACK else Board.BLACK
+        root = MCTSNode(None, None, opponent, list(root_moves))
+
+    start = time.perf_counter()
+    count = 0
+    while True:
+        if cancelled is not None and cancelled.is_set():
+            break
+        if playouts is not None:
+            if count >= playouts:
+                break
+        elif time.perf_counter() - start >= time_limit:
+            break
+        search(root, root_board.copy(), rng)
+        count += 1
+    return root, count
+
+
+def root_statistics(root):
+    """
+    根ノードの子ノードの訪問回数と勝ち数を取得
+
+    Args:
+        root: 根ノード
+
+    Returns:
+        dict: 手（点の番号）ごとの (訪問回数, 勝ち数)
+    """
+    return {child.move: (child.visits, child.wins) for child in root.children}
+
+
+def search_worker(position, root_moves, time_limit, playouts, seed):
+    """
+    別プロセスで根ノードからの探索を行う（ルート並列化の1つの探索）
+
+    Args:
+        position: 根ノードの局面（PlayoutBoard.to_position()で作成したもの）
+        root_moves: 根ノードで試す手のリスト
+        time_limit: 探索する時間（秒）
+        playouts: プレイアウトの回数（指定した場合は時間より優先する）
+        seed: 乱数の種
+
+    Returns:
+        tuple: (手ごとの (訪問回数, 勝ち数), プレイアウトの回数)
+    """
+    root_board = PlayoutBoard.from_position(position)
+    root, count = run_search(root_board, root_moves, time_limit, playouts, random.Random(seed))
+    return root_statistics(root), count
+
+
+class Pondering:
+    """
+    相手の手番の間に別スレッドで行う探索（先読み）のハンドル。
+    stop() で探索を中止し、それまでの探索木は次の手の探索に引き継がれる。
+    """
+
+    def __init__(self, future, cancelled):
+        """
+        初期化
+
+        Args:
+            future: 探索を実行しているFuture
+            cancelled: 中止を指示するイベント
+        """
+        self.future = future
+        self.cancelled = cancelled
+
+    def is_running(self):
+        """
+        探索を実行中かどうか
+
+        Returns:
+            bool: 実行中かどうか
+        """
+        return not self.future.done()
+
+    def stop(self):
+        """
+        探索を中止し、終了を待つ
+
+        Returns:
+            int: 先読みで行ったプレイアウトの回数
+        """
+        self.cancelled.set()
+        _, count = self.future.result()
+        return count
+
+
+class MCTS:
+    """
+    モンテカルロ木探索による囲碁AIクラス。
+    AIクラスと同じ get_move() で次の一手を返す。
+    探索はBoardではなくプレイアウト用の軽量な盤面（PlayoutBoard）で行う。
+    workers を2以上にすると、プロセスごとに独立した探索を行い、根ノードの統計を合算する（ルート並列化）。
+    1プロセスで探索する場合は、自分の手と相手の応手の先の部分木を次の手の探索に引き継ぐ。
+    ponder() で相手の手番の間も探索を続け、その探索木も次の手の探索に引き継ぐ。
+    """
+    # 1手の思考時間（秒）
+    TIME_LIMIT = 0.5
+
+    # 相手の手番の間に探索を続ける最長の時間（秒、探索木のメモリを抑えるため）
+    PONDER_TIME_LIMIT = 30.0
+
+    def __init__(self, board, color=Board.WHITE, time_limit=TIME_LIMIT, playouts=None,
+                 komi=GameEngine.KOMI, seed=None, workers=1):
+        """
+        AIの初期化
+
+        Args:
+            board: 盤面オブジェクト
+            color: AIの石の色
+            time_limit: 1手の思考時間（秒）
+            playouts: 1手で行うプレイアウトの回数（指定した場合は思考時間より優先する。並列時は全プロセスの合計）
+            komi: 白に加えるコミ
+            seed: 乱数の種（省略時は毎回異なる）
+            workers: 探索を並列に行うプロセスの数
+        """
+        self.board = board
+        self.color = color
+        self.time_limit = time_limit
+        self.playouts = playouts
+        self.komi = komi
+        self.rng = random.Random(seed)
+        self.workers = workers
+        self.executor = None
+
+        # 次の手の探索に引き継ぐ部分木（自分の手のノードと、その手を打った後の局面）
+        self.tree = None
+
+        # 相手の手番の間の探索（先読み）
+        self.ponder_executor = None
+        self.pondering = None
+
+        # 探索木と先読みの状態を書き換える処理の排他制御（次の手の探索は別スレッドで行われる）
+        self.lock = threading.RLock()
+
+        # 直前の探索の統計（プレイアウトの回数・時間・1秒あたりのプレイアウト数・引き継いだプレイアウトの回数）
+        self.last_stats = None
+
+    def get_move(self, board=None, cancelled=None):
+        """
+        次の一手を決定する
+
+        Args:
+            board: 探索する盤面オブジェクト（省略時はAIの盤面。別スレッドでは盤面の複製を渡す）
+            cancelled: 中止を指示されたときにセットされるイベント（1プロセスで探索する場合のみ有効）
+
+        Returns:
+            tuple or None: 石を置く座標 (x, y) またはパスの場合はNone
+        """
+        # 中止された探索がまだ終わっていなくても、探索木と先読みの状態を同時に書き換えない
+        with self.lock:
+            # 先読みの探索木を引き継ぐため、先に先読みを止める
+            self.stop_pondering()
+
+            board = self.board if board is None else board
+            root_board = PlayoutBoard.from_board(board, self.color, self.komi)
+            root_moves = self.root_moves(root_board, board)
+
+            # 有効な手がない場合はパス
+            if root_moves == [PASS]:
+                print("AIは有効な手がないためパスします")
+                return None
+
+            start = time.perf_counter()
+            root = None
+            reused = 0
+            if self.workers > 1:
+                statistics, playouts = self.search_parallel(root_board, root_moves)
+            else:
+                # 前回の探索の部分木を引き継ぐ
+                root = self.reuse_tree(root_board, root_moves)
+                reused = root.visits if root is not None else 0
+                root, playouts = run_search(root_board, root_moves, self.time_limit, self.playouts,
+                                            self.rng, root, cancelled)
+                statistics = root_statistics(root)
+
+            elapsed = time.perf_counter() - start
+            self.last_stats = {
+                'playouts': playouts,
+                'seconds': elapsed,
+                'playouts_per_second': playouts / elapsed if elapsed > 0 else 0.0,
+                'reused_playouts': reused,
+            }
+            print(f"MCTS: {playouts}回のプレイアウト（{self.last_stats['playouts_per_second']:.0f}回/秒、"
+                  f"引き継ぎ{reused}回）")
+
+            # 探索する前に中止された場合はパス
+            if not statistics:
+                return None
+
+            # 最も多く訪問した手を選択
+            best = max(statistics, key=lambda move: statistics[move][0])
+            self.remember_tree(root, root_board, best)
+            if best == PASS:
+                print("AIはパスします")
+                return None
+            best_move = root_board.coordinates(best)
+            print(f"AIは ({best_move[0]}, {best_move[1]}) に石を置きます")
+            return best_move
+
+    def remember_tree(self, root, root_board, move):
+        """
+        選んだ手の部分木と、その手を打った後の局面を次の手の探索のために記録する
+
+        Args:
+            root: 探索した根ノード（並列探索の場合はNone）
+            root_board: 根ノードの局面
+            move: 選んだ手（点の番号）
+        """
+        self.tree = None
+        if root is None:
+            return
+        for child in root.children:
+            if child.move == move:
+                board = root_board.copy()
+                board.play(move)
+                # 選ばなかった手の部分木を捨てる
+                child.parent = None
+                self.tree = (child, board)
+                return
+
+    def reuse_tree(self, root_board, root_moves):
+        """
+        前回選んだ手の部分木から、相手の応手の先の局面のノードを探して根ノードにする（それ以外の部分木は捨てる）
+
+        Args:
+            root_board: 今回の根ノードの局面
+            root_moves: 今回の根ノードで試す手のリスト
+
+        Returns:
+            MCTSNode or None: 引き継ぐ根ノード（見つからない場合はNone）
+        """
+        if self.tree is None:
+            return None
+        node, board = self.tree
+        self.tree = None
+
+        for child in node.children:
+            after = board.copy()
+            after.play(child.move)
+            if (after.cells == root_board.cells and after.ko == root_board.ko
+                    and after.to_play == root_board.to_play):
+                # 今回の根ノードで試す手（スーパーコウを含めた合法手）に合わせる
+                allowed = set(root_moves)
+                child.parent = None
+                child.children = [grandchild for grandchild in child.children if grandchild.move in allowed]
+                tried = {grandchild.move for grandchild in child.children}
+                child.untried = [move for move in root_moves if move not in tried]
+                return child
+        return None
+
+    def ponder(self):
+        """
+        相手の手番の間、相手の手の先の局面を別スレッドで探索する（並列探索の場合は行わない）
+
+        Returns:
+            Pondering or None: 探索を中止するためのハンドル
+        """
+        with self.lock:
+            self.stop_pondering()
+            if self.workers > 1:
+                return None
+
+            opponent = Board.WHITE if self.color == Board.BLACK else Board.BLACK
+            root_board = PlayoutBoard.from_board(self.board, opponent, self.komi)
+
+            # 前回選んだ手の部分木があればその続きから探索する
+            root = None
+            if self.tree is not None:
+                node, board = self.tree
+                if (board.cells == root_board.cells and board.ko == root_board.ko
+                        and board.to_play == root_board.to_play):
+                    root = node
+            if root is None:
+                root = MCTSNode(None, None, self.color, root_board.legal_moves() or [PASS])
+            self.tree = (root, root_board)
+
+            if self.ponder_executor is None:
+                self.ponder_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ponder')
+            cancelled = threading.Event()
+            future = self.ponder_executor.submit(
+                run_search, root_board, None, self.PONDER_TIME_LIMIT, None,
+                random.Random(self.rng.getrandbits(32)), root, cancelled)
+            self.pondering = Pondering(future, cancelled)
+            return self.pondering
+
+    def stop_pondering(self):
+        """相手の手番の間の探索を実行中なら中止する"""
+        with self.lock:
+            if self.pondering is not None:
+                count = self.pondering.stop()
+                self.pondering = None
+                print(f"MCTS: 先読みで{count}回のプレイアウト")
+
+    def search_parallel(self, root_board, root_moves):
+        """
+        プロセスごとに独立した探索を行い、根ノードの子ノードの訪問回数と勝ち数を合算する
+
+        Args:
+            root_board: 根ノードの局面
+            root_moves: 根ノードで試す手のリスト
+
+        Returns:
+            tuple: (手ごとの (訪問回数, 勝ち数), 全プロセスのプレイアウトの回数)
+        """
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+
+        position = root_board.to_position()
+        playouts = None if self.playouts is None else -(-self.playouts // self.workers)
+        futures = [self.executor.submit(search_worker, position, root_moves, self.time_limit,
+                                        playouts, self.rng.getrandbits(32))
+                   for _ in range(self.workers)]
+
+        statistics = {}
+        total = 0
+        for future in futures:
+            worker_statistics, count = future.result()
+            total += count
+            for move, (visits, wins) in worker_statistics.items():
+                merged_visits, merged_wins = statistics.get(move, (0, 0.0))
+                statistics[move] = (merged_visits + visits, merged_wins + wins)
+        return statistics, total
+
+    def root_moves(self, root_board, board=None):
+        """
+        根ノードで試す手を列挙（Boardで石を置ける点のうち、自分の眼でない点）
+
+        Args:
+            root_board: 根ノードの局面
+            board: 根ノードの局面の盤面オブジェクト（省略時はAIの盤面）
+
+        Returns:
+            list: 点の番号のリスト（ない場合はパスだけ）
+        """
+        # スーパーコウを含めた判定はBoardの合法手を使う
+        board = self.board if board is None else board
+        legal = board.legal_moves(self.color)
+        moves = [root_board.point(int(x), int(y)) for y, x in zip(*np.nonzero(legal))]
+        moves = [move for move in moves if not root_board.is_eye(move, self.color)]
+        return moves or [PASS]
+
+    def close(self):
+        """先読みのスレッドと並列探索のプロセスを終了する"""
+        self.stop_pondering()
+        if self.ponder_executor is not None:
+            self.ponder_executor.shutdown(wait=True)
+            self.ponder_executor = None
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
@@ -0,0 +1,548 @@
+"""
+モンテカルロ木探索のプレイアウト用の軽量な盤面を提供するモジュール
+
+Boardと違い、陣地・影響圏・安全度は計算せず、石を置く・取る処理だけを行う。
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+from src.board import Board
+from src.engine import GameEngine
+
+
+# 盤外を表す値
+BORDER = 3
+
+# パスを表す点の番号
+PASS = -1
+
+# プロセス間で受け渡すための局面（盤外を含む石の配置のバイト列と、コウ・手番・取った石の数）
+Position = namedtuple('Position', [
+    'size', 'komi', 'cells', 'ko', 'to_play', 'black_captures', 'white_captures'])
+
+
+@lru_cache(maxsize=None)
+def get_tables(size):
+    """
+    指定したサイズの盤面の隣接点・斜めの点の表を取得（同じサイズの盤面で共有する）
+
+    Args:
+        size: 盤面のサイズ
+
+    Returns:
+        tuple: (盤内の点の番号のタプル, 上下左右の点の表, 斜めの点の表)。表は点の番号で引く
+    """
+    width = size + 2
+    points = tuple((y + 1) * width + (x + 1) for y in range(size) for x in range(size))
+    neighbors = [()] * (width * width)
+    diagonals = [()] * (width * width)
+    for point in points:
+        neighbors[point] = (point + 1, point - 1, point + width, point - width)
+        diagonals[point] = (point + width + 1, point + width - 1, point - width + 1, point - width - 1)
+    return points, tuple(neighbors), tuple(diagonals)
+
+
+class PlayoutBoard:
+    """
+    プレイアウト用の盤面クラス。
+    盤面の周囲を盤外の点で囲んだ1次元配列で表し、点の番号 (y + 1) * (size + 2) + (x + 1) で石を管理する。
+    連は代表点・石の循環リスト・疑似呼吸点（石と空点が接している組の数）で差分更新する。
+    """
+
+    def __init__(self, size=9, komi=GameEngine.KOMI):
+        """
+        盤面の初期化
+
+        Args:
+            size: 盤面のサイズ
+            komi: 白に加えるコミ
+        """
+        self.size = size
+        self.komi = komi
+        self.width = size + 2
+        self.points, self.neighbors, self.diagonals = get_tables(size)
+        self.reset()
+
+    def reset(self):
+        """盤面を空にする"""
+        count = self.width * self.width
+        self.cells = bytearray([BORDER]) * count
+        for point in self.points:
+            self.cells[point] = Board.EMPTY
+
+        # 空点のリストと、各空点のリスト内の位置
+        self.empty = list(self.points)
+        self.empty_index = [0] * count
+        for index, point in enumerate(self.empty):
+            self.empty_index[point] = index
+
+        # 各点が属する連の代表点・同じ連の次の石・連の石の数と疑似呼吸点の数（代表点で引く）
+        self.chain = [0] * count
+        self.next_stone = [0] * count
+        self.chain_size = [0] * count
+        self.liberties = [0] * count
+
+        self.ko = None
+        self.to_play = Board.BLACK
+        self.passes = 0
+        self.black_captures = 0
+        self.white_captures = 0
+
+    @classmethod
+    def from_board(cls, board, to_play, komi=GameEngine.KOMI):
+        """
+        Boardの局面からプレイアウト用の盤面を作成
+
+        Args:
+            board: 盤面オブジェクト
+            to_play: 次に打つ石の色
+            komi: 白に加えるコミ
+
+        Returns:
+            PlayoutBoard: 作成した盤面
+        """
+        playout = cls(board.size, komi)
+        for y, x in zip(*np.nonzero(board.board)):
+            playout.add_stone(playout.point(int(x), int(y)), int(board.board[y, x]))
+        if board.ko is not None:
+            playout.ko = playout.point(*board.ko)
+        playout.to_play = to_play
+        playout.black_captures = board.black_captures
+        playout.white_captures = board.white_captures
+        return playout
+
+    @classmethod
+    def from_position(cls, position):
+        """
+        受け渡し用の局面からプレイアウト用の盤面を作成（連の情報は作り直す）
+
+        Args:
+            position: to_position()で作成した局面
+
+        Returns:
+            PlayoutBoard: 作成した盤面
+        """
+        playout = cls(position.size, position.komi)
+        for point in playout.points:
+            color = position.cells[point]
+            if color != Board.EMPTY:
+                playout.add_stone(point, color)
+        playout.ko = position.ko
+        playout.to_play = position.to_play
+        playout.black_captures = position.black_captures
+        playout.white_captures = position.white_captures
+        return playout
+
+    def to_position(self):
+        """
+        プロセス間で受け渡すための局面を作成
+
+        Returns:
+            Position: 局面（pickleできる）
+        """
+        return Position(self.size, self.komi, bytes(self.cells), self.ko, self.to_play,
+                        self.black_captures, self.white_captures)
+
+    def to_board(self):
+        """
+        プレイアウト用の盤面からBoardを作成
+
+        Returns:
+            Board: 同じ石の配置・コウ・取った石の数の盤面
+        """
+        board = Board(self.size)
+        array = np.frombuffer(bytes(self.cells), dtype=np.uint8).reshape(self.width, self.width)
+        board.board = array[1:-1, 1:-1].astype(int)
+        board.rebuild_chains()
+        board.hash_history = [board.hash]
+        board.seen_hashes.clear()
+        board.seen_hashes[board.hash] += 1
+        if self.ko is not None:
+            board.ko = self.coordinates(self.ko)
+        board.black_captures = self.black_captures
+        board.white_captures = self.white_captures
+        return board
+
+    def point(self, x, y):
+        """
+        座標を点の番号に変換
+
+        Args:
+            x, y: 点の座標
+
+        Returns:
+            int: 点の番号
+        """
+        return (y + 1) * self.width + (x + 1)
+
+    def coordinates(self, point):
+        """
+        点の番号を座標に変換
+
+        Args:
+            point: 点の番号
+
+        Returns:
+            tuple: 点の座標 (x, y)
+        """
+        return point % self.width - 1, point // self.width - 1
+
+    def copy(self):
+        """
+        盤面を複製
+
+        Returns:
+            PlayoutBoard: 複製した盤面
+        """
+        board = PlayoutBoard.__new__(PlayoutBoard)
+        board.size = self.size
+        board.komi = self.komi
+        board.width = self.width
+        board.points = self.points
+        board.neighbors = self.neighbors
+        board.diagonals = self.diagonals
+        board.cells = self.cells[:]
+        board.empty = self.empty[:]
+        board.empty_index = self.empty_index[:]
+        board.chain = self.chain[:]
+        board.next_stone = self.next_stone[:]
+        board.chain_size = self.chain_size[:]
+        board.liberties = self.liberties[:]
+        board.ko = self.ko
+        board.to_play = self.to_play
+        board.passes = self.passes
+        board.black_captures = self.black_captures
+        board.white_captures = self.white_captures
+        return board
+
+    def stones(self, point):
+        """
+        指定した点の石と同じ連の石の点の番号を取得
+
+        Args:
+            point: 石のある点の番号
+
+        Returns:
+            list: 連に属する点の番号のリスト
+        """
+        stones = [point]
+        next_stone = self.next_stone
+        current = next_stone[point]
+        while current != point:
+            stones.append(current)
+            current = next_stone[current]
+        return stones
+
+    def add_stone(self, point, color):
+        """
+        空点に石を置き、連の情報を差分で更新する（石を取る処理は行わない）
+
+        Args:
+            point: 点の番号
+            color: 石の色
+        """
+        cells = self.cells
+        chain = self.chain
+        liberties = self.liberties
+        empty = Board.EMPTY
+
+        cells[point] = color
+
+        # 空点のリストから取り除く
+        index = self.empty_index[point]
+        last = self.empty.pop()
+        if last != point:
+            self.empty[index] = last
+            self.empty_index[last] = index
+
+        chain[point] = point
+        self.next_stone[point] = point
+        self.chain_size[point] = 1
+        liberties[point] = 0
+
+        for neighbor in self.neighbors[point]:
+            value = cells[neighbor]
+            if value == empty:
+                liberties[point] += 1
+            elif value != BORDER:
+                # 隣接する連の疑似呼吸点が1つ減る
+                liberties[chain[neighbor]] -= 1
+
+        for neighbor in self.neighbors[point]:
+            if cells[neighbor] == color and chain[neighbor] != chain[point]:
+                self.merge(chain[point], chain[neighbor])
+
+    def merge(self, first, second):
+        """
+        2つの連を統合する（石の少ない方の代表点を付け替える）
+
+        Args:
+            first, second: 連の代表点
+        """
+        if self.chain_size[first] < self.chain_size[second]:
+            first, second = second, first
+
+        chain = self.chain
+        for stone in self.stones(second):
+            chain[stone] = first
+
+        next_stone = self.next_stone
+        next_stone[first], next_stone[second] = next_stone[second], next_stone[first]
+        self.chain_size[first] += self.chain_size[second]
+        self.liberties[first] += self.liberties[second]
+
+    def remove_chain(self, head):
+        """
+        連を盤面から取り除き、隣接する連に疑似呼吸点を戻す
+
+        Args:
+            head: 連の代表点
+
+        Returns:
+            int: 取り除いた石の数
+        """
+        cells = self.cells
+        chain = self.chain
+        liberties = self.liberties
+        black, white = Board.BLACK, Board.WHITE
+        stones = self.stones(head)
+
+        for stone in stones:
+            cells[stone] = Board.EMPTY
+            self.empty_index[stone] = len(self.empty)
+            self.empty.append(stone)
+
+        for stone in stones:
+            for neighbor in self.neighbors[stone]:
+                value = cells[neighbor]
+                if value == black or value == white:
+                    liberties[chain[neighbor]] += 1
+        return len(stones)
+
+    def shared_sides(self, point, head):
+        """
+        指定した空点と、指定した連の石が接している辺の数を数える
+
+        Args:
+            point: 空点の番号
+            head: 連の代表点
+
+        Returns:
+            int: 接している辺の数
+        """
+        cells = self.cells
+        chain = self.chain
+        black, white = Board.BLACK, Board.WHITE
+        count = 0
+        for neighbor in self.neighbors[point]:
+            value = cells[neighbor]
+            if (value == black or value == white) and chain[neighbor] == head:
+                count += 1
+        return count
+
+    def is_legal(self, point, color):
+        """
+        指定した点に石を置けるかどうかを判定（盤面は変更しない）
+
+        Args:
+            point: 点の番号
+            color: 石の色
+
+        Returns:
+            bool: 石を置けるかどうか（既に石がある・コウ・自殺手の場合はFalse）
+        """
+        cells = self.cells
+        empty = Board.EMPTY
+        if cells[point] != empty or point == self.ko:
+            return False
+
+        chain = self.chain
+        liberties = self.liberties
+        for neighbor in self.neighbors[point]:
+            value = cells[neighbor]
+            if value == empty:
+                return True
+            if value == BORDER:
+                continue
+
+            # この点以外に呼吸点がある自分の連に繋がるか、この点だけが呼吸点の相手の連を取れれば置ける
+            head = chain[neighbor]
+            other_liberties = liberties[head] > self.shared_sides(point, head)
+            if (value == color) == other_liberties:
+                return True
+        return False
+
+    def is_eye(self, point, color):
+        """
+        指定した空点が指定色の眼かどうかを判定（プレイアウトで自分の眼を埋めないために使う）
+
+        Args:
+            point: 空点の番号
+            color: 石の色
+
+        Returns:
+            bool: 上下左右がすべて自分の石か盤外で、斜めの相手の石が少ない（辺では0、中央では1以下）か
+        """
+        cells = self.cells
+        for neighbor in self.neighbors[point]:
+            value = cells[neighbor]
+            if value != color and value != BORDER:
+                return False
+
+        opponent = Board.WHITE if color == Board.BLACK else Board.BLACK
+        bad = 0
+        at_edge = False
+        for diagonal in self.diagonals[point]:
+            value = cells[diagonal]
+            if value == BORDER:
+                at_edge = True
+            elif value == opponent:
+                bad += 1
+        return bad == 0 if at_edge else bad <= 1
+
+    def play(self, point, color=None):
+        """
+        石を置いて相手の石を取る（石を置けない場合は盤面を変更しない）
+
+        Args:
+            point: 点の番号（PASSの場合はパス）
+            color: 石の色（省略時は手番の色）
+
+        Returns:
+            bool: 石を置けたかどうか
+        """
+        if color is None:
+            color = self.to_play
+        opponent = Board.WHITE if color == Board.BLACK else Board.BLACK
+
+        if point == PASS:
+            self.ko = None
+            self.passes += 1
+            self.to_play = opponent
+            return True
+
+        if not self.is_legal(point, color):
+            return False
+
+        self.add_stone(point, color)
+
+        # 疑似呼吸点がなくなった相手の連を取る
+        cells = self.cells
+        chain = self.chain
+        captured = 0
+        ko = None
+        for neighbor in self.neighbors[point]:
+            if cells[neighbor] == opponent and self.liberties[chain[neighbor]] == 0:
+                removed = self.remove_chain(chain[neighbor])
+                if removed == 1:
+                    ko = neighbor
+                captured += removed
+
+        if color == Board.BLACK:
+            self.black_captures += captured
+        else:
+            self.white_captures += captured
+
+        # 単独の石で1つだけ取った場合はコウ
+        self.ko = ko if captured == 1 and self.chain_size[chain[point]] == 1 else None
+
+        self.passes = 0
+        self.to_play = opponent
+        return True
+
+    def legal_moves(self, color=None):
+        """
+        石を置ける点のうち、自分の眼でない点を列挙
+
+        Args:
+            color: 石の色（省略時は手番の色）
+
+        Returns:
+            list: 点の番号のリスト
+        """
+        if color is None:
+            color = self.to_play
+        return [point for point in self.empty
+                if not self.is_eye(point, color) and self.is_legal(point, color)]
+
+    def random_move(self, rng, color=None):
+        """
+        石を置ける点のうち、自分の眼でない点を乱数で1つ選ぶ
+
+        Args:
+            rng: 乱数生成器（random.Random）
+            color: 石の色（省略時は手番の色）
+
+        Returns:
+            int: 点の番号（置ける点がない場合はPASS）
+        """
+        if color is None:
+            color = self.to_play
+        empty = self.empty
+        count = len(empty)
+        if not count:
+            return PASS
+
+        # 乱数で選んだ位置から空点のリストを1周する
+        start = rng.randrange(count)
+        for index in range(start, start + count):
+            point = empty[index % count]
+            if not self.is_eye(point, color) and self.is_legal(point, color):
+                return point
+        return PASS
+
+    def playout(self, rng, max_moves=None):
+        """
+        両者が連続してパスするまで乱数で打ち進める
+
+        Args:
+            rng: 乱数生成器（random.Random）
+            max_moves: 打つ手数の上限（省略時は盤面の点の数の3倍）
+
+        Returns:
+            int: 打った手数（パスを含む）
+        """
+        if max_moves is None:
+            max_moves = self.size * self.size * 3
+        moves = 0
+        while self.passes < 2 and moves < max_moves:
+            self.play(self.random_move(rng))
+            moves += 1
+        return moves
+
+    def score(self):
+        """
+        黒から見た得点差を計算（石の数と、盤内の上下左右がすべて片方の色の石である空点の数の合計。コミを含む）
+
+        Returns:
+            float: 黒の得点 - 白の得点 - コミ
+        """
+        cells = self.cells
+        counts = [0, 0, 0, 0]
+        for point in self.points:
+            value = cells[point]
+            if value != Board.EMPTY:
+                counts[value] += 1
+                continue
+            owner = 0
+            for neighbor in self.neighbors[point]:
+                value = cells[neighbor]
+                if value == Board.EMPTY:
+                    owner = BORDER
+                    break
+                if value != BORDER:
+                    owner |= value
+            if owner == Board.BLACK or owner == Board.WHITE:
+                counts[owner] += 1
+        return counts[Board.BLACK] - counts[Board.WHITE] - self.komi
+
+    def winner(self):
+        """
+        勝者を判定
+
+        Returns:
+            int: 勝った色（Board.BLACK or Board.WHITE）
+        """
+        return Board.BLACK if self.score() > 0 else Board.WHITE
@@ -0,0 +1,99 @@
+"""
+石を置ける点のプレビューをバックグラウンドで先読みするモジュール
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src import analysis
+from src.board import Board
+
+
+class PreviewWorker:
+    """
+    局面が変わったときに、石を置けるすべての点のプレビューを別スレッドで計算し、
+    盤面のプレビューの計算結果（Board.preview_cache）に書き込むクラス。
+    計算は盤面の配列の複製に対して盤面を変更しない関数（analysis.preview_move）で行う。
+    """
+
+    def __init__(self, board):
+        """
+        初期化
+
+        Args:
+            board: 盤面オブジェクト
+        """
+        self.board = board
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='preview')
+        self.future = None
+        self.cancel_event = None
+
+        # 先読みを開始した局面のハッシュと色
+        self.started = None
+
+    def request(self, cursor=None, color=Board.BLACK):
+        """
+        局面が変わっていればプレビューの先読みを開始する（同じ局面なら何もしない）
+
+        Args:
+            cursor: マウスカーソルのある点の座標（近い点から順に計算する。省略時は盤面の中央）
+            color: 置く石の色
+        """
+        self.board.sync_chains()
+        if self.started == (self.board.hash, color):
+            return
+
+        self.cancel()
+        self.started = (self.board.hash, color)
+
+        # カーソルに近い点から順に計算する
+        size = self.board.size
+        cx, cy = cursor if cursor is not None else (size // 2, size // 2)
+        ys, xs = np.nonzero(self.board.legal_moves(color))
+        points = sorted(zip(xs.tolist(), ys.tolist()),
+                        key=lambda point: abs(point[0] - cx) + abs(point[1] - cy))
+
+        self.cancel_event = threading.Event()
+        self.future = self.executor.submit(
+            self.precompute, self.board.board.copy(), self.board.ko, self.board.hash,
+            points, color, self.cancel_event)
+
+    def precompute(self, board, ko, position_hash, points, color, cancelled):
+        """
+        各点のプレビューを計算し、盤面のプレビューの計算結果に記録する（別スレッドで実行される）
+
+        Args:
+            board: 盤面の状態の複製
+            ko: コウで置けない点の座標
+            position_hash: 局面のハッシュ
+            points: 計算する点の座標のリスト
+            color: 置く石の色
+            cancelled: 中止を指示されたときにセットされるイベント
+        """
+        for x, y in points:
+            if cancelled.is_set():
+                return
+            key = (position_hash, x, y, color)
+            if self.board.find_preview(key) is None:
+                self.board.store_preview(key, analysis.preview_move(board, x, y, color, ko))
+
+    def is_running(self):
+        """
+        先読みを実行中かどうか
+
+        Returns:
+            bool: 実行中かどうか
+        """
+        return self.future is not None and not self.future.done()
+
+    def cancel(self):
+        """実行中の先読みを中止する（次にrequestを呼ぶと同じ局面でも先読みし直す）"""
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+        self.started = None
+
+    def shutdown(self):
+        """先読みを中止し、スレッドを終了する"""
+        self.cancel()
+        self.executor.shutdown(wait=True)
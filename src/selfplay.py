@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+画面を使わないAI同士の対局（自己対局）をプロセスプールで並列に行うモジュール
+
+対局が終わるたびに結果をJSONLファイルに1行ずつ書き出し、最後に対局数・手数の速度、
+1手の思考時間（平均・99パーセンタイル）、勝率を表示する。
+同じ局面の再現はスーパーコウとして禁止し、最大手数で打ち切った対局の数も表示する。
+
+使い方:
+    python -m src.selfplay --games 100 --size 9 --black heuristic --white mcts:200 --workers 8
+
+AIの種類:
+    heuristic          1手読みの評価関数（AI）
+    heuristic:<K>      影響圏の増加量を計算する候補をK手に絞る（0ですべての手）
+    mcts               モンテカルロ木探索（--time-limit の思考時間）
+    mcts:<N>           1手N回のプレイアウトのモンテカルロ木探索
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import time
+from collections import namedtuple, Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+
+import numpy as np
+
+from .board import Board
+from .ai import AI
+from .mcts import MCTS
+from .engine import GameEngine
+from .transposition import TranspositionTable
+
+# 1局の設定
+GameJob = namedtuple('GameJob', ['game', 'size', 'black', 'white', 'komi', 'seed',
+                                 'time_limit', 'max_moves'])
+
+# 結果に書き出す石の色の名前
+COLOR_NAMES = {Board.BLACK: 'black', Board.WHITE: 'white'}
+
+
+def parse_engine(spec):
+    """
+    AIの種類の指定を解析する
+
+    Args:
+        spec: AIの種類（'heuristic', 'heuristic:<K>', 'mcts', 'mcts:<N>'）
+
+    Returns:
+        tuple: (AIの名前, 数値の設定（ない場合はNone）)
+
+    Raises:
+        ValueError: 解析できない指定の場合
+    """
+    name, _, option = spec.partition(':')
+    if name not in ('heuristic', 'mcts') or (option and not option.isdigit()):
+        raise ValueError(f"不明なAIの種類です: {spec}")
+    return name, int(option) if option else None
+
+
+@lru_cache(maxsize=None)
+def shared_table():
+    """
+    このプロセスの評価関数のAIが共有する置換表を取得（対局をまたいで同じ局面の評価を使い回す）
+
+    Returns:
+        TranspositionTable: 置換表
+    """
+    return TranspositionTable()
+
+
+def make_player(spec, board, color, komi, seed, time_limit=MCTS.TIME_LIMIT):
+    """
+    指定した種類のAIを作る
+
+    Args:
+        spec: AIの種類
+        board: 盤面オブジェクト
+        color: AIの石の色
+        komi: 白に加えるコミ
+        seed: 乱数の種
+        time_limit: モンテカルロ木探索の1手の思考時間（秒、プレイアウトの回数を指定しない場合）
+
+    Returns:
+        AI or MCTS: AIオブジェクト
+    """
+    name, option = parse_engine(spec)
+    if name == 'heuristic':
+        top_k = AI.TOP_K if option is None else (option or None)
+        return AI(board, color=color, top_k=top_k, table=shared_table())
+    return MCTS(board, color=color, time_limit=time_limit, playouts=option, komi=komi, seed=seed)
+
+
+def play_game(job):
+    """
+    1局を最後まで打つ（別プロセスで実行される）
+
+    Args:
+        job: 対局の設定（GameJob）
+
+    Returns:
+        dict: 対局の結果（JSONLの1行）
+    """
+    # 評価関数のAIはrandomモジュールの乱数を使う
+    random.seed(job.seed)
+
+    # 同じ局面を繰り返して終わらない対局にならないよう、スーパーコウを禁止する
+    board = Board(job.size, superko=True)
+    engine = GameEngine(board, job.komi)
+    players = {
+        Board.BLACK: make_player(job.black, board, Board.BLACK, job.komi, job.seed, job.time_limit),
+        Board.WHITE: make_player(job.white, board, Board.WHITE, job.komi, job.seed + 1, job.time_limit),
+    }
+    move_seconds = {Board.BLACK: [], Board.WHITE: []}
+
+    truncated = False
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        while not engine.finished:
+            # 終わらない対局は打ち切って現在の盤面で判定する
+            if engine.move_count >= job.max_moves:
+                engine.finish()
+                truncated = True
+                break
+
+            color = engine.to_play
+            think_start = time.perf_counter()
+            move = players[color].get_move()
+            move_seconds[color].append(time.perf_counter() - think_start)
+
+            if move is None or not engine.play(*move):
+                engine.pass_move()
+    elapsed = time.perf_counter() - start
+
+    return {
+        'game': job.game,
+        'size': job.size,
+        'komi': job.komi,
+        'seed': job.seed,
+        'black': job.black,
+        'white': job.white,
+        'winner': COLOR_NAMES[engine.winner],
+        'black_score': float(engine.black_score),
+        'white_score': float(engine.white_score),
+        'moves': engine.move_count,
+        'truncated': truncated,
+        'seconds': elapsed,
+        'black_move_seconds': move_seconds[Board.BLACK],
+        'white_move_seconds': move_seconds[Board.WHITE],
+    }
+
+
+def run_games(jobs, workers):
+    """
+    対局をプロセスプールで並列に行い、終わった順に結果を返す
+
+    Args:
+        jobs: 対局の設定（GameJob）のリスト
+        workers: 対局を並列に行うプロセスの数（1の場合はこのプロセスで順に行う）
+
+    Yields:
+        dict: 対局の結果
+    """
+    if workers <= 1:
+        for job in jobs:
+            yield play_game(job)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(play_game, job) for job in jobs]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def summarize(results, elapsed):
+    """
+    対局の結果を集計する
+
+    Args:
+        results: 対局の結果のリスト
+        elapsed: すべての対局にかかった時間（秒）
+
+    Returns:
+        dict: 対局数・手数の速度、打ち切った対局の数、1手の思考時間、色ごとの勝率、
+              AIごとの勝率（異なるAI同士の対局だけで数える）
+    """
+    games = len(results)
+    moves = sum(result['moves'] for result in results)
+    move_seconds = np.array([seconds for result in results
+                             for seconds in result['black_move_seconds'] + result['white_move_seconds']])
+
+    colors = Counter(result['winner'] for result in results)
+
+    # AIごとの勝率は異なるAI同士の対局だけで数える（同じAI同士では常に50%になるため）
+    played = Counter()
+    wins = Counter()
+    for result in results:
+        if result['black'] == result['white']:
+            continue
+        played[result['black']] += 1
+        played[result['white']] += 1
+        wins[result[result['winner']]] += 1
+
+    return {
+        'games': games,
+        'moves': moves,
+        'truncated_games': sum(result['truncated'] for result in results),
+        'seconds': elapsed,
+        'games_per_second': games / elapsed if elapsed > 0 else 0.0,
+        'moves_per_second': moves / elapsed if elapsed > 0 else 0.0,
+        'mean_move_seconds': float(move_seconds.mean()) if move_seconds.size else 0.0,
+        'p99_move_seconds': float(np.percentile(move_seconds, 99)) if move_seconds.size else 0.0,
+        'color_win_rates': {color: colors[color] / games if games else 0.0 for color in ('black', 'white')},
+        'engine_win_rates': {spec: wins[spec] / played[spec] for spec in played},
+    }
+
+
+def main(argv=None):
+    """
+    自己対局を実行して結果を表示
+
+    Args:
+        argv: コマンドライン引数（省略時はsys.argv）
+    """
+    parser = argparse.ArgumentParser(description='AI同士の自己対局')
+    parser.add_argument('--games', type=int, default=10, help='対局数')
+    parser.add_argument('--size', type=int, default=9, help='盤面のサイズ')
+    parser.add_argument('--black', default='heuristic', help='黒のAIの種類')
+    parser.add_argument('--white', default='heuristic', help='白のAIの種類')
+    parser.add_argument('--komi', type=float, default=GameEngine.KOMI, help='白に加えるコミ')
+    parser.add_argument('--seed', type=int, default=0, help='乱数の種（対局ごとに1ずつ増やす）')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='対局を並列に行うプロセスの数')
+    parser.add_argument('--time-limit', type=float, default=MCTS.TIME_LIMIT,
+                        help='モンテカルロ木探索の1手の思考時間（秒）')
+    parser.add_argument('--max-moves', type=int, default=None, help='1局の最大手数（省略時は盤面の点の数の3倍）')
+    parser.add_argument('--output', default='selfplay.jsonl', help='対局の結果を書き出すJSONLファイル')
+    args = parser.parse_args(argv)
+
+    for spec in (args.black, args.white):
+        try:
+            parse_engine(spec)
+        except ValueError as error:
+            parser.error(str(error))
+
+    max_moves = args.max_moves or args.size * args.size * 3
+    jobs = [GameJob(game, args.size, args.black, args.white, args.komi, args.seed + game * 2,
+                    args.time_limit, max_moves)
+            for game in range(args.games)]
+
+    print(f"{args.size}路盤 黒:{args.black} 白:{args.white} コミ{args.komi} "
+          f"{args.games}局 {args.workers}プロセス")
+
+    # 対局が終わるたびに1行ずつ書き出す（途中で中断しても終わった対局の結果は残る）
+    results = []
+    start = time.perf_counter()
+    with open(args.output, 'w', encoding='utf-8') as output:
+        for result in run_games(jobs, args.workers):
+            output.write(json.dumps(result, ensure_ascii=False) + '\n')
+            output.flush()
+            results.append(result)
+            print(f"第{result['game'] + 1}局: {result['winner']}の勝ち "
+                  f"(黒{result['black_score']:.1f} 白{result['white_score']:.1f}, {result['moves']}手)")
+    summary = summarize(results, time.perf_counter() - start)
+
+    print(f"{summary['games']}局 {summary['seconds']:.1f}秒: "
+          f"{summary['games_per_second']:.2f} 局/秒, {summary['moves_per_second']:.1f} 手/秒")
+    print(f"最大手数で打ち切った対局: {summary['truncated_games']}局")
+    print(f"1手の思考時間: 平均 {summary['mean_move_seconds'] * 1000:.1f}ms, "
+          f"99パーセンタイル {summary['p99_move_seconds'] * 1000:.1f}ms")
+    print(f"色ごとの勝率: 黒 {summary['color_win_rates']['black']:.1%}, "
+          f"白 {summary['color_win_rates']['white']:.1%}")
+    for spec, rate in summary['engine_win_rates'].items():
+        print(f"{spec} の勝率: {rate:.1%}")
+    return summary
+
+
+if __name__ == '__main__':
+    main()
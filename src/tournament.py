@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+複数のAIの総当たり戦（リーグ戦）を行うモジュール
+
+すべての組み合わせの対局をプロセスプールで並列に行い（組み合わせごとに先後を交互にする）、
+Eloレーティングとその95%信頼区間、AIごとの1手の思考時間の分布を表示する。
+対局の結果は自己対局（src.selfplay）と同じ形式でJSONLファイルに書き出す。
+
+使い方:
+    python -m src.tournament --engines heuristic heuristic:8 mcts:100 mcts:400 --games 20 --workers 8
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import time
+
+import numpy as np
+
+from .mcts import MCTS
+from .engine import GameEngine
+from .selfplay import GameJob, parse_engine, run_games
+
+# レーティングの初期値の差をなくすため、各組み合わせに加える引き分けの数
+PRIOR_DRAWS = 1.0
+
+
+def schedule(engines, games, size, komi, seed, time_limit, max_moves):
+    """
+    総当たり戦の対局を組む（組み合わせごとに先後を交互にする）
+
+    Args:
+        engines: AIの種類のリスト
+        games: 1つの組み合わせの対局数
+        size: 盤面のサイズ
+        komi: 白に加えるコミ
+        seed: 乱数の種（対局ごとに2ずつ増やす）
+        time_limit: モンテカルロ木探索の1手の思考時間（秒）
+        max_moves: 1局の最大手数
+
+    Returns:
+        list: 対局の設定（GameJob）のリスト
+    """
+    jobs = []
+    for first, second in itertools.combinations(engines, 2):
+        for i in range(games):
+            black, white = (first, second) if i % 2 == 0 else (second, first)
+            game = len(jobs)
+            jobs.append(GameJob(game, size, black, white, komi, seed + game * 2, time_limit, max_moves))
+    return jobs
+
+
+def win_matrix(results, engines):
+    """
+    AIごとの勝ち数の表を作る
+
+    Args:
+        results: 対局の結果のリスト
+        engines: AIの種類のリスト
+
+    Returns:
+        numpy.ndarray: wins[i, j] が engines[i] が engines[j] に勝った数の配列
+    """
+    index = {spec: i for i, spec in enumerate(engines)}
+    wins = np.zeros((len(engines), len(engines)))
+    for result in results:
+        winner = result[result['winner']]
+        loser = result['white' if result['winner'] == 'black' else 'black']
+        wins[index[winner], index[loser]] += 1
+    return wins
+
+
+def elo_ratings(wins, prior=PRIOR_DRAWS, iterations=200):
+    """
+    勝ち数の表からEloレーティングを求める（Bradley-Terryモデルの最尤推定）
+
+    全勝・全敗のAIのレーティングが無限大にならないよう、対局した組み合わせごとに
+    prior局の引き分け（双方にprior/2勝）を加える。
+
+    Args:
+        wins: wins[i, j] が i が j に勝った数の配列
+        prior: 組み合わせごとに加える引き分けの数
+        iterations: 反復の回数
+
+    Returns:
+        numpy.ndarray: 各AIのレーティング（平均が0）
+    """
+    games = wins + wins.T
+    wins = wins + np.where(games > 0, prior / 2, 0.0)
+    games = wins + wins.T
+    total_wins = wins.sum(axis=1)
+
+    # MMアルゴリズムで強さ（gamma）を更新する
+    gamma = np.ones(len(wins))
+    for _ in range(iterations):
+        denominator = (games / (gamma[:, np.newaxis] + gamma[np.newaxis, :])).sum(axis=1)
+        gamma = np.where(denominator > 0, total_wins / np.maximum(denominator, 1e-12), gamma)
+        gamma /= math.exp(np.log(gamma).mean())
+
+    ratings = 400 * np.log10(gamma)
+    return ratings - ratings.mean()
+
+
+def elo_intervals(results, engines, samples=200, seed=0):
+    """
+    対局を復元抽出したレーティングから95%信頼区間を求める（ブートストラップ法）
+
+    Args:
+        results: 対局の結果のリスト
+        engines: AIの種類のリスト
+        samples: 復元抽出の回数
+        seed: 乱数の種
+
+    Returns:
+        numpy.ndarray: 各AIの (下限, 上限) の配列
+    """
+    rng = np.random.default_rng(seed)
+    ratings = np.empty((samples, len(engines)))
+    for sample in range(samples):
+        picks = rng.integers(0, len(results), size=len(results))
+        ratings[sample] = elo_ratings(win_matrix([results[i] for i in picks], engines))
+    return np.percentile(ratings, [2.5, 97.5], axis=0).T
+
+
+def think_times(results, engines):
+    """
+    AIごとの1手の思考時間の分布を求める
+
+    Args:
+        results: 対局の結果のリスト
+        engines: AIの種類のリスト
+
+    Returns:
+        dict: AIの種類ごとの {'moves', 'mean', 'p50', 'p90', 'p99', 'max'}（秒）
+    """
+    seconds = {spec: [] for spec in engines}
+    for result in results:
+        seconds[result['black']].extend(result['black_move_seconds'])
+        seconds[result['white']].extend(result['white_move_seconds'])
+
+    stats = {}
+    for spec, values in seconds.items():
+        values = np.array(values)
+        if not values.size:
+            values = np.zeros(1)
+        p50, p90, p99 = np.percentile(values, [50, 90, 99])
+        stats[spec] = {'moves': len(seconds[spec]), 'mean': float(values.mean()), 'p50': float(p50),
+                       'p90': float(p90), 'p99': float(p99), 'max': float(values.max())}
+    return stats
+
+
+def main(argv=None):
+    """
+    総当たり戦を実行して結果を表示
+
+    Args:
+        argv: コマンドライン引数（省略時はsys.argv）
+
+    Returns:
+        dict: AIの種類ごとの成績（対局数・勝ち数・レーティング・信頼区間・思考時間）
+    """
+    parser = argparse.ArgumentParser(description='AIの総当たり戦')
+    parser.add_argument('--engines', nargs='+', required=True, help='対局させるAIの種類（2つ以上）')
+    parser.add_argument('--games', type=int, default=10, help='1つの組み合わせの対局数（先後を交互にする）')
+    parser.add_argument('--size', type=int, default=9, help='盤面のサイズ')
+    parser.add_argument('--komi', type=float, default=GameEngine.KOMI, help='白に加えるコミ')
+    parser.add_argument('--seed', type=int, default=0, help='乱数の種')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='対局を並列に行うプロセスの数')
+    parser.add_argument('--time-limit', type=float, default=MCTS.TIME_LIMIT,
+                        help='モンテカルロ木探索の1手の思考時間（秒）')
+    parser.add_argument('--max-moves', type=int, default=None, help='1局の最大手数（省略時は盤面の点の数の3倍）')
+    parser.add_argument('--output', default='tournament.jsonl', help='対局の結果を書き出すJSONLファイル')
+    args = parser.parse_args(argv)
+
+    engines = list(dict.fromkeys(args.engines))
+    if len(engines) < 2:
+        parser.error('異なるAIの種類を2つ以上指定してください')
+    for spec in engines:
+        try:
+            parse_engine(spec)
+        except ValueError as error:
+            parser.error(str(error))
+
+    max_moves = args.max_moves or args.size * args.size * 3
+    jobs = schedule(engines, args.games, args.size, args.komi, args.seed, args.time_limit, max_moves)
+    print(f"{args.size}路盤 コミ{args.komi} {len(engines)}種類のAI {len(jobs)}局 {args.workers}プロセス")
+
+    # 対局が終わるたびに1行ずつ書き出す（途中で中断しても終わった対局の結果は残る）
+    results = []
+    start = time.perf_counter()
+    with open(args.output, 'w', encoding='utf-8') as output:
+        for result in run_games(jobs, args.workers):
+            output.write(json.dumps(result, ensure_ascii=False) + '\n')
+            output.flush()
+            results.append(result)
+            print(f"{len(results)}/{len(jobs)}局: 黒:{result['black']} 白:{result['white']} "
+                  f"{result['winner']}の勝ち")
+    elapsed = time.perf_counter() - start
+
+    wins = win_matrix(results, engines)
+    ratings = elo_ratings(wins)
+    intervals = elo_intervals(results, engines, seed=args.seed)
+    times = think_times(results, engines)
+
+    print(f"{len(results)}局 {elapsed:.1f}秒")
+    print(f"{'AI':<16}{'対局':>6}{'勝ち':>6}{'Elo':>8}{'95%信頼区間':>18}"
+          f"{'平均':>9}{'p50':>9}{'p90':>9}{'p99':>9}{'最大':>9} (ms)")
+    standings = {}
+    for i in np.argsort(-ratings):
+        spec = engines[i]
+        played = int(wins[i].sum() + wins[:, i].sum())
+        low, high = intervals[i]
+        t = times[spec]
+        print(f"{spec:<16}{played:>6}{int(wins[i].sum()):>6}{ratings[i]:>8.0f}"
+              f"{f'[{low:.0f}, {high:.0f}]':>18}"
+              f"{t['mean'] * 1000:>9.1f}{t['p50'] * 1000:>9.1f}{t['p90'] * 1000:>9.1f}"
+              f"{t['p99'] * 1000:>9.1f}{t['max'] * 1000:>9.1f}")
+        standings[spec] = {'games': played, 'wins': int(wins[i].sum()), 'elo': float(ratings[i]),
+                           'elo_interval': (float(low), float(high)), 'think_seconds': t}
+    return standings
+
+
+if __name__ == '__main__':
+    main()
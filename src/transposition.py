@@ -0,0 +1,175 @@
+"""
+Zobristハッシュで引く置換表を提供するモジュール
+"""
+from collections import namedtuple
+
+import numpy as np
+
+# 置換表から取り出した記録
+Entry = namedtuple('Entry', ['score', 'move', 'depth', 'bound'])
+
+
+class TranspositionTable:
+    """
+    局面のZobristハッシュから評価値・最善手・読みの深さ・評価値の種類を引く置換表。
+    決まった大きさの配列を最初に確保し、局面が増えてもメモリ使用量は変わらない。
+    ハッシュの下位ビットで選んだバケットの2つのスロットに記録し、
+    1つ目のスロットは深く読んだ記録を優先して残し（より深い記録が来たら2つ目に移す）、
+    同じか浅い読みの記録は2つ目のスロットを常に置き換える。
+    """
+    # 評価値の種類（正確な値・下限・上限）
+    EXACT = 0
+    LOWER = 1
+    UPPER = 2
+
+    # 1つの記録の形式（16バイト、深さが負のスロットは空）
+    ENTRY = np.dtype([('key', np.uint64), ('score', np.float32), ('move', np.int16),
+                      ('depth', np.int8), ('bound', np.int8)])
+
+    # 置換表に使うメモリ（バイト）
+    MEMORY = 4 * 1024 * 1024
+
+    def __init__(self, memory=MEMORY):
+        """
+        初期化
+
+        Args:
+            memory: 置換表に使うメモリ（バイト、バケットの数は2の累乗に切り下げる）
+        """
+        buckets = max(1, memory // (2 * self.ENTRY.itemsize))
+        buckets = 1 << (buckets.bit_length() - 1)
+        self.mask = buckets - 1
+        self.entries = np.zeros((buckets, 2), dtype=self.ENTRY)
+        self.clear()
+
+    def clear(self):
+        """すべての記録を消す"""
+        self.entries['key'] = 0
+        self.entries['depth'] = -1
+        self.hits = 0
+        self.misses = 0
+
+    def probe(self, key):
+        """
+        局面の記録を引く
+
+        Args:
+            key: 局面の64ビットのハッシュ
+
+        Returns:
+            Entry or None: 記録（ない場合はNone）
+        """
+        bucket = self.entries[key & self.mask]
+        for slot in bucket:
+            if slot['depth'] >= 0 and int(slot['key']) == key:
+                self.hits += 1
+                return Entry(float(slot['score']), int(slot['move']), int(slot['depth']), int(slot['bound']))
+        self.misses += 1
+        return None
+
+    def store(self, key, score, move=-1, depth=0, bound=EXACT):
+        """
+        局面の記録を書き込む
+
+        1つ目のスロットと同じ局面ならそこを書き換える。1つ目のスロットが空か、より深い読みの記録なら
+        1つ目に書き込み、それまでの記録は2つ目に移す。同じか浅い読みの記録は2つ目を置き換える。
+
+        Args:
+            key: 局面の64ビットのハッシュ
+            score: 評価値
+            move: この局面の最善手（点の番号 y * size + x、ない場合は-1）
+            depth: 読みの深さ
+            bound: 評価値の種類（EXACT, LOWER, UPPER）
+        """
+        bucket = self.entries[key & self.mask]
+        first = bucket[0]
+        if first['depth'] < 0 or int(first['key']) == key:
+            slot = 0
+        elif depth > first['depth']:
+            # 深く読んだ記録に1つ目を譲り、それまでの記録は2つ目に残す
+            bucket[1] = first
+            slot = 0
+        else:
+            slot = 1
+        bucket[slot] = (key, score, move, depth, bound)
+
+    def probe_many(self, keys):
+        """
+        複数の局面の評価値をまとめて引く
+
+        Args:
+            keys: 局面の64ビットのハッシュの配列（numpy.uint64）
+
+        Returns:
+            tuple: (記録があるかどうかのbool配列, 評価値の配列)
+        """
+        slots = self.entries[keys & np.uint64(self.mask)]
+        matches = (slots['key'] == keys[:, np.newaxis]) & (slots['depth'] >= 0)
+        found = matches.any(axis=1)
+        scores = np.where(matches[:, 0], slots['score'][:, 0], slots['score'][:, 1])
+        hits = int(np.count_nonzero(found))
+        self.hits += hits
+        self.misses += len(keys) - hits
+        return found, scores
+
+    def store_many(self, keys, scores, moves=None, depth=0, bound=EXACT):
+        """
+        複数の局面の記録をまとめて書き込む（置き換えの規則はstoreと同じ）
+
+        同じバケットに入る局面は、配列の順に1つずつ書き込んだ場合と同じ結果になるよう、
+        バケットごとに1つずつ選んで何回かに分けて書き込む。
+
+        Args:
+            keys: 局面の64ビットのハッシュの配列（numpy.uint64）
+            scores: 評価値の配列
+            moves: 各局面の最善手（点の番号）の配列（省略時はすべて-1）
+            depth: 読みの深さ
+            bound: 評価値の種類（EXACT, LOWER, UPPER）
+        """
+        records = np.empty(len(keys), dtype=self.ENTRY)
+        records['key'] = keys
+        records['score'] = scores
+        records['move'] = -1 if moves is None else moves
+        records['depth'] = depth
+        records['bound'] = bound
+
+        indices = (records['key'] & np.uint64(self.mask)).astype(np.intp)
+        while records.size:
+            # バケットごとに最初の記録だけを書き込み、残りは次の回に回す
+            _, picks = np.unique(indices, return_index=True)
+            rest = np.ones(len(records), dtype=bool)
+            rest[picks] = False
+            self.store_records(indices[picks], records[picks])
+            records, indices = records[rest], indices[rest]
+
+    def store_records(self, indices, records):
+        """
+        異なるバケットに入る複数の記録を書き込む（置き換えの規則はstoreと同じ）
+
+        Args:
+            indices: 各記録のバケットの番号の配列（重複しない）
+            records: 記録の配列（ENTRYの形式）
+        """
+        first = self.entries[indices, 0]
+        empty = first['depth'] < 0
+        same = ~empty & (first['key'] == records['key'])
+        deeper = ~empty & ~same & (records['depth'] > first['depth'])
+
+        # 深く読んだ記録に1つ目を譲り、それまでの記録は2つ目に残す
+        self.entries[indices[deeper], 1] = first[deeper]
+        slots = np.where(empty | same | deeper, 0, 1)
+        self.entries[indices, slots] = records
+
+    @property
+    def capacity(self):
+        """記録できる局面の数"""
+        return self.entries.size
+
+    @property
+    def memory(self):
+        """置換表が使うメモリ（バイト）"""
+        return self.entries.nbytes
+
+    def __len__(self):
+        """記録している局面の数"""
+        return int(np.count_nonzero(self.entries['depth'] >= 0))
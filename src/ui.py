@@ -2,7 +2,6 @@ import pygame
 import os
 import random
 import math
-import sys
 import numpy as np
 from .board import Board
 
@@ -249,7 +248,7 @@ class UI:
         self.draw_board()
         
         # 優位性グラフの描画（画面上部に配置）
-        self.draw_advantage_bar()
+        self.draw_advantage_bar(player_turn)
         
         # プレイヤー情報（左側）
         self.draw_player_info()
@@ -651,8 +650,13 @@ class UI:
             else:
                 self.popup_message = None
     # 用語集関連のメソッドを削除
-    def draw_advantage_bar(self):
-        """優位性を示す横棒グラフを描画"""
+    def draw_advantage_bar(self, player_turn):
+        """
+        優位性を示す横棒グラフを描画
+        
+        Args:
+            player_turn: プレイヤーの手番かどうか
+        """
         # プレイヤーは常に黒石、AIは常に白石
         player_stone = Board.BLACK
         ai_stone = Board.WHITE
@@ -723,17 +727,7 @@ class UI:
         player_win_rate = max(0.1, min(0.9, player_win_rate))  # 0.1～0.9の範囲に制限
         
         # 手番によるわずかな補正（手番があるほうが有利）
-        from .game import Game
-        game_instance = None
-        for frame in sys._current_frames().values():
-            for local_var in frame.f_locals.values():
-                if isinstance(local_var, Game):
-                    game_instance = local_var
-                    break
-            if game_instance:
-                break
-                
-        if game_instance and game_instance.player_turn:
+        if player_turn:
             player_win_rate += 0.03
         else:
             player_win_rate -= 0.03
@@ -0,0 +1,60 @@
+"""
+Zobristハッシュによる局面の識別を提供するモジュール
+"""
+import random
+from functools import lru_cache
+
+import numpy as np
+
+# 乱数表の生成に使う種（同じサイズの盤面なら常に同じハッシュになる）
+ZOBRIST_SEED = 20250601
+
+
+@lru_cache(maxsize=None)
+def get_keys(size):
+    """
+    指定したサイズの盤面のZobrist乱数表を取得
+
+    Args:
+        size: 盤面のサイズ
+
+    Returns:
+        tuple: 石の色（0: 空, 1: 黒, 2: 白）ごとの、点の番号（y * size + x）で引く64ビット乱数の表
+    """
+    rng = random.Random(ZOBRIST_SEED + size)
+    count = size * size
+    empty = (0,) * count
+    black = tuple(rng.getrandbits(64) for _ in range(count))
+    white = tuple(rng.getrandbits(64) for _ in range(count))
+    return (empty, black, white)
+
+
+def hash_board(board):
+    """
+    盤面全体のZobristハッシュを計算
+
+    Args:
+        board: 盤面の状態（size x size の配列）
+
+    Returns:
+        int: 64ビットのハッシュ値
+    """
+    keys = get_keys(board.shape[0])
+    flat = np.asarray(board).ravel()
+    value = 0
+    for color in (1, 2):
+        for index in np.flatnonzero(flat == color):
+            value ^= keys[color][index]
+    return value
+
+
+@lru_cache(maxsize=None)
+def get_side_keys():
+    """
+    手番（評価する側の色）を区別するためのZobrist乱数を取得
+
+    Returns:
+        tuple: 石の色（0: 空, 1: 黒, 2: 白）で引く64ビット乱数の表
+    """
+    rng = random.Random(ZOBRIST_SEED)
+    return (0, rng.getrandbits(64), rng.getrandbits(64))
@@ -2,11 +2,14 @@ import unittest
 import sys
 import os
 import numpy as np
+from unittest.mock import patch
 
 # テスト対象のモジュールをインポートするためにパスを追加
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from src.board import Board
 from src.ai import AI
+from src.engine import GameEngine
+from src.transposition import TranspositionTable
 
 class TestAI(unittest.TestCase):
     """AIクラスのテスト"""
@@ -19,6 +22,9 @@ class TestAI(unittest.TestCase):
     def test_init(self):
         """初期化のテスト"""
         self.assertEqual(self.ai.board, self.board)
+        
+        # 既定ではすべての手の影響圏の増加量を計算する
+        self.assertIsNone(self.ai.top_k)
     
     def test_get_move(self):
         """次の一手の決定テスト"""
@@ -76,6 +82,115 @@ class TestAI(unittest.TestCase):
         # アタリを取る手が高評価であることを確認
         self.assertGreater(atari_score, normal_score)
     
+    def test_evaluate_moves(self):
+        """まとめて計算した評価値が1手ずつの評価値と一致するかのテスト"""
+        rng = np.random.default_rng(0)
+        for i in range(120):
+            color = Board.BLACK if i % 2 == 0 else Board.WHITE
+            x, y = (int(v) for v in rng.integers(0, 9, size=2))
+            self.board.place_stone(x, y, color)
+            
+            # 序盤・中盤・終盤のそれぞれで比較する
+            if i % 20 == 0:
+                legal = self.board.legal_moves(Board.WHITE)
+                moves = [(int(mx), int(my)) for my, mx in zip(*np.nonzero(legal))]
+                
+                # ランダム性を除いて比較する
+                with patch('src.ai.random.uniform', return_value=0):
+                    scores = self.ai.evaluate_moves(moves)
+                    expected = [self.ai.evaluate_move(move) for move in moves]
+                self.assertEqual(len(scores), len(moves))
+                self.assertTrue(np.allclose(scores, expected))
+    
+    def test_evaluate_candidates(self):
+        """候補の絞り込みのテスト"""
+        self.board.place_stone(4, 4, Board.BLACK)
+        self.board.place_stone(2, 2, Board.WHITE)
+        legal = self.board.legal_moves(Board.WHITE)
+        moves = [(int(x), int(y)) for y, x in zip(*np.nonzero(legal))]
+        
+        with patch('src.ai.random.uniform', return_value=0):
+            # 計算の軽い評価の上位K手だけが残る
+            self.ai.top_k = 8
+            candidates, scores = self.ai.evaluate_candidates(moves)
+            cheap = self.ai.evaluate_moves_cheap(moves)
+            self.assertEqual(len(candidates), 8)
+            threshold = np.sort(cheap)[-8]
+            for move in candidates:
+                self.assertGreaterEqual(cheap[moves.index(move)], threshold)
+            
+            # 残った手の評価値はすべての手を評価した場合と同じ
+            full = dict(zip(moves, self.ai.evaluate_moves(moves)))
+            for move, score in zip(candidates, scores):
+                self.assertAlmostEqual(score, full[move])
+            
+            # 絞り込まない場合はすべての手を評価する
+            self.ai.top_k = None
+            candidates, scores = self.ai.evaluate_candidates(moves)
+            self.assertEqual(candidates, moves)
+    
+    def test_transposition_table(self):
+        """置換表を使っても影響圏の増加量が変わらないかのテスト"""
+        self.board.place_stone(4, 4, Board.BLACK)
+        self.board.place_stone(2, 6, Board.WHITE)
+        legal = self.board.legal_moves(Board.WHITE)
+        ys, xs = np.nonzero(legal)
+        
+        ai = AI(self.board, table=TranspositionTable())
+        expected = self.ai.calculate_influence_gains(xs, ys)
+        self.assertTrue(np.array_equal(ai.calculate_influence_gains(xs, ys), expected))
+        self.assertEqual(ai.table.hits, 0)
+        
+        # 同じ局面ではすべての候補の局面を置換表から引く
+        self.assertTrue(np.array_equal(ai.calculate_influence_gains(xs, ys), expected))
+        self.assertEqual(ai.table.hits, len(xs))
+        
+        # 黒石のAIは同じ置換表を共有しても白石の記録を使わない
+        black_ai = AI(self.board, color=Board.BLACK, table=ai.table)
+        gains = black_ai.calculate_influence_gains(xs, ys)
+        self.assertTrue(np.array_equal(gains, AI(self.board, color=Board.BLACK).calculate_influence_gains(xs, ys)))
+        self.assertEqual(ai.table.hits, len(xs))
+    
+    def test_color(self):
+        """黒石のAIが色を入れ替えた局面で白石のAIと同じ評価をするかのテスト"""
+        swapped = Board(size=9)
+        rng = np.random.default_rng(1)
+        for i in range(30):
+            color = Board.BLACK if i % 2 == 0 else Board.WHITE
+            x, y = (int(v) for v in rng.integers(0, 9, size=2))
+            self.board.place_stone(x, y, color)
+            swapped.place_stone(x, y, Board.WHITE if color == Board.BLACK else Board.BLACK)
+        
+        black_ai = AI(swapped, color=Board.BLACK)
+        legal = self.board.legal_moves(Board.WHITE)
+        moves = [(int(x), int(y)) for y, x in zip(*np.nonzero(legal))]
+        with patch('src.ai.random.uniform', return_value=0):
+            expected = self.ai.evaluate_moves(moves)
+            scores = black_ai.evaluate_moves(moves)
+            single = [black_ai.evaluate_move(move) for move in moves]
+        self.assertTrue(np.allclose(scores, expected))
+        self.assertTrue(np.allclose(scores, single))
+        
+        # 黒石のAIは黒石を置ける点を選ぶ
+        move = black_ai.get_move()
+        self.assertTrue(swapped.is_valid_move(move[0], move[1], Board.BLACK))
+    
+    def test_self_play(self):
+        """2つのAIの対局のテスト"""
+        engine = GameEngine(self.board)
+        players = {Board.BLACK: AI(self.board, color=Board.BLACK), Board.WHITE: AI(self.board)}
+        for _ in range(30):
+            color = engine.to_play
+            move = players[color].get_move()
+            if move is None:
+                engine.pass_move()
+            else:
+                self.assertTrue(engine.play(*move))
+                self.assertEqual(self.board.board[move[1], move[0]], color)
+            if engine.finished:
+                break
+        self.assertGreater(engine.move_count, 0)
+    
     def test_count_potential_captures(self):
         """取れる石の数の計算テスト"""
         # アタリの状況を作る
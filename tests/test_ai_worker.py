@@ -0,0 +1,100 @@
+import unittest
+import sys
+import os
+import threading
+import time
+import numpy as np
+
+# テスト対象のモジュールをインポートするためにパスを追加
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.board import Board
+from src.ai import AI
+from src.mcts import MCTS
+from src.ai_worker import AIWorker
+
+class TestAIWorker(unittest.TestCase):
+    """AIの次の一手のバックグラウンド計算のテスト"""
+    
+    def setUp(self):
+        """各テストの前に実行される"""
+        self.board = Board(size=9)
+        self.board.place_stone(4, 4, Board.BLACK)
+    
+    def test_result(self):
+        """計算した手を受け取れるかのテスト"""
+        ai = AI(self.board)
+        worker = AIWorker(ai)
+        try:
+            board = self.board.board.copy()
+            worker.submit(self.board)
+            self.assertTrue(worker.is_pending())
+            move = worker.result()
+        finally:
+            worker.shutdown()
+        
+        # 石を置ける手が返され、元の盤面とAIの盤面は変わらない
+        self.assertTrue(self.board.is_legal(move[0], move[1], Board.WHITE))
+        self.assertTrue(np.array_equal(self.board.board, board))
+        self.assertIs(ai.board, self.board)
+        self.assertFalse(worker.is_pending())
+    
+    def test_cancel(self):
+        """計算の中止のテスト"""
+        # 長い思考時間でも中止するとすぐに終わる
+        ai = MCTS(self.board, time_limit=60, seed=0)
+        worker = AIWorker(ai)
+        try:
+            worker.submit(self.board)
+            future = worker.future
+            worker.cancel()
+        finally:
+            worker.shutdown()
+        
+        self.assertTrue(future.done())
+        self.assertFalse(worker.is_pending())
+        self.assertFalse(worker.is_ready())
+        self.assertIs(ai.board, self.board)
+
+    def test_cancel_does_not_wait(self):
+        """計算の中止が計算の終了を待たず、計算中もAIの盤面を書き換えないかのテスト"""
+        ai = AI(self.board)
+        worker = AIWorker(ai)
+        started = threading.Event()
+        release = threading.Event()
+        seen = []
+        
+        def get_move(board, cancelled):
+            started.set()
+            seen.append((board is self.board, ai.board is self.board))
+            release.wait(5)
+            return (0, 0)
+        
+        ai.get_move = get_move
+        try:
+            worker.submit(self.board)
+            self.assertTrue(started.wait(5))
+            start = time.perf_counter()
+            worker.cancel()
+            self.assertLess(time.perf_counter() - start, 1)
+            self.assertFalse(worker.is_pending())
+        finally:
+            release.set()
+            worker.shutdown()
+        
+        # 計算は盤面の複製に対して行い、AIの盤面は元の盤面のまま
+        self.assertEqual(seen, [(False, True)])
+    
+    def test_get_move_with_board(self):
+        """盤面を渡して次の一手を計算してもAIの盤面が変わらないかのテスト"""
+        copied = self.board.copy()
+        copied.place_stone(3, 3, Board.WHITE)
+        
+        # どちらのAIも同じ引数（盤面, 中止のイベント）で呼び出せる
+        for ai in (AI(self.board), MCTS(self.board, playouts=20, seed=0)):
+            move = ai.get_move(copied, threading.Event())
+            self.assertIs(ai.board, self.board)
+            self.assertTrue(copied.is_legal(move[0], move[1], Board.WHITE))
+            self.assertNotEqual(move, (3, 3))
+
+if __name__ == '__main__':
+    unittest.main()
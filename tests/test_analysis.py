@@ -0,0 +1,168 @@
+import unittest
+import sys
+import os
+import numpy as np
+
+# テスト対象のモジュールをインポートするためにパスを追加
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src import analysis
+from src.board import Board
+from src.playout import PlayoutBoard
+
+class TestAnalysis(unittest.TestCase):
+    """盤面解析関数のテスト"""
+
+    def setUp(self):
+        """各テストの前に実行される"""
+        self.board = Board(size=9)
+
+    def test_distance_field(self):
+        """距離の計算が全探索と一致するかのテスト"""
+        stones = np.zeros((9, 9), dtype=bool)
+        stones[1, 2] = True
+        stones[6, 7] = True
+
+        distance = analysis.distance_field(stones, limit=3)
+        for y in range(9):
+            for x in range(9):
+                expected = min(abs(x - 2) + abs(y - 1), abs(x - 7) + abs(y - 6))
+                self.assertEqual(distance[y, x], min(expected, 4))
+
+    def test_distance_field_without_stones(self):
+        """石がない場合の距離のテスト"""
+        distance = analysis.distance_field(np.zeros((9, 9), dtype=bool))
+        self.assertTrue(np.all(distance == analysis.INFLUENCE_DISTANCE + 1))
+
+    def test_calculate_influence(self):
+        """影響圏の計算テスト"""
+        self.board.board[4, 4] = Board.BLACK
+        self.board.board[4, 6] = Board.WHITE
+
+        black_influence, white_influence = analysis.calculate_influence(self.board.board)
+
+        # 黒石の方が近い点は黒の影響圏
+        self.assertTrue(black_influence[4, 3])
+        # 白石の方が近い点は白の影響圏
+        self.assertTrue(white_influence[4, 7])
+        # 等距離の点はどちらの影響圏でもない
+        self.assertFalse(black_influence[4, 5])
+        self.assertFalse(white_influence[4, 5])
+        # 石のある点は影響圏ではない
+        self.assertFalse(black_influence[4, 4])
+
+    def test_calculate_influence_stacked(self):
+        """複数の盤面をまとめて計算した結果が1枚ずつの計算と一致するかのテスト"""
+        boards = np.zeros((3, 9, 9), dtype=int)
+        boards[0, 0, 0] = Board.BLACK
+        boards[1, 4, 4] = Board.WHITE
+        boards[2, 2, 2] = Board.BLACK
+        boards[2, 2, 5] = Board.WHITE
+
+        black_stack, white_stack = analysis.calculate_influence(boards)
+        for index in range(3):
+            black_influence, white_influence = analysis.calculate_influence(boards[index])
+            self.assertTrue(np.array_equal(black_stack[index], black_influence))
+            self.assertTrue(np.array_equal(white_stack[index], white_influence))
+
+    def test_label_empty_regions(self):
+        """空点の領域分けと接する色の記録のテスト"""
+        # 縦の黒石の壁と白石1つで盤面を分ける
+        for y in range(9):
+            self.board.board[y, 2] = Board.BLACK
+        self.board.board[4, 6] = Board.WHITE
+        self.board.sync_chains()
+
+        regions = analysis.label_empty_regions(self.board.bitboard)
+        self.assertEqual(len(regions), 2)
+
+        sizes = sorted((bin(region).count('1'), touches) for region, touches in regions)
+        self.assertEqual(sizes, [(18, Board.BLACK), (53, Board.BLACK | Board.WHITE)])
+
+    def test_calculate_territories(self):
+        """確定陣地の計算テスト"""
+        for x, y in [(1, 0), (0, 1), (1, 1)]:
+            self.board.board[y, x] = Board.BLACK
+        for x, y in [(7, 8), (8, 7), (7, 7)]:
+            self.board.board[y, x] = Board.WHITE
+
+        black_territory, white_territory = analysis.calculate_territories(self.board.board)
+        self.assertTrue(black_territory[0, 0])
+        self.assertEqual(np.sum(black_territory), 1)
+        self.assertTrue(white_territory[8, 8])
+        self.assertEqual(np.sum(white_territory), 1)
+
+    def random_position(self, seed, moves=40):
+        """乱数で石を置いた局面を作る"""
+        rng = np.random.default_rng(seed)
+        for i in range(moves):
+            color = Board.BLACK if i % 2 == 0 else Board.WHITE
+            x, y = (int(v) for v in rng.integers(0, 9, size=2))
+            self.board.place_stone(x, y, color)
+
+    def test_calculate_stone_safety(self):
+        """盤面全体の安全度が連ごとの安全度と一致するかのテスト"""
+        for seed in range(5):
+            self.board.reset()
+            self.random_position(seed)
+
+            stone_safety = analysis.calculate_stone_safety(self.board.board)
+            for y in range(9):
+                for x in range(9):
+                    group = self.board.find_group(x, y)
+                    expected = self.board.life_death_analyzer.calculate_group_safety(group)
+                    self.assertEqual(stone_safety[y, x], expected)
+
+    def test_true_eye_points(self):
+        """眼の判定がプレイアウト用の盤面の判定と一致するかのテスト"""
+        for seed in range(5):
+            self.board.reset()
+            self.random_position(seed, moves=70)
+
+            playout = PlayoutBoard.from_board(self.board, Board.BLACK, 3.5)
+            for color in (Board.BLACK, Board.WHITE):
+                eyes = analysis.true_eye_points(self.board.board, color)
+                for y in range(9):
+                    for x in range(9):
+                        expected = self.board.board[y, x] == Board.EMPTY and playout.is_eye(playout.point(x, y), color)
+                        self.assertEqual(eyes[y, x], expected)
+
+        # 隅の眼は斜めに相手の石があると眼とみなさない
+        self.board.reset()
+        self.board.board[0, 1] = Board.BLACK
+        self.board.board[1, 0] = Board.BLACK
+        self.assertTrue(analysis.true_eye_points(self.board.board, Board.BLACK)[0, 0])
+        self.assertFalse(analysis.true_eye_points(self.board.board, Board.WHITE)[0, 0])
+        self.board.board[1, 1] = Board.WHITE
+        self.assertFalse(analysis.true_eye_points(self.board.board, Board.BLACK)[0, 0])
+
+    def test_predict_capture_moves(self):
+        """取られるまでの手数が盤面を変更する判定と一致するかのテスト"""
+        for seed in range(5):
+            self.board.reset()
+            self.random_position(seed)
+
+            for y in range(9):
+                for x in range(9):
+                    expected = self.board.predict_capture_sequence(x, y, Board.BLACK)
+                    moves = analysis.predict_capture_moves(self.board.board, x, y, Board.BLACK, self.board.ko)
+                    self.assertEqual(moves, expected)
+
+    def test_preview_move_is_pure(self):
+        """プレビューの計算が盤面を変更しないかのテスト"""
+        self.random_position(0)
+        board = self.board.board.copy()
+        generation = self.board.generation
+
+        ys, xs = np.nonzero(self.board.board == Board.EMPTY)
+        preview = self.board.compute_preview(int(xs[0]), int(ys[0]), Board.BLACK)
+
+        self.assertTrue(np.array_equal(self.board.board, board))
+        self.assertEqual(self.board.generation, generation)
+        self.assertIsNone(self.board.preview_board)
+
+        # 結果は読み取り専用
+        self.assertFalse(preview.board.flags.writeable)
+        self.assertFalse(preview.stone_safety.flags.writeable)
+
+if __name__ == '__main__':
+    unittest.main()
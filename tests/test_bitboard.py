@@ -0,0 +1,80 @@
+import unittest
+import sys
+import os
+import numpy as np
+
+# テスト対象のモジュールをインポートするためにパスを追加
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.bitboard import BitBoard
+from src.board import Board
+
+class TestBitBoard(unittest.TestCase):
+    """ビットボードクラスのテスト"""
+
+    def setUp(self):
+        """各テストの前に実行される"""
+        self.bits = BitBoard(9)
+
+    def test_from_array(self):
+        """numpy配列からの変換テスト"""
+        board = np.zeros((9, 9), dtype=int)
+        board[2, 3] = Board.BLACK
+        board[8, 8] = Board.WHITE
+
+        bits = BitBoard.from_array(board)
+        self.assertEqual(bits.black, bits.bit(3, 2))
+        self.assertEqual(bits.white, bits.bit(8, 8))
+        self.assertEqual(bin(bits.empty).count('1'), 79)
+
+    def test_dilate_does_not_wrap(self):
+        """膨張が行をまたがないことのテスト"""
+        # 右端の点を膨張させても次の行の左端には広がらない
+        mask = self.bits.bit(8, 0)
+        self.assertEqual(sorted(self.bits.points(self.bits.adjacent(mask))), [(7, 0), (8, 1)])
+
+        # 左端の点を膨張させても前の行の右端には広がらない
+        mask = self.bits.bit(0, 4)
+        self.assertEqual(sorted(self.bits.points(self.bits.adjacent(mask))), [(0, 3), (0, 5), (1, 4)])
+
+    def test_flood(self):
+        """塗りつぶしのテスト"""
+        # 縦の壁で盤面を左右に分ける
+        for y in range(9):
+            self.bits.set_stone(3, y, Board.BLACK)
+
+        region = self.bits.flood(self.bits.bit(0, 0), self.bits.empty)
+        self.assertEqual(len(self.bits.points(region)), 27)
+        self.assertFalse(region & self.bits.bit(4, 0))
+
+    def test_to_array(self):
+        """bool配列への変換テスト"""
+        mask = self.bits.bit(1, 2) | self.bits.bit(7, 8)
+        array = self.bits.to_array(mask)
+
+        self.assertEqual(array.shape, (9, 9))
+        self.assertTrue(array[2, 1])
+        self.assertTrue(array[8, 7])
+        self.assertEqual(np.sum(array), 2)
+
+    def test_numpy_coordinates(self):
+        """numpyの整数の座標で64番目より後の点に石を置くテスト"""
+        x, y = np.int64(7), np.int64(8)
+        self.assertEqual(self.bits.bit(x, y), 1 << 79)
+        self.assertIs(type(self.bits.bit(x, y)), int)
+
+        board = Board(9)
+        board.place_stone(x, y, Board.BLACK)
+        board.place_stone(*np.argwhere(board.board == Board.EMPTY)[-1][::-1], Board.WHITE)
+        self.assertTrue(board.bitboard.to_array(board.bitboard.black)[8, 7])
+        self.assertTrue(board.bitboard.to_array(board.bitboard.white)[8, 8])
+        self.assertEqual(board.black_territory.shape, (9, 9))
+        self.assertFalse(board.is_valid_move(np.int64(8), np.int64(8)))
+
+    def test_to_mask(self):
+        """bool配列からの変換テスト"""
+        mask = self.bits.bit(0, 0) | self.bits.bit(1, 2) | self.bits.bit(8, 8)
+        self.assertEqual(self.bits.to_mask(self.bits.to_array(mask)), mask)
+        self.assertEqual(BitBoard.count(mask), 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,10 +2,12 @@ import unittest
 import sys
 import os
 import numpy as np
+from unittest.mock import patch
 
 # テスト対象のモジュールをインポートするためにパスを追加
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from src.board import Board
+from src.zobrist import hash_board
 
 class TestBoard(unittest.TestCase):
     """盤面クラスのテスト"""
@@ -188,6 +190,219 @@ class TestBoard(unittest.TestCase):
         # 呼吸点がないことを確認
         self.assertFalse(self.board.has_liberty(group))
     
+    def test_chain_tracking(self):
+        """連の情報が差分で更新されるかのテスト"""
+        # 離れた2つの石を置く
+        self.board.place_stone(1, 1, Board.BLACK)
+        self.board.place_stone(3, 1, Board.BLACK)
+        self.assertIsNot(self.board.get_chain(1, 1), self.board.get_chain(3, 1))
+        
+        # 間に石を置くと1つの連に統合される
+        self.board.place_stone(2, 1, Board.BLACK)
+        chain = self.board.get_chain(1, 1)
+        self.assertIs(chain, self.board.get_chain(3, 1))
+        self.assertEqual(chain.stones, {(1, 1), (2, 1), (3, 1)})
+        self.assertEqual(len(chain.liberties), 8)
+        
+        # 相手の石を置くと呼吸点が減る
+        self.board.place_stone(2, 0, Board.WHITE)
+        self.assertNotIn((2, 0), chain.liberties)
+        self.assertEqual(self.board.get_chain(2, 0).liberties, {(1, 0), (3, 0)})
+    
+    def test_chain_capture_restores_liberties(self):
+        """石を取ったときに隣接する連の呼吸点が戻るかのテスト"""
+        # 隅の白石をアタリにする
+        self.board.place_stone(0, 0, Board.WHITE)
+        self.board.place_stone(1, 0, Board.BLACK)
+        self.board.place_stone(0, 1, Board.BLACK)
+        
+        # 白石が取られ、黒の連に呼吸点が戻る
+        self.assertIsNone(self.board.get_chain(0, 0))
+        self.assertIn((0, 0), self.board.get_chain(1, 0).liberties)
+        self.assertIn((0, 0), self.board.get_chain(0, 1).liberties)
+        self.assertEqual(self.board.black_captures, 1)
+    
+    def test_chain_sync_after_direct_edit(self):
+        """盤面を直接書き換えた場合に連の情報が作り直されるかのテスト"""
+        self.board.board[4, 4] = Board.WHITE
+        self.board.board[4, 5] = Board.WHITE
+        
+        chain = self.board.get_chain(4, 4)
+        self.assertEqual(chain.stones, {(4, 4), (5, 4)})
+        self.assertEqual(len(chain.liberties), 6)
+    
+    def test_chain_sync_without_full_compare(self):
+        """連の情報を作り直すのが盤面を書き換えた・置き換えた場合だけかのテスト"""
+        self.board.place_stone(2, 2, Board.BLACK)
+        with patch.object(Board, 'rebuild_chains', autospec=True, side_effect=Board.rebuild_chains) as rebuild:
+            # 石を置く・元に戻す・連を引くだけでは作り直さない
+            record = self.board.play(3, 2, Board.WHITE)
+            self.board.get_chain(2, 2)
+            self.board.undo(record)
+            self.board.legal_moves(Board.WHITE)
+            self.assertEqual(rebuild.call_count, 0)
+            
+            # ビューへの代入
+            self.board.board[3][3] = Board.WHITE
+            self.assertEqual(self.board.get_chain(3, 3).color, Board.WHITE)
+            self.assertEqual(rebuild.call_count, 1)
+            
+            # 配列の演算での書き換え
+            np.multiply(self.board.board, 0, out=self.board.board)
+            self.assertIsNone(self.board.get_chain(2, 2))
+            self.assertEqual(rebuild.call_count, 2)
+            
+            # 配列の置き換え
+            array = np.zeros((9, 9), dtype=int)
+            array[0, 0] = Board.BLACK
+            self.board.board = array
+            self.assertEqual(len(self.board.get_chain(0, 0).liberties), 2)
+            self.assertEqual(rebuild.call_count, 3)
+            self.board.get_chain(0, 0)
+            self.assertEqual(rebuild.call_count, 3)
+        
+        # 置き換えた配列は複製されるため、元の配列を書き換えても盤面は変わらない
+        array[1, 1] = Board.BLACK
+        self.assertEqual(self.board.board[1, 1], Board.EMPTY)
+        self.assertTrue(self.board.is_valid_move(1, 1))
+        
+        # numpyの関数・flat・putでの書き換え
+        for edit in (lambda board: np.copyto(board, np.eye(9, dtype=int)),
+                     lambda board: np.put(board, [10], [Board.WHITE]),
+                     lambda board: board.put([20], [Board.WHITE]),
+                     lambda board: board.flat.__setitem__(30, Board.WHITE)):
+            self.board.reset()
+            self.board.legal_moves(Board.BLACK)
+            edit(self.board.board)
+            point = np.flatnonzero(self.board.board)[0]
+            x, y = int(point % 9), int(point // 9)
+            self.assertIsNotNone(self.board.get_chain(x, y))
+            self.assertFalse(self.board.is_valid_move(x, y))
+            self.assertEqual(self.board.hash, hash_board(self.board.board))
+        
+        # 計算結果は通常の配列・スカラーになる
+        self.assertIs(type(self.board.board == Board.BLACK), np.ndarray)
+        self.assertNotIsInstance(np.sum(self.board.board), np.ndarray)
+    
+    def test_zobrist_hash(self):
+        """局面のハッシュが差分で更新されるかのテスト"""
+        empty_hash = self.board.hash
+        
+        # 石を置くとハッシュが変わり、予測した値と一致する
+        expected = self.board.hash_after_move(4, 4, Board.BLACK)
+        self.board.place_stone(4, 4, Board.BLACK)
+        self.assertNotEqual(self.board.hash, empty_hash)
+        self.assertEqual(self.board.hash, expected)
+        
+        # 石を取った後も盤面全体から計算した値と一致する
+        self.board.place_stone(0, 0, Board.WHITE)
+        self.board.place_stone(1, 0, Board.BLACK)
+        self.board.place_stone(0, 1, Board.BLACK)
+        self.assertEqual(self.board.board[0, 0], Board.EMPTY)
+        self.assertEqual(self.board.hash, hash_board(self.board.board))
+        self.assertEqual(len(self.board.hash_history), 5)
+    
+    def test_superko(self):
+        """スーパーコウ（同じ局面の再現禁止）のテスト"""
+        board = Board(size=9, superko=True)
+        board.place_stone(4, 4, Board.BLACK)
+        
+        # 盤面を直接元に戻すと、同じ局面を再現する手は打てない
+        board.board[4, 4] = Board.EMPTY
+        self.assertFalse(board.is_valid_move(4, 4))
+        self.assertEqual(board.get_invalid_move_reason(4, 4), "同じ局面に戻るため置けません")
+        self.assertTrue(board.place_stone(4, 4, Board.BLACK))
+        
+        # スーパーコウを使わない盤面では打てる
+        self.board.place_stone(4, 4, Board.BLACK)
+        self.board.board[4, 4] = Board.EMPTY
+        self.assertTrue(self.board.is_valid_move(4, 4))
+    
+    def test_valid_move_color(self):
+        """石の色を指定した着手判定のテスト"""
+        self.board.place_stone(1, 0, Board.BLACK)
+        self.board.place_stone(0, 1, Board.BLACK)
+        
+        # 白石には自殺手、黒石には有効な手
+        self.assertTrue(self.board.is_valid_move(0, 0))
+        self.assertFalse(self.board.is_valid_move(0, 0, Board.WHITE))
+        self.assertEqual(self.board.get_invalid_move_reason(0, 0, Board.WHITE), "自殺手です")
+        
+        # 白石のプレビューは作られない
+        self.board.update_preview(0, 0, Board.WHITE)
+        self.assertIsNone(self.board.preview_board)
+        self.board.update_preview(2, 2, Board.WHITE)
+        self.assertEqual(self.board.preview_board[2, 2], Board.WHITE)
+    
+    def test_play_and_undo(self):
+        """探索用の着手と取り消しのテスト"""
+        # 白石をアタリにしておく
+        self.board.place_stone(0, 0, Board.WHITE)
+        self.board.place_stone(1, 0, Board.BLACK)
+        board_before = self.board.board.copy()
+        hash_before = self.board.hash
+        liberties_before = set(self.board.get_chain(1, 0).liberties)
+        
+        # 石を取る手を打つ
+        record = self.board.play(0, 1, Board.BLACK)
+        self.assertIsNotNone(record)
+        self.assertEqual(record.captured, [(0, 0)])
+        self.assertEqual(self.board.board[0, 0], Board.EMPTY)
+        self.assertEqual(self.board.black_captures, 1)
+        self.assertEqual(self.board.ko, (0, 0))
+        
+        # 元に戻すと盤面・連・ハッシュ・コウ・取った石の数が戻る
+        self.board.undo(record)
+        self.assertTrue(np.array_equal(self.board.board, board_before))
+        self.assertEqual(self.board.hash, hash_before)
+        self.assertEqual(self.board.get_chain(1, 0).liberties, liberties_before)
+        self.assertEqual(self.board.get_chain(0, 0).color, Board.WHITE)
+        self.assertEqual(self.board.black_captures, 0)
+        self.assertIsNone(self.board.ko)
+        self.assertEqual(len(self.board.hash_history), 3)
+    
+    def test_play_illegal(self):
+        """置けない手の場合にNoneが返るかのテスト"""
+        self.board.place_stone(1, 0, Board.WHITE)
+        self.board.place_stone(0, 1, Board.WHITE)
+        
+        # 自殺手・既に石がある場所には置けない
+        self.assertIsNone(self.board.play(0, 0, Board.BLACK))
+        self.assertIsNone(self.board.play(1, 0, Board.BLACK))
+        
+        # 白なら置ける
+        self.assertIsNotNone(self.board.play(0, 0, Board.WHITE))
+    
+    def test_legal_moves(self):
+        """合法手の一括判定のテスト"""
+        # 空の盤面ではすべての点に置ける
+        self.assertEqual(np.sum(self.board.legal_moves(Board.WHITE)), 81)
+        
+        # 黒で隅の点を囲む
+        self.board.place_stone(1, 0, Board.BLACK)
+        self.board.place_stone(0, 1, Board.BLACK)
+        
+        # 白にとっては自殺手、黒にとっては置ける点
+        self.assertFalse(self.board.legal_moves(Board.WHITE)[0, 0])
+        self.assertTrue(self.board.legal_moves(Board.BLACK)[0, 0])
+        self.assertFalse(self.board.legal_moves(Board.WHITE)[0, 1])
+        
+        # 黒石をアタリにすると、白は取る手として置けるようになる
+        self.board.place_stone(2, 0, Board.WHITE)
+        self.board.place_stone(1, 1, Board.WHITE)
+        self.board.place_stone(0, 2, Board.WHITE)
+        legal = self.board.legal_moves(Board.WHITE)
+        self.assertTrue(legal[0, 0])
+        
+        # 個別の判定と一致する
+        for y in range(self.board.size):
+            for x in range(self.board.size):
+                self.assertEqual(legal[y, x], self.board.is_legal(x, y, Board.WHITE))
+        
+        # コウの点には置けない
+        self.board.ko = (4, 4)
+        self.assertFalse(self.board.legal_moves(Board.WHITE)[4, 4])
+    
     def test_calculate_territories(self):
         """陣地計算のテスト"""
         # 黒の陣地を作る
@@ -242,6 +457,53 @@ class TestBoard(unittest.TestCase):
                 if abs(x - 0) + abs(y - 0) <= 2 and (x, y) != (0, 0):
                     self.assertTrue(self.board.white_influence[y, x], f"({x}, {y}) should be in white influence")
     
+    def test_lazy_territories(self):
+        """陣地情報が局面が変わったときだけ再計算されるかのテスト"""
+        generation = self.board.generation
+        self.board.place_stone(4, 4, Board.BLACK)
+        self.assertGreater(self.board.generation, generation)
+        
+        # 局面が変わらなければ同じ計算結果を使い回す
+        influence = self.board.black_influence
+        self.assertIs(self.board.black_influence, influence)
+        self.assertTrue(influence[5, 4])
+        
+        # 石を置くと次に参照したときに再計算される
+        self.board.place_stone(4, 6, Board.WHITE)
+        self.assertFalse(self.board.black_influence[5, 4])
+        
+        # 盤面を直接書き換えた場合も再計算される
+        self.board.board[0, 0] = Board.WHITE
+        self.assertTrue(self.board.white_influence[0, 1])
+    
+    def test_incremental_territories(self):
+        """差分更新した陣地情報が全体の再計算と一致するかのテスト"""
+        for x, y in [(1, 0), (0, 1), (1, 1), (6, 6)]:
+            self.board.place_stone(x, y, Board.BLACK)
+        self.board.update_territories()
+        
+        # 石を置いて取った後の差分更新
+        self.board.place_stone(7, 6, Board.WHITE)
+        self.board.place_stone(6, 5, Board.WHITE)
+        self.board.place_stone(5, 6, Board.WHITE)
+        record = self.board.play(6, 7, Board.WHITE)
+        self.assertEqual(record.captured, [(6, 6)])
+        self.board.update_territories()
+        incremental = [self.board.black_territory.copy(), self.board.white_territory.copy(),
+                       self.board.black_influence.copy(), self.board.white_influence.copy()]
+        
+        self.board.update_territories(incremental=False)
+        full = [self.board.black_territory, self.board.white_territory,
+                self.board.black_influence, self.board.white_influence]
+        for patched, expected in zip(incremental, full):
+            self.assertTrue(np.array_equal(patched, expected))
+        self.assertTrue(self.board.black_territory[0, 0])
+        
+        # 手を戻した後の差分更新
+        self.board.undo(record)
+        self.assertEqual(self.board.board[6, 6], Board.BLACK)
+        self.assertFalse(self.board.white_influence[7, 6])
+    
     def test_calculate_score(self):
         """得点計算のテスト"""
         # 黒の陣地を作る
@@ -309,6 +571,45 @@ class TestBoard(unittest.TestCase):
         # プレビュー盤面がリセットされていることを確認
         self.assertIsNone(self.board.preview_board)
     
+    def test_preview_cache(self):
+        """同じ局面・同じ点のプレビューが使い回されるかのテスト"""
+        self.board.place_stone(4, 4, Board.BLACK)
+        self.board.update_preview(2, 2)
+        preview_board = self.board.preview_board
+        
+        # 同じ点なら前回の計算結果を使う
+        self.board.update_preview(3, 3)
+        self.board.update_preview(2, 2)
+        self.assertIs(self.board.preview_board, preview_board)
+        
+        # 局面が変わると計算し直す
+        self.board.place_stone(6, 6, Board.WHITE)
+        self.board.update_preview(2, 2)
+        self.assertIsNot(self.board.preview_board, preview_board)
+        self.assertEqual(self.board.preview_board[6, 6], Board.WHITE)
+        
+        # 保持する数を超えると古いものから捨てる
+        for y in range(self.board.size):
+            for x in range(self.board.size):
+                self.board.get_preview(x, y, Board.WHITE)
+        self.assertLessEqual(len(self.board.preview_cache), Board.PREVIEW_CACHE_SIZE)
+    
+    def test_copy(self):
+        """局面の複製のテスト"""
+        self.board.place_stone(4, 4, Board.BLACK)
+        self.board.place_stone(4, 5, Board.WHITE)
+        copied = self.board.copy()
+        
+        # 同じ局面・同じハッシュになる
+        self.assertTrue(np.array_equal(copied.board, self.board.board))
+        self.assertEqual(copied.hash, self.board.hash)
+        self.assertEqual(copied.hash_history, self.board.hash_history)
+        
+        # 複製した盤面に石を置いても元の盤面は変わらない
+        copied.place_stone(2, 2, Board.BLACK)
+        self.assertEqual(self.board.board[2, 2], Board.EMPTY)
+        self.assertNotEqual(copied.hash, self.board.hash)
+    
     def test_get_invalid_move_reason(self):
         """禁手の理由取得のテスト"""
         # 盤外
@@ -355,6 +656,21 @@ class TestBoard(unittest.TestCase):
         # 有効な手
         reason = self.board.get_invalid_move_reason(0, 2)
         self.assertEqual(reason, "有効な手です")
+    
+    def test_invalid_move_reason_with_preview(self):
+        """プレビューの有無で禁手の理由が変わらないかのテスト"""
+        self.board.place_stone(1, 1, Board.BLACK)
+        self.board.place_stone(2, 1, Board.BLACK)
+        self.board.place_stone(1, 2, Board.BLACK)
+        self.board.place_stone(2, 2, Board.BLACK)
+        
+        # 白石は呼吸点が2つになるため2手で取られうる
+        reason = self.board.get_invalid_move_reason(0, 1, Board.WHITE)
+        self.assertEqual(reason, "2手で取られる可能性があります")
+        
+        self.board.get_preview(0, 1, Board.WHITE)
+        self.assertIsNotNone(self.board.cached_preview(0, 1, Board.WHITE))
+        self.assertEqual(self.board.get_invalid_move_reason(0, 1, Board.WHITE), reason)
 
 if __name__ == '__main__':
     unittest.main()
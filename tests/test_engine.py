@@ -0,0 +1,76 @@
+import unittest
+import sys
+import os
+
+# テスト対象のモジュールをインポートするためにパスを追加
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.board import Board
+from src.engine import GameEngine
+
+class TestGameEngine(unittest.TestCase):
+    """画面を持たない対局の進行のテスト"""
+    
+    def setUp(self):
+        """各テストの前に実行される"""
+        self.engine = GameEngine(Board(size=5))
+    
+    def test_play(self):
+        """石を置くと手番が交代するかのテスト"""
+        self.assertEqual(self.engine.to_play, Board.BLACK)
+        self.assertTrue(self.engine.play(2, 2))
+        self.assertEqual(self.engine.board.board[2, 2], Board.BLACK)
+        self.assertEqual(self.engine.to_play, Board.WHITE)
+        
+        # 置けない点には置けず、手番も変わらない
+        self.assertFalse(self.engine.play(2, 2))
+        self.assertEqual(self.engine.to_play, Board.WHITE)
+        
+        self.assertTrue(self.engine.play(1, 1))
+        self.assertEqual(self.engine.history, [(Board.BLACK, (2, 2)), (Board.WHITE, (1, 1))])
+        self.assertEqual(self.engine.move_count, 2)
+    
+    def test_pass(self):
+        """連続パスによる終局と得点計算のテスト"""
+        self.engine.play(2, 2)
+        self.assertFalse(self.engine.pass_move())
+        self.assertEqual(self.engine.consecutive_passes, 1)
+        
+        # 石を置くと連続パス数は0に戻る
+        self.engine.play(1, 1)
+        self.assertEqual(self.engine.consecutive_passes, 0)
+        self.assertIsNone(self.engine.winner)
+        
+        self.assertFalse(self.engine.pass_move())
+        self.assertTrue(self.engine.pass_move())
+        self.assertTrue(self.engine.finished)
+        self.assertEqual(self.engine.black_score, self.engine.board.calculate_score(Board.BLACK))
+        self.assertEqual(self.engine.white_score, self.engine.board.calculate_score(Board.WHITE) + 3.5)
+        expected = Board.BLACK if self.engine.black_score > self.engine.white_score else Board.WHITE
+        self.assertEqual(self.engine.winner, expected)
+        
+        # 終局後は石を置けない
+        self.assertFalse(self.engine.play(0, 0))
+    
+    def test_resign(self):
+        """投了のテスト"""
+        self.engine.play(2, 2)
+        self.engine.resign(Board.WHITE)
+        self.assertTrue(self.engine.finished)
+        self.assertEqual(self.engine.winner, Board.BLACK)
+    
+    def test_reset(self):
+        """対局のやり直しのテスト"""
+        self.engine.play(2, 2)
+        self.engine.pass_move()
+        self.engine.pass_move()
+        self.engine.reset()
+        
+        self.assertEqual(self.engine.to_play, Board.BLACK)
+        self.assertEqual(self.engine.history, [])
+        self.assertEqual(self.engine.consecutive_passes, 0)
+        self.assertFalse(self.engine.finished)
+        self.assertIsNone(self.engine.winner)
+        self.assertEqual(self.engine.board.board[2, 2], Board.EMPTY)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -131,6 +131,22 @@ class TestLifeDeath(unittest.TestCase):
         moves = self.board.predict_capture_sequence(0, 1, Board.WHITE)
         self.assertEqual(moves, -1)
     
+    def test_predict_capture_sequence_is_read_only(self):
+        """取られるまでの手数の予測が対局中の盤面を変更しないかのテスト"""
+        self.board.place_stone(4, 4, Board.BLACK)
+        self.board.place_stone(3, 4, Board.WHITE)
+        self.board.place_stone(5, 4, Board.WHITE)
+        board = self.board.board.copy()
+        legal = self.board.legal_moves(Board.WHITE)
+        generation = self.board.generation
+        
+        # 相手の石を取る手でも盤面・局面の世代・合法手のキャッシュは変わらない
+        self.board.predict_capture_sequence(4, 3, Board.WHITE)
+        self.board.predict_capture_sequence(4, 5, Board.WHITE)
+        self.assertTrue(np.array_equal(self.board.board, board))
+        self.assertEqual(self.board.generation, generation)
+        self.assertIs(self.board.legal_moves(Board.WHITE), legal)
+    
     def test_is_alive(self):
         """石グループが生きているかどうかを判定するテスト"""
         # 2つの眼を持つ生きている形を作る
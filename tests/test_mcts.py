@@ -0,0 +1,113 @@
+import unittest
+import sys
+import os
+import time
+
+# テスト対象のモジュールをインポートするためにパスを追加
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.board import Board
+from src.mcts import MCTS
+
+class TestMCTS(unittest.TestCase):
+    """モンテカルロ木探索のテスト"""
+    
+    def setUp(self):
+        """各テストの前に実行される"""
+        self.board = Board(size=9)
+        self.ai = MCTS(self.board, playouts=200, seed=0)
+    
+    def test_get_move(self):
+        """次の一手の決定テスト"""
+        move = self.ai.get_move()
+        
+        # 有効な手が返されることを確認
+        self.assertIsNotNone(move)
+        self.assertTrue(self.board.is_legal(move[0], move[1], Board.WHITE))
+        
+        # プレイアウトの回数と速度が記録される
+        self.assertEqual(self.ai.last_stats['playouts'], 200)
+        self.assertGreater(self.ai.last_stats['playouts_per_second'], 0)
+    
+    def test_capture(self):
+        """取れる石を取る手を選ぶかのテスト"""
+        # 5路盤で黒の2子がアタリ（取らないと黒の陣地が大きい）
+        board = Board(size=5)
+        for x, y in [(1, 1), (2, 1), (0, 3), (1, 3), (2, 3), (3, 3), (4, 3)]:
+            board.place_stone(x, y, Board.BLACK)
+        for x, y in [(1, 0), (2, 0), (0, 1), (3, 1), (1, 2)]:
+            board.place_stone(x, y, Board.WHITE)
+        
+        ai = MCTS(board, playouts=500, seed=0)
+        self.assertEqual(ai.get_move(), (2, 2))
+    
+    def test_tree_reuse(self):
+        """探索木の引き継ぎのテスト"""
+        move = self.ai.get_move()
+        self.board.place_stone(move[0], move[1], Board.WHITE)
+        self.assertEqual(self.ai.last_stats['reused_playouts'], 0)
+        
+        # 探索済みの黒の応手を打つと、その先の部分木が引き継がれる
+        node, after = self.ai.tree
+        reply = max(node.children, key=lambda child: child.visits)
+        visits = reply.visits
+        self.board.place_stone(*after.coordinates(reply.move), Board.BLACK)
+        move = self.ai.get_move()
+        
+        self.assertGreater(visits, 0)
+        self.assertEqual(self.ai.last_stats['reused_playouts'], visits)
+        self.assertEqual(reply.visits, visits + 200)
+        self.assertTrue(self.board.is_legal(move[0], move[1], Board.WHITE))
+        
+        # 探索していない局面では引き継がない
+        self.board.reset()
+        self.ai.get_move()
+        self.assertEqual(self.ai.last_stats['reused_playouts'], 0)
+    
+    def test_ponder(self):
+        """相手の手番の間の先読みのテスト"""
+        pondering = self.ai.ponder()
+        root, after = self.ai.tree
+        deadline = time.time() + 5
+        while root.visits < 50 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(pondering.is_running())
+        self.ai.stop_pondering()
+        self.assertFalse(pondering.is_running())
+        self.assertIsNone(self.ai.pondering)
+        
+        # 先読みした黒の手を打つと、その先の探索木が引き継がれる
+        reply = max(root.children, key=lambda child: child.visits)
+        visits = reply.visits
+        self.board.place_stone(*after.coordinates(reply.move), Board.BLACK)
+        move = self.ai.get_move()
+        
+        self.assertGreater(visits, 0)
+        self.assertEqual(self.ai.last_stats['reused_playouts'], visits)
+        self.assertTrue(self.board.is_legal(move[0], move[1], Board.WHITE))
+        self.ai.close()
+    
+    def test_parallel(self):
+        """ルート並列化のテスト"""
+        self.board.place_stone(4, 4, Board.BLACK)
+        ai = MCTS(self.board, playouts=200, seed=0, workers=2)
+        try:
+            move = ai.get_move()
+        finally:
+            ai.close()
+        
+        # 各プロセスのプレイアウトが合算される
+        self.assertTrue(self.board.is_legal(move[0], move[1], Board.WHITE))
+        self.assertEqual(ai.last_stats['playouts'], 200)
+    
+    def test_pass_without_moves(self):
+        """有効な手がない場合のパスのテスト"""
+        # 白の眼しか空点がない盤面
+        for y in range(9):
+            for x in range(9):
+                if (x, y) not in [(0, 0), (8, 8)]:
+                    self.board.board[y, x] = Board.WHITE
+        
+        self.assertIsNone(self.ai.get_move())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+import unittest
+import sys
+import os
+import random
+import pickle
+import numpy as np
+
+# テスト対象のモジュールをインポートするためにパスを追加
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.board import Board
+from src.playout import PlayoutBoard, PASS
+
+class TestPlayoutBoard(unittest.TestCase):
+    """プレイアウト用の盤面のテスト"""
+    
+    def setUp(self):
+        """各テストの前に実行される"""
+        self.board = PlayoutBoard(size=9)
+    
+    def test_init(self):
+        """初期化のテスト"""
+        self.assertEqual(len(self.board.empty), 81)
+        self.assertEqual(self.board.to_play, Board.BLACK)
+        self.assertEqual(self.board.coordinates(self.board.point(3, 5)), (3, 5))
+    
+    def test_capture(self):
+        """石を取るテスト"""
+        point = self.board.point
+        self.board.play(point(1, 1), Board.BLACK)
+        for x, y in [(0, 1), (1, 0), (2, 1)]:
+            self.board.play(point(x, y), Board.WHITE)
+        self.board.play(point(1, 2), Board.WHITE)
+        
+        self.assertEqual(self.board.cells[point(1, 1)], Board.EMPTY)
+        self.assertIn(point(1, 1), self.board.empty)
+        self.assertEqual(len(self.board.empty), 81 - 4)
+    
+    def test_suicide_and_ko(self):
+        """自殺手とコウのテスト"""
+        point = self.board.point
+        for x, y in [(1, 0), (0, 1), (2, 1), (1, 2)]:
+            self.board.play(point(x, y), Board.BLACK)
+        
+        # 自殺手は置けない
+        self.assertFalse(self.board.play(point(1, 1), Board.WHITE))
+        self.assertEqual(self.board.cells[point(1, 1)], Board.EMPTY)
+        
+        # コウの形を作って取る
+        for x, y in [(2, 0), (3, 1), (2, 2)]:
+            self.board.play(point(x, y), Board.WHITE)
+        self.assertTrue(self.board.play(point(1, 1), Board.WHITE))
+        self.assertEqual(self.board.cells[point(2, 1)], Board.EMPTY)
+        self.assertEqual(self.board.ko, point(2, 1))
+        
+        # すぐに取り返すことはできない
+        self.assertFalse(self.board.play(point(2, 1), Board.BLACK))
+    
+    def test_is_eye(self):
+        """眼の判定のテスト"""
+        point = self.board.point
+        for x, y in [(1, 0), (0, 1)]:
+            self.board.play(point(x, y), Board.BLACK)
+        self.assertTrue(self.board.is_eye(point(0, 0), Board.BLACK))
+        self.assertFalse(self.board.is_eye(point(0, 0), Board.WHITE))
+        
+        # 辺の眼は斜めに相手の石があると眼ではない
+        self.board.play(point(1, 1), Board.WHITE)
+        self.assertFalse(self.board.is_eye(point(0, 0), Board.BLACK))
+    
+    def test_playout(self):
+        """プレイアウトが終局まで進み、得点が計算できるかのテスト"""
+        rng = random.Random(0)
+        for _ in range(5):
+            board = self.board.copy()
+            board.playout(rng)
+            self.assertEqual(board.passes, 2)
+            self.assertIn(board.winner(), (Board.BLACK, Board.WHITE))
+            
+            # 複製元の盤面は変わらない
+            self.assertEqual(len(self.board.empty), 81)
+    
+    def test_score(self):
+        """得点計算のテスト"""
+        point = self.board.point
+        
+        # 縦の壁で盤面を分ける（黒: 4列, 白: 5列）
+        for y in range(9):
+            self.board.play(point(3, y), Board.BLACK)
+            self.board.play(point(4, y), Board.WHITE)
+        for y in range(9):
+            for x in range(9):
+                if x not in (3, 4) and (x + y) % 2 == 0:
+                    self.board.play(point(x, y), Board.BLACK if x < 3 else Board.WHITE)
+        
+        # 石の数 + 上下左右が自分の石の空点の数
+        self.assertEqual(self.board.score(), 36 - 45 - self.board.komi)
+        self.assertEqual(self.board.winner(), Board.WHITE)
+    
+    def test_from_board(self):
+        """Boardの局面からの作成テスト"""
+        board = Board(size=9)
+        board.place_stone(2, 3, Board.BLACK)
+        board.place_stone(4, 4, Board.WHITE)
+        
+        playout = PlayoutBoard.from_board(board, Board.BLACK)
+        self.assertEqual(playout.cells[playout.point(2, 3)], Board.BLACK)
+        self.assertEqual(playout.cells[playout.point(4, 4)], Board.WHITE)
+        self.assertEqual(len(playout.empty), 79)
+        self.assertEqual(playout.to_play, Board.BLACK)
+
+    def test_matches_board(self):
+        """乱数で打ち進めたときの石の配置と合法手がBoardと一致するかのテスト"""
+        rng = random.Random(1)
+        board = Board(size=9)
+        for _ in range(150):
+            color = self.board.to_play
+            
+            # 合法手の判定が一致する
+            legal = board.legal_moves(color)
+            for y in range(9):
+                for x in range(9):
+                    point = self.board.point(x, y)
+                    self.assertEqual(self.board.is_legal(point, color), bool(legal[y, x]))
+            
+            move = self.board.random_move(rng)
+            self.board.play(move)
+            if move != PASS:
+                board.place_stone(*self.board.coordinates(move), color)
+            
+            self.assertTrue(np.array_equal(self.board.to_board().board, board.board))
+            self.assertEqual(self.board.black_captures, board.black_captures)
+            self.assertEqual(self.board.white_captures, board.white_captures)
+    
+    def test_round_trip(self):
+        """Boardとの相互変換のテスト"""
+        rng = random.Random(2)
+        self.board.playout(rng, max_moves=60)
+        
+        board = self.board.to_board()
+        restored = PlayoutBoard.from_board(board, self.board.to_play)
+        self.assertEqual(restored.cells, self.board.cells)
+        self.assertEqual(sorted(restored.empty), sorted(self.board.empty))
+        self.assertEqual(restored.ko, self.board.ko)
+        
+        # 連の情報も同じになる
+        for point in self.board.points:
+            if self.board.cells[point] != Board.EMPTY:
+                self.assertEqual(sorted(restored.stones(point)), sorted(self.board.stones(point)))
+    
+    def test_position(self):
+        """プロセス間で受け渡す局面への変換のテスト"""
+        self.board.playout(random.Random(4), max_moves=60)
+        
+        position = pickle.loads(pickle.dumps(self.board.to_position()))
+        restored = PlayoutBoard.from_position(position)
+        self.assertEqual(restored.cells, self.board.cells)
+        self.assertEqual(restored.to_play, self.board.to_play)
+        self.assertEqual(restored.ko, self.board.ko)
+        for point in self.board.points:
+            if self.board.cells[point] != Board.EMPTY:
+                self.assertEqual(restored.liberties[restored.chain[point]],
+                                 self.board.liberties[self.board.chain[point]])
+    
+    def test_reset(self):
+        """リセットのテスト"""
+        self.board.playout(random.Random(3))
+        self.board.reset()
+        self.assertEqual(len(self.board.empty), 81)
+        self.assertEqual(self.board.passes, 0)
+        self.assertTrue(all(self.board.cells[point] == Board.EMPTY for point in self.board.points))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import sys
+import os
+import numpy as np
+
+# テスト対象のモジュールをインポートするためにパスを追加
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.board import Board
+from src.preview_worker import PreviewWorker
+
+class TestPreviewWorker(unittest.TestCase):
+    """プレビューの先読みのテスト"""
+    
+    def setUp(self):
+        """各テストの前に実行される"""
+        self.board = Board(size=9)
+        self.worker = PreviewWorker(self.board)
+    
+    def tearDown(self):
+        """各テストの後に実行される"""
+        self.worker.shutdown()
+    
+    def test_precompute_all_legal_points(self):
+        """石を置けるすべての点のプレビューが先読みされるかのテスト"""
+        self.board.place_stone(4, 4, Board.BLACK)
+        self.board.place_stone(4, 5, Board.WHITE)
+        board = self.board.board.copy()
+        
+        self.worker.request((0, 0))
+        self.worker.future.result()
+        
+        # 元の盤面は変更されない
+        self.assertTrue(np.array_equal(self.board.board, board))
+        
+        legal = self.board.legal_moves(Board.BLACK)
+        for y in range(self.board.size):
+            for x in range(self.board.size):
+                preview = self.board.cached_preview(x, y, Board.BLACK)
+                self.assertEqual(preview is not None, bool(legal[y, x]))
+        
+        # 先読みした結果はその場で計算した結果と一致する
+        preview = self.board.cached_preview(3, 5, Board.BLACK)
+        expected = self.board.copy().compute_preview(3, 5, Board.BLACK)
+        self.assertTrue(np.array_equal(preview.board, expected.board))
+        self.assertTrue(np.array_equal(preview.black_influence, expected.black_influence))
+        self.assertTrue(np.array_equal(preview.stone_safety, expected.stone_safety))
+        self.assertEqual(preview.capture_moves, expected.capture_moves)
+        
+        # 先読みした結果がホバー時に使われる
+        self.board.update_preview(3, 5)
+        self.assertIs(self.board.preview_board, preview.board)
+    
+    def test_request_same_position(self):
+        """同じ局面では先読みし直さないかのテスト"""
+        self.worker.request()
+        future = self.worker.future
+        self.worker.request((1, 1))
+        self.assertIs(self.worker.future, future)
+        
+        # 局面が変わると先読みし直す
+        future.result()
+        self.board.place_stone(2, 2, Board.BLACK)
+        self.worker.request()
+        self.assertIsNot(self.worker.future, future)
+    
+    def test_cancel(self):
+        """先読みの中止のテスト"""
+        self.worker.request()
+        future = self.worker.future
+        self.worker.cancel()
+        future.result()
+        self.assertFalse(self.worker.is_running())
+        
+        # 中止した後は同じ局面でも先読みし直す
+        self.worker.request()
+        self.assertIsNot(self.worker.future, future)
+
+if __name__ == '__main__':
+    unittest.main()
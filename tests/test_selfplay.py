@@ -0,0 +1,101 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+import contextlib
+import io
+
+# テスト対象のモジュールをインポートするためにパスを追加
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.board import Board
+from src.ai import AI
+from src.mcts import MCTS
+from src.selfplay import GameJob, parse_engine, make_player, play_game, run_games, summarize, main
+
+class TestSelfPlay(unittest.TestCase):
+    """自己対局のテスト"""
+    
+    def test_parse_engine(self):
+        """AIの種類の指定の解析テスト"""
+        self.assertEqual(parse_engine('heuristic'), ('heuristic', None))
+        self.assertEqual(parse_engine('mcts:200'), ('mcts', 200))
+        with self.assertRaises(ValueError):
+            parse_engine('minimax')
+        with self.assertRaises(ValueError):
+            parse_engine('mcts:many')
+        
+        board = Board(size=5)
+        player = make_player('heuristic:0', board, Board.BLACK, 3.5, 0)
+        self.assertIsInstance(player, AI)
+        self.assertIsNone(player.top_k)
+        self.assertEqual(player.color, Board.BLACK)
+        player = make_player('mcts:50', board, Board.WHITE, 0.5, 0)
+        self.assertIsInstance(player, MCTS)
+        self.assertEqual(player.playouts, 50)
+        self.assertEqual(player.komi, 0.5)
+    
+    def test_play_game(self):
+        """1局を最後まで打つテスト"""
+        job = GameJob(0, 5, 'heuristic', 'mcts:20', 3.5, 0, 0.1, 50)
+        result = play_game(job)
+        
+        self.assertIn(result['winner'], ('black', 'white'))
+        self.assertLessEqual(result['moves'], 50)
+        self.assertEqual(len(result['black_move_seconds']) + len(result['white_move_seconds']), result['moves'])
+        expected = 'black' if result['black_score'] > result['white_score'] else 'white'
+        self.assertEqual(result['winner'], expected)
+        
+        # 同じ乱数の種では同じ対局になる
+        again = play_game(job)
+        self.assertEqual((again['moves'], again['black_score']), (result['moves'], result['black_score']))
+    
+    def test_run_games(self):
+        """並列の対局と集計のテスト"""
+        jobs = [GameJob(game, 5, 'heuristic', 'heuristic', 3.5, game, 0.1, 30) for game in range(3)]
+        results = list(run_games(jobs, 2))
+        self.assertEqual(sorted(result['game'] for result in results), [0, 1, 2])
+        
+        summary = summarize(results, 1.0)
+        self.assertEqual(summary['games'], 3)
+        self.assertEqual(summary['moves'], sum(result['moves'] for result in results))
+        self.assertAlmostEqual(sum(summary['color_win_rates'].values()), 1.0)
+        seconds = [t for result in results for t in result['black_move_seconds'] + result['white_move_seconds']]
+        self.assertAlmostEqual(summary['mean_move_seconds'], sum(seconds) / len(seconds))
+        self.assertLessEqual(summary['p99_move_seconds'], max(seconds))
+        
+        # 同じAI同士の対局はAIごとの勝率に数えない
+        self.assertEqual(summary['engine_win_rates'], {})
+        self.assertEqual(summary['truncated_games'], sum(result['truncated'] for result in results))
+        
+        # 異なるAI同士の対局だけでAIごとの勝率を求める
+        mixed = [dict(results[0], black='heuristic', white='mcts:20', winner='black'),
+                 dict(results[1], black='mcts:20', white='heuristic', winner='black'),
+                 dict(results[2], black='mcts:20', white='heuristic', winner='white')]
+        summary = summarize(results + mixed, 1.0)
+        self.assertAlmostEqual(summary['engine_win_rates']['heuristic'], 2 / 3)
+        self.assertAlmostEqual(summary['engine_win_rates']['mcts:20'], 1 / 3)
+    
+    def test_game_ends_by_passes(self):
+        """評価関数のAI同士の対局が最大手数より前に連続パスで終わるかのテスト"""
+        for seed in range(3):
+            result = play_game(GameJob(0, 5, 'heuristic', 'heuristic', 3.5, seed, 0.1, 75))
+            self.assertFalse(result['truncated'])
+            self.assertLess(result['moves'], 75)
+    
+    def test_main(self):
+        """結果がJSONLファイルに書き出されるかのテスト"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'selfplay.jsonl')
+            with contextlib.redirect_stdout(io.StringIO()):
+                summary = main(['--games', '2', '--size', '5', '--workers', '1',
+                                '--max-moves', '20', '--output', path])
+            with open(path, encoding='utf-8') as f:
+                lines = [json.loads(line) for line in f]
+        
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(summary['games'], 2)
+        self.assertEqual(lines[0]['black'], 'heuristic')
+
+if __name__ == '__main__':
+    unittest.main()
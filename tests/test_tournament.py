@@ -0,0 +1,84 @@
+import unittest
+import sys
+import os
+import tempfile
+import contextlib
+import io
+import numpy as np
+
+# テスト対象のモジュールをインポートするためにパスを追加
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.tournament import schedule, win_matrix, elo_ratings, elo_intervals, think_times, main
+
+def make_result(black, white, winner, seconds=0.01):
+    """集計のテスト用の対局の結果を作る"""
+    return {'black': black, 'white': white, 'winner': winner,
+            'black_move_seconds': [seconds], 'white_move_seconds': [seconds * 2]}
+
+class TestTournament(unittest.TestCase):
+    """総当たり戦のテスト"""
+    
+    def test_schedule(self):
+        """対局の組み方のテスト"""
+        jobs = schedule(['a', 'b', 'c'], 4, 9, 3.5, 0, 0.1, 100)
+        
+        # 3つの組み合わせを4局ずつ、先後を交互に打つ
+        self.assertEqual(len(jobs), 12)
+        self.assertEqual([job.game for job in jobs], list(range(12)))
+        pairs = [(job.black, job.white) for job in jobs[:4]]
+        self.assertEqual(pairs, [('a', 'b'), ('b', 'a'), ('a', 'b'), ('b', 'a')])
+        self.assertEqual(len({job.seed for job in jobs}), 12)
+    
+    def test_elo_ratings(self):
+        """Eloレーティングの計算テスト"""
+        engines = ['a', 'b', 'c']
+        results = ([make_result('a', 'b', 'black')] * 6 + [make_result('b', 'a', 'white')] * 2
+                   + [make_result('b', 'c', 'black')] * 6 + [make_result('c', 'b', 'black')] * 2
+                   + [make_result('a', 'c', 'black')] * 8)
+        wins = win_matrix(results, engines)
+        self.assertEqual(wins[0, 1], 8)
+        self.assertEqual(wins[1, 2], 6)
+        self.assertEqual(wins[2, 1], 2)
+        
+        # 強い順に並び、平均が0になる
+        ratings = elo_ratings(wins)
+        self.assertGreater(ratings[0], ratings[1])
+        self.assertGreater(ratings[1], ratings[2])
+        self.assertAlmostEqual(ratings.sum(), 0)
+        
+        # 互角なら同じレーティング
+        even = elo_ratings(np.array([[3.0, 3.0], [3.0, 3.0]]))
+        self.assertTrue(np.allclose(even, 0))
+        
+        # 信頼区間はレーティングを含む
+        intervals = elo_intervals(results, engines, samples=100)
+        for rating, (low, high) in zip(ratings, intervals):
+            self.assertLessEqual(low, rating + 1e-6)
+            self.assertGreaterEqual(high, rating - 1e-6)
+    
+    def test_think_times(self):
+        """思考時間の分布の集計テスト"""
+        results = [make_result('a', 'b', 'black', 0.01), make_result('b', 'a', 'white', 0.03)]
+        times = think_times(results, ['a', 'b'])
+        self.assertEqual(times['a']['moves'], 2)
+        self.assertAlmostEqual(times['a']['mean'], (0.01 + 0.06) / 2)
+        self.assertAlmostEqual(times['b']['max'], 0.03)
+        self.assertLessEqual(times['b']['p50'], times['b']['p99'])
+    
+    def test_main(self):
+        """総当たり戦の実行テスト"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'tournament.jsonl')
+            with contextlib.redirect_stdout(io.StringIO()):
+                standings = main(['--engines', 'heuristic', 'heuristic:4', 'mcts:10', '--games', '2',
+                                  '--size', '5', '--workers', '1', '--max-moves', '20', '--output', path])
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual(len(f.readlines()), 6)
+        
+        self.assertEqual(set(standings), {'heuristic', 'heuristic:4', 'mcts:10'})
+        self.assertEqual(sum(s['wins'] for s in standings.values()), 6)
+        for s in standings.values():
+            self.assertEqual(s['games'], 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import unittest
+import sys
+import os
+import numpy as np
+
+# テスト対象のモジュールをインポートするためにパスを追加
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.transposition import TranspositionTable
+
+class TestTranspositionTable(unittest.TestCase):
+    """置換表のテスト"""
+    
+    def setUp(self):
+        """各テストの前に実行される"""
+        # 4バケット（8スロット）の小さな置換表
+        self.table = TranspositionTable(memory=8 * TranspositionTable.ENTRY.itemsize)
+    
+    def test_store_and_probe(self):
+        """記録と参照のテスト"""
+        self.assertEqual(self.table.capacity, 8)
+        self.assertIsNone(self.table.probe(12345))
+        
+        key = (1 << 63) + 5
+        self.table.store(key, 1.5, move=40, depth=3, bound=TranspositionTable.LOWER)
+        entry = self.table.probe(key)
+        self.assertEqual(entry.score, 1.5)
+        self.assertEqual(entry.move, 40)
+        self.assertEqual(entry.depth, 3)
+        self.assertEqual(entry.bound, TranspositionTable.LOWER)
+        self.assertEqual(len(self.table), 1)
+        self.assertEqual((self.table.hits, self.table.misses), (1, 1))
+        
+        # 同じ局面は上書きする
+        self.table.store(key, 2.0, depth=1)
+        self.assertEqual(self.table.probe(key).score, 2.0)
+        self.assertEqual(len(self.table), 1)
+    
+    def test_replacement(self):
+        """置き換えの規則のテスト"""
+        # 同じバケットに入る局面（下位2ビットが同じ）
+        deep, shallow, newer, deeper = 4 * 1 + 1, 4 * 2 + 1, 4 * 3 + 1, 4 * 4 + 1
+        self.table.store(deep, 1.0, depth=5)
+        self.table.store(shallow, 2.0, depth=1)
+        self.assertEqual(int(self.table.entries[1, 0]['key']), deep)
+        self.assertEqual(int(self.table.entries[1, 1]['key']), shallow)
+        
+        # 浅い読みの記録は深い読みの記録を消さず、2つ目のスロットを置き換える
+        self.table.store(newer, 3.0, depth=2)
+        self.assertEqual(self.table.probe(deep).score, 1.0)
+        self.assertIsNone(self.table.probe(shallow))
+        self.assertEqual(self.table.probe(newer).score, 3.0)
+        
+        # 同じ深さの記録も2つ目のスロットを置き換える
+        self.table.store(shallow, 4.0, depth=5)
+        self.assertEqual(self.table.probe(deep).score, 1.0)
+        self.assertIsNone(self.table.probe(newer))
+        
+        # より深い読みの記録は1つ目のスロットに入り、それまでの記録は2つ目に移る
+        self.table.store(deeper, 5.0, depth=7)
+        self.assertEqual(self.table.probe(deeper).score, 5.0)
+        self.assertEqual(self.table.probe(deep).score, 1.0)
+        self.assertIsNone(self.table.probe(shallow))
+        self.assertEqual(int(self.table.entries[1, 0]['key']), deeper)
+        self.assertEqual(int(self.table.entries[1, 1]['key']), deep)
+        
+        # 2つ目のスロットの局面をより深く読んだ記録は1つ目に移り、同じ局面が2つ残らない
+        self.table.store(deep, 6.0, depth=8)
+        self.assertEqual(int(self.table.entries[1, 0]['key']), deep)
+        self.assertEqual(int(self.table.entries[1, 1]['key']), deeper)
+        self.assertEqual(len(self.table), 2)
+    
+    def test_both_slots(self):
+        """深さの同じ記録が両方のスロットを使うかのテスト"""
+        table = TranspositionTable(memory=1024)
+        keys = np.arange(table.capacity, dtype=np.uint64)
+        table.store_many(keys, np.arange(table.capacity))
+        
+        # バケットの数の2倍の局面がすべて残る（1つ目のスロットには最初の局面が残る）
+        self.assertEqual(len(table), table.capacity)
+        self.assertTrue((table.entries['depth'] >= 0).all())
+        self.assertEqual(table.entries['key'][:, 0].tolist(), list(range(table.capacity // 2)))
+        found, scores = table.probe_many(keys)
+        self.assertTrue(found.all())
+        self.assertEqual(scores.tolist(), list(range(table.capacity)))
+        self.assertEqual(table.probe(0).move, -1)
+    
+    def test_store_many_order(self):
+        """まとめて書き込んだ結果が1つずつ書き込んだ場合と一致するかのテスト"""
+        rng = np.random.default_rng(1)
+        keys = rng.integers(0, 32, size=200).astype(np.uint64)
+        depths = rng.integers(0, 4, size=200)
+        single = TranspositionTable(memory=8 * TranspositionTable.ENTRY.itemsize)
+        batch = TranspositionTable(memory=8 * TranspositionTable.ENTRY.itemsize)
+        for start in range(0, 200, 20):
+            for depth in range(4):
+                # 深さごとにまとめて書き込む
+                part = np.flatnonzero(depths[start:start + 20] == depth) + start
+                for i in part.tolist():
+                    single.store(int(keys[i]), float(i), move=i, depth=depth)
+                batch.store_many(keys[part], part, part, depth=depth)
+        self.assertEqual(single.entries.tobytes(), batch.entries.tobytes())
+    
+    def test_fixed_memory(self):
+        """記録が増えてもメモリ使用量が変わらないかのテスト"""
+        memory = self.table.memory
+        rng = np.random.default_rng(0)
+        keys = rng.integers(0, 2 ** 63, size=100, dtype=np.uint64)
+        for key in keys.tolist():
+            self.table.store(key, 1.0)
+        self.assertEqual(self.table.memory, memory)
+        self.assertLessEqual(len(self.table), self.table.capacity)
+        
+        self.table.clear()
+        self.assertEqual(len(self.table), 0)
+    
+    def test_many(self):
+        """まとめて記録・参照した結果が1つずつの場合と一致するかのテスト"""
+        table = TranspositionTable(memory=1024)
+        keys = np.array([3, 1 << 40, (1 << 64) - 1], dtype=np.uint64)
+        table.store_many(keys, np.array([1, 2, 3]), np.array([0, 1, 2]))
+        
+        found, scores = table.probe_many(np.concatenate([keys, np.array([7], dtype=np.uint64)]))
+        self.assertEqual(found.tolist(), [True, True, True, False])
+        self.assertEqual(scores[:3].tolist(), [1, 2, 3])
+        entry = table.probe(int(keys[2]))
+        self.assertEqual((entry.score, entry.move), (3.0, 2))
+
+if __name__ == '__main__':
+    unittest.main()